@@ -7,6 +7,37 @@ class Settings(BaseSettings):
     database_name: str = "employee-management-system"
     environment: str = "development"
     cors_origins: List[str] = ["http://localhost:5173"]
+
+    # Apply the index registry (app/indexes.py) when the API starts
+    ensure_indexes_on_startup: bool = True
+
+    # Typeahead index: background refresh interval to pick up other workers' writes
+    suggest_index_refresh_seconds: int = 300
+
+    # employeeId numbers each worker reserves from the counter per round trip
+    employee_id_block_size: int = 20
+
+    # Background bulk jobs (?async=true): concurrent jobs per worker process, and
+    # how long a running job may go without a heartbeat (sent every third of
+    # that) before it counts as interrupted
+    bulk_job_workers: int = 2
+    bulk_job_stale_seconds: int = 300
+
+    # Analytics result cache: how long a result is served (0 disables caching;
+    # concurrent identical requests still share one computation) and how many
+    # results are kept
+    analytics_cache_ttl_seconds: int = 60
+    analytics_cache_max_entries: int = 256
+
+    # Analytics compute pool: worker processes for the pandas/per-employee
+    # computations (0 runs them inline on the event loop) and how many may wait
+    # for a free process before requests get a 503
+    analytics_pool_workers: int = 2
+    analytics_pool_max_queue: int = 8
+
+    # Columnar employee snapshot behind the salary/performance analytics:
+    # background refresh interval to pick up other workers' writes
+    analytics_snapshot_refresh_seconds: int = 60
     
     # JWT Settings
     jwt_secret_key: str = "CHANGE-THIS-TO-A-RANDOM-SECRET-KEY-IN-PRODUCTION"
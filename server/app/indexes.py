@@ -0,0 +1,367 @@
+"""Declarative MongoDB index registry and query-plan verification.
+
+Every index the API relies on is declared once in ``INDEXES`` and applied
+idempotently by ``ensure_indexes`` (at startup and via
+``python -m scripts.ensure_indexes``), together with the read-only views in
+``VIEWS`` that aggregation pipelines depend on. ``HOT_QUERIES`` lists the query shapes the
+services issue on hot paths; ``verify_query_plans`` explains each one and reports
+any that fall back to a collection scan.
+"""
+
+import logging
+from typing import Dict, List
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+
+# Error code raised when creating a collection or view that already exists.
+_NAMESPACE_EXISTS = 48
+
+# MongoDB error codes raised when an index with the same name or key pattern
+# already exists with different options; the stored index is rebuilt.
+_INDEX_CONFLICT_CODES = {85, 86}
+
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "employees": [
+        # Department/status filters, paged in the default fullName order.
+        IndexModel(
+            [("department", ASCENDING), ("status", ASCENDING), ("fullName", ASCENDING), ("_id", ASCENDING)],
+            name="department_1_status_1_fullName_1__id_1",
+        ),
+        IndexModel(
+            [("status", ASCENDING), ("fullName", ASCENDING), ("_id", ASCENDING)],
+            name="status_1_fullName_1__id_1",
+        ),
+        # The same filters paged by the other sort keys (see SORT_FIELDS in
+        # app/utils/pagination.py); descending sorts walk these backwards.
+        IndexModel(
+            [("department", ASCENDING), ("status", ASCENDING), ("hireDate", ASCENDING), ("_id", ASCENDING)],
+            name="department_1_status_1_hireDate_1__id_1",
+        ),
+        IndexModel(
+            [("department", ASCENDING), ("status", ASCENDING), ("employeeId", ASCENDING), ("_id", ASCENDING)],
+            name="department_1_status_1_employeeId_1__id_1",
+        ),
+        IndexModel(
+            [("status", ASCENDING), ("hireDate", ASCENDING), ("_id", ASCENDING)],
+            name="status_1_hireDate_1__id_1",
+        ),
+        IndexModel(
+            [("status", ASCENDING), ("employeeId", ASCENDING), ("_id", ASCENDING)],
+            name="status_1_employeeId_1__id_1",
+        ),
+        # Overdue-review range on nextReviewDate.
+        IndexModel(
+            [("status", ASCENDING), ("nextReviewDate", ASCENDING)],
+            name="status_1_nextReviewDate_1",
+        ),
+        # Direct reports, manager re-homing and managerName sync.
+        IndexModel([("managerId", ASCENDING)], name="managerId_1"),
+        # Single-CEO check and manager-level eligibility.
+        IndexModel(
+            [("jobLevel", ASCENDING), ("status", ASCENDING)],
+            name="jobLevel_1_status_1",
+        ),
+        # Materialized reporting paths: subtree membership (multikey on
+        # ancestors), optionally bounded by level; see hierarchy_service.py.
+        IndexModel([("ancestors", ASCENDING), ("depth", ASCENDING)], name="ancestors_1_depth_1"),
+        # "Has direct reports" branch of the managers list; only people with
+        # reports are indexed.
+        IndexModel(
+            [("directReportCount", ASCENDING)],
+            name="directReportCount_1",
+            partialFilterExpression={"directReportCount": {"$gt": 0}},
+        ),
+        # Top levels of the org chart (/api/org/tree without a root).
+        IndexModel([("depth", ASCENDING)], name="depth_1"),
+        # employeeIds are unique (generated ones come from the counter in
+        # app/services/sequence.py); documents without one are not indexed.
+        IndexModel(
+            [("employeeId", ASCENDING)],
+            name="employeeId_1",
+            unique=True,
+            partialFilterExpression={"employeeId": {"$type": "string"}},
+        ),
+        # Keyset pagination sort keys (see app/utils/pagination.py). These also
+        # serve fullName ordering of the manager list and employeeId lookups.
+        IndexModel([("fullName", ASCENDING), ("_id", ASCENDING)], name="fullName_1__id_1"),
+        IndexModel([("hireDate", ASCENDING), ("_id", ASCENDING)], name="hireDate_1__id_1"),
+        IndexModel([("employeeId", ASCENDING), ("_id", ASCENDING)], name="employeeId_1__id_1"),
+        # Ranked free-text search (SearchCriteria.query). Names outweigh
+        # position; no stemming since the content is mostly proper nouns.
+        IndexModel(
+            [("fullName", TEXT), ("firstName", TEXT), ("lastName", TEXT), ("position", TEXT)],
+            name="employee_search_text",
+            weights={"fullName": 10, "firstName": 5, "lastName": 5, "position": 2},
+            default_language="none",
+        ),
+    ],
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_1", unique=True),
+    ],
+    # Background bulk jobs (app/services/bulk_jobs.py): startup recovery scans by
+    # status; finished jobs are kept for a week.
+    "bulk_jobs": [
+        IndexModel([("status", ASCENDING), ("createdAt", ASCENDING)], name="status_1_createdAt_1"),
+        IndexModel([("finishedAt", ASCENDING)], name="finishedAt_1", expireAfterSeconds=7 * 24 * 3600),
+    ],
+}
+
+
+# Employees with ``managerId`` (stored as a string) converted to an ObjectId, so
+# $graphLookup can follow reporting lines by ``_id``. Lookups by ``_id`` are
+# pushed ahead of the $project and use the primary key index.
+REPORTING_LINES_VIEW = "employee_reporting_lines"
+
+VIEWS: Dict[str, Dict] = {
+    REPORTING_LINES_VIEW: {
+        "viewOn": "employees",
+        "pipeline": [
+            {
+                "$project": {
+                    "managerOid": {
+                        "$convert": {
+                            "input": "$managerId",
+                            "to": "objectId",
+                            "onError": None,
+                            "onNull": None,
+                        }
+                    }
+                }
+            }
+        ],
+    },
+}
+
+
+# Query shapes issued by the services on hot paths. Each must be served by an
+# index; ``sort`` is optional and, when present, must not need an in-memory sort.
+HOT_QUERIES: List[Dict] = [
+    {
+        "name": "employees by department and status",
+        "collection": "employees",
+        "filter": {"department": "Engineering", "status": "Active"},
+    },
+    {
+        "name": "employees by status",
+        "collection": "employees",
+        "filter": {"status": "Active"},
+    },
+    {
+        "name": "direct reports",
+        "collection": "employees",
+        "filter": {"managerId": "000000000000000000000000"},
+    },
+    {
+        "name": "overdue reviews",
+        "collection": "employees",
+        "filter": {"status": "Active", "nextReviewDate": {"$exists": True, "$lt": "2000-01-01"}},
+    },
+    {
+        "name": "active CEO",
+        "collection": "employees",
+        "filter": {"jobLevel": "CEO", "status": {"$in": ["Active", "On Leave"]}},
+    },
+    {
+        "name": "employee page by name",
+        "collection": "employees",
+        "filter": {},
+        "sort": {"fullName": ASCENDING, "_id": ASCENDING},
+    },
+    {
+        "name": "employee page by hire date (descending)",
+        "collection": "employees",
+        "filter": {},
+        "sort": {"hireDate": DESCENDING, "_id": DESCENDING},
+    },
+    {
+        "name": "employee page by employeeId",
+        "collection": "employees",
+        "filter": {},
+        "sort": {"employeeId": ASCENDING, "_id": ASCENDING},
+    },
+    {
+        "name": "department/status page by hire date (descending)",
+        "collection": "employees",
+        "filter": {"department": "Engineering", "status": "Active"},
+        "sort": {"hireDate": DESCENDING, "_id": DESCENDING},
+    },
+    {
+        "name": "department/status page by employeeId",
+        "collection": "employees",
+        "filter": {"department": "Engineering", "status": "Active"},
+        "sort": {"employeeId": ASCENDING, "_id": ASCENDING},
+    },
+    {
+        "name": "status page by name",
+        "collection": "employees",
+        "filter": {"status": "Active"},
+        "sort": {"fullName": ASCENDING, "_id": ASCENDING},
+    },
+    {
+        "name": "status page by hire date",
+        "collection": "employees",
+        "filter": {"status": "Active"},
+        "sort": {"hireDate": ASCENDING, "_id": ASCENDING},
+    },
+    {
+        "name": "status page by employeeId (descending)",
+        "collection": "employees",
+        "filter": {"status": "Active"},
+        "sort": {"employeeId": DESCENDING, "_id": DESCENDING},
+    },
+    {
+        "name": "department/status page after cursor",
+        "collection": "employees",
+        "filter": {
+            "$and": [
+                {"department": "Engineering", "status": "Active"},
+                {
+                    "$or": [
+                        {"fullName": {"$gt": "M"}},
+                        {"fullName": "M", "_id": {"$gt": ObjectId("000000000000000000000000")}},
+                    ]
+                },
+            ]
+        },
+        "sort": {"fullName": ASCENDING, "_id": ASCENDING},
+    },
+    {
+        "name": "subtree within two levels",
+        "collection": "employees",
+        "filter": {"ancestors": "000000000000000000000000", "depth": {"$lte": 4}},
+    },
+    {
+        "name": "managers list",
+        "collection": "employees",
+        "filter": {
+            "$or": [
+                {"directReportCount": {"$gt": 0}},
+                {"jobLevel": {"$in": ["Manager", "Director", "VP", "C-Level", "CEO"]}},
+            ],
+            "status": {"$in": ["Active", "On Leave"]},
+            "employmentType": {"$in": ["Full-time", "Part-time"]},
+        },
+    },
+    {
+        "name": "org chart top levels",
+        "collection": "employees",
+        "filter": {"depth": {"$lte": 1}},
+    },
+    {
+        "name": "ranked text search",
+        "collection": "employees",
+        "filter": {"$text": {"$search": "engineer"}, "status": "Active"},
+    },
+    {
+        "name": "user by email",
+        "collection": "users",
+        "filter": {"email": "user@company.com"},
+    },
+]
+
+
+async def ensure_indexes(db) -> List[str]:
+    """Create every registered index that is missing or out of date.
+
+    Safe to run repeatedly: existing identical indexes are left alone, and an
+    index whose stored options no longer match the registry is dropped and
+    rebuilt. Registered views are created afterwards. Returns the names of
+    indexes and views that could not be built.
+    """
+    failed: List[str] = []
+    for collection, models in INDEXES.items():
+        for model in models:
+            name = model.document["name"]
+            try:
+                await db[collection].create_indexes([model])
+            except OperationFailure as exc:
+                if exc.code not in _INDEX_CONFLICT_CODES:
+                    logging.error(f"Could not create index {collection}.{name}: {exc}")
+                    failed.append(f"{collection}.{name}")
+                    continue
+                try:
+                    await _rebuild_index(db[collection], model)
+                    logging.info(f"Rebuilt index {collection}.{name}")
+                except OperationFailure as rebuild_exc:
+                    logging.error(f"Could not rebuild index {collection}.{name}: {rebuild_exc}")
+                    failed.append(f"{collection}.{name}")
+    failed.extend(await ensure_views(db))
+    return failed
+
+
+async def ensure_views(db) -> List[str]:
+    """Create every registered view, updating the pipeline of existing ones.
+
+    Returns the names of views that could not be created.
+    """
+    failed: List[str] = []
+    for name, spec in VIEWS.items():
+        try:
+            await db.create_collection(name, viewOn=spec["viewOn"], pipeline=spec["pipeline"])
+        except OperationFailure as exc:
+            if exc.code != _NAMESPACE_EXISTS:
+                logging.error(f"Could not create view {name}: {exc}")
+                failed.append(name)
+                continue
+            try:
+                await db.command("collMod", name, viewOn=spec["viewOn"], pipeline=spec["pipeline"])
+            except OperationFailure as mod_exc:
+                logging.error(f"Could not update view {name}: {mod_exc}")
+                failed.append(name)
+    return failed
+
+
+async def _rebuild_index(collection, model: IndexModel) -> None:
+    """Drop whichever stored index clashes with ``model`` and create it again."""
+    keys = model.document["key"]
+    name = model.document["name"]
+    async for info in collection.list_indexes():
+        if info["name"] == "_id_":
+            continue
+        if info["name"] == name or dict(info["key"]) == dict(keys):
+            await collection.drop_index(info["name"])
+    await collection.create_indexes([model])
+
+
+def _plan_stages(plan: dict) -> List[str]:
+    """Flatten a (possibly nested) winning plan into its list of stage names."""
+    stages: List[str] = []
+    if not isinstance(plan, dict):
+        return stages
+    if "stage" in plan:
+        stages.append(plan["stage"])
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages.extend(_plan_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+async def explain_query(db, query: Dict) -> List[str]:
+    """Return the winning plan's stage names for a registered hot query."""
+    find = {"find": query["collection"], "filter": query["filter"]}
+    if query.get("sort"):
+        find["sort"] = query["sort"]
+    result = await db.command("explain", find, verbosity="queryPlanner")
+    return _plan_stages(result.get("queryPlanner", {}).get("winningPlan", {}))
+
+
+async def verify_query_plans(db) -> List[str]:
+    """Explain every hot query and describe the ones not served by an index.
+
+    Returns an empty list when every registered query uses an index (and, for
+    sorted queries, an index-backed sort).
+    """
+    problems: List[str] = []
+    for query in HOT_QUERIES:
+        stages = await explain_query(db, query)
+        if "COLLSCAN" in stages:
+            problems.append(f"{query['name']}: collection scan ({' <- '.join(stages)})")
+        elif query.get("sort") and "SORT" in stages:
+            problems.append(f"{query['name']}: in-memory sort ({' <- '.join(stages)})")
+    return problems
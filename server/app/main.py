@@ -1,22 +1,34 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
 from app.database import (
     connect_to_mongo,
     close_mongo_connection,
+    get_database,
 )
-from app.routes import health, employees, analytics, bulk_operations, performance, auth
+from app.indexes import ensure_indexes
+from app.services.bulk_jobs import bulk_jobs
+from app.services.compute_pool import ComputePoolBusy, compute_pool
+from app.services.workforce_stats import workforce_stats
+from app.routes import health, employees, analytics, bulk_operations, performance, auth, org
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await connect_to_mongo()
+    if settings.ensure_indexes_on_startup:
+        await ensure_indexes(await get_database())
+    await workforce_stats.ensure_built(await get_database())
+    await bulk_jobs.start()
+    await compute_pool.start()
     yield
+    await compute_pool.stop()
+    await bulk_jobs.stop()
     await close_mongo_connection()
 
 
@@ -34,15 +46,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 
+@app.exception_handler(ComputePoolBusy)
+async def compute_pool_busy(request: Request, exc: ComputePoolBusy):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
 app.include_router(health.router, prefix="/api", tags=["health"])
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(employees.router, prefix="/api", tags=["employees"])
 app.include_router(analytics.router, prefix="/api", tags=["analytics"])
 app.include_router(bulk_operations.router, prefix="/api", tags=["bulk"])
 app.include_router(performance.router, prefix="/api", tags=["performance"])
+app.include_router(org.router, prefix="/api", tags=["org"])
 
 
 if settings.environment == "production":
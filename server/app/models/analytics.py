@@ -81,6 +81,33 @@ class DashboardAnalytics(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
+class AnalyticsCacheStats(BaseModel):
+    """Counters of the analytics result cache (this API worker only)."""
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    invalidations: int
+    entries: int
+    in_flight: int = Field(..., alias="inFlight")
+    ttl_seconds: int = Field(..., alias="ttlSeconds")
+    max_entries: int = Field(..., alias="maxEntries")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class AnalyticsPoolStats(BaseModel):
+    """State of the analytics compute pool (this API worker only)."""
+    workers: int
+    max_queue: int = Field(..., alias="maxQueue")
+    running: int
+    queued: int
+    completed: int
+    rejected: int
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
 # Legacy models for backward compatibility
 class DepartmentDistribution(BaseModel):
     departments: list[str] = []
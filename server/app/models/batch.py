@@ -0,0 +1,43 @@
+"""Models for batch employee creation."""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+MAX_BATCH_ROWS = 5000
+
+
+class EmployeeBatchRequest(BaseModel):
+    """Rows to create in one batch.
+
+    Each row is an ``EmployeeCreate`` payload, validated individually so one bad
+    row does not reject the rest. A row may also carry:
+
+    - ``ref``: a batch-local key other rows can point at, and
+    - ``managerRef``: the manager as a ``ref``, employeeId or workEmail of
+      another row in the batch, or the _id, employeeId or workEmail of an
+      existing employee (instead of ``managerId``).
+    """
+    employees: List[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BATCH_ROWS)
+
+
+class BatchRowResult(BaseModel):
+    """Outcome for one submitted row."""
+    index: int
+    ref: Optional[str] = None
+    status: str  # "created" | "rejected"
+    id: Optional[str] = Field(None, alias="_id")
+    employee_id: Optional[str] = Field(None, alias="employeeId")
+    error: Optional[str] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class EmployeeBatchResponse(BaseModel):
+    """Per-row report for a batch creation."""
+    created_count: int = Field(..., alias="createdCount")
+    rejected_count: int = Field(..., alias="rejectedCount")
+    results: List[BatchRowResult]
+
+    model_config = ConfigDict(populate_by_name=True)
@@ -1,12 +1,49 @@
 """Pydantic models for bulk operations (Phase 6B)."""
 
-from typing import List, Optional
-from pydantic import BaseModel, Field, ConfigDict
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
+from app.models.employee import ActiveStatus
 
-class BulkAssignManagerRequest(BaseModel):
+
+class EmployeeFilter(BaseModel):
+    """Selects employees server-side, with the same field filters as SearchCriteria."""
+    full_name: Optional[str] = Field(None, alias="fullName")
+    department: Optional[str] = None
+    position: Optional[str] = None
+    status: Optional[ActiveStatus] = None
+    manager_id: Optional[str] = Field(None, alias="managerId")
+    employment_type: Optional[str] = Field(None, alias="employmentType")
+    job_level: Optional[str] = Field(None, alias="jobLevel")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BulkTarget(BaseModel):
+    """Who a bulk operation applies to: explicit ``employeeIds`` or a ``filter``.
+
+    With ``dryRun`` the operation only reports how many employees it would
+    touch (``matchedCount``) and changes nothing.
+    """
+    employee_ids: Optional[List[str]] = Field(None, alias="employeeIds")
+    filter: Optional[EmployeeFilter] = None
+    dry_run: bool = Field(False, alias="dryRun")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @model_validator(mode="after")
+    def _one_target(self):
+        if (self.employee_ids is None) == (self.filter is None):
+            raise ValueError("Provide either employeeIds or filter.")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            # An empty filter would select everyone; make that explicit by ids.
+            raise ValueError("filter must set at least one field.")
+        return self
+
+
+class BulkAssignManagerRequest(BulkTarget):
     """Request to assign a manager to multiple employees."""
-    employee_ids: List[str] = Field(..., alias="employeeIds")
     manager_id: str = Field(..., alias="managerId")
     assignment_date: str = Field(..., alias="assignmentDate")
     notes: Optional[str] = None
@@ -14,9 +51,8 @@ class BulkAssignManagerRequest(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
-class BulkConvertEmploymentTypeRequest(BaseModel):
+class BulkConvertEmploymentTypeRequest(BulkTarget):
     """Request to convert employment type for multiple employees."""
-    employee_ids: List[str] = Field(..., alias="employeeIds")
     new_employment_type: str = Field(..., alias="newEmploymentType")
     effective_date: str = Field(..., alias="effectiveDate")
     notes: Optional[str] = None
@@ -24,9 +60,8 @@ class BulkConvertEmploymentTypeRequest(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
-class BulkChangeStatusRequest(BaseModel):
+class BulkChangeStatusRequest(BulkTarget):
     """Request to change status for multiple employees."""
-    employee_ids: List[str] = Field(..., alias="employeeIds")
     new_status: str = Field(..., alias="newStatus")
     effective_date: str = Field(..., alias="effectiveDate")
     reason: Optional[str] = None
@@ -50,9 +85,8 @@ class RehireData(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
-class BulkRehireEmployeesRequest(BaseModel):
+class BulkRehireEmployeesRequest(BulkTarget):
     """Request to rehire multiple terminated employees."""
-    employee_ids: List[str] = Field(..., alias="employeeIds")
     rehire_data: RehireData = Field(..., alias="rehireData")
 
     model_config = ConfigDict(populate_by_name=True)
@@ -69,9 +103,8 @@ class TrainingData(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
-class BulkUpdateTrainingStatusRequest(BaseModel):
+class BulkUpdateTrainingStatusRequest(BulkTarget):
     """Request to update training status for multiple employees."""
-    employee_ids: List[str] = Field(..., alias="employeeIds")
     new_training_status: str = Field(..., alias="newTrainingStatus")
     training_data: TrainingData = Field(..., alias="trainingData")
 
@@ -93,9 +126,8 @@ class ReviewData(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
-class BulkSchedulePerformanceReviewRequest(BaseModel):
+class BulkSchedulePerformanceReviewRequest(BulkTarget):
     """Request to schedule performance reviews for multiple employees."""
-    employee_ids: List[str] = Field(..., alias="employeeIds")
     review_data: ReviewData = Field(..., alias="reviewData")
 
     model_config = ConfigDict(populate_by_name=True)
@@ -108,6 +140,35 @@ class BulkOperationResponse(BaseModel):
     failed_count: int = Field(..., alias="failedCount")
     message: str
     failed_ids: Optional[List[str]] = Field(None, alias="failedIds")
+    # Employees selected by the filter (or existing among employeeIds) on
+    # filter and dry-run requests.
+    matched_count: Optional[int] = Field(None, alias="matchedCount")
+    # Why each failed id was rejected (operations that validate per employee).
+    failure_reasons: Optional[Dict[str, str]] = Field(None, alias="failureReasons")
 
     model_config = ConfigDict(populate_by_name=True)
 
+
+class BulkJobAccepted(BaseModel):
+    """Response when a bulk operation is queued as a background job."""
+    job_id: str = Field(..., alias="jobId")
+    status: str
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BulkJobStatus(BaseModel):
+    """Progress and outcome of a background bulk job."""
+    job_id: str = Field(..., alias="jobId")
+    operation: str
+    status: str  # queued | running | completed | failed | interrupted
+    total: int
+    processed: int
+    failed_ids: List[str] = Field(default_factory=list, alias="failedIds")
+    result: Optional[BulkOperationResponse] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(..., alias="createdAt")
+    started_at: Optional[datetime] = Field(None, alias="startedAt")
+    finished_at: Optional[datetime] = Field(None, alias="finishedAt")
+
+    model_config = ConfigDict(populate_by_name=True)
@@ -35,6 +35,13 @@ class BusinessUnit(str, Enum):
     EXECUTIVE = "Executive"
 
 
+# Canonical manager eligibility rules: a manager must be Active/On Leave and
+# Full-time/Part-time, and either have direct reports or hold one of these levels.
+MANAGER_JOB_LEVELS = ("Manager", "Director", "VP", "C-Level", "CEO")
+MANAGER_ELIGIBLE_STATUSES = ("Active", "On Leave")
+MANAGER_ELIGIBLE_TYPES = ("Full-time", "Part-time")
+
+
 class PerformanceReview(BaseModel):
     """Performance review record."""
     review_id: str = Field(..., alias="reviewId")
@@ -138,6 +145,11 @@ class Employee(BaseModel):
     direct_reports: Optional[List[str]] = Field(None, alias="directReports")
     cost_center: Optional[str] = Field(None, alias="costCenter")
     business_unit: Optional[BusinessUnit] = Field(None, alias="businessUnit")
+    # Materialized reporting line: ids of everyone above, root first (system-maintained)
+    ancestors: Optional[List[str]] = None
+    depth: Optional[int] = None
+    direct_report_count: Optional[int] = Field(None, alias="directReportCount")
+    subtree_size: Optional[int] = Field(None, alias="subtreeSize")
 
     # Dates
     hire_date: str = Field(..., alias="hireDate")
@@ -192,6 +204,53 @@ class Employee(BaseModel):
         return v.isoformat() if isinstance(v, datetime) else v
 
 
+class EmployeeSummary(BaseModel):
+    """Slim employee row for list views (tables, org chart, pickers)."""
+    id: Optional[str] = Field(None, alias="_id")
+    employee_id: str = Field(..., alias="employeeId")
+    status: ActiveStatus
+    first_name: str = Field(..., alias="firstName")
+    last_name: str = Field(..., alias="lastName")
+    full_name: str = Field(..., alias="fullName")
+    work_email: str = Field(..., alias="workEmail")
+    department: str
+    position: str
+    job_level: JobLevel = Field(..., alias="jobLevel")
+    employment_type: str = Field(..., alias="employmentType")
+    work_location: str = Field(..., alias="workLocation")
+    manager_id: Optional[str] = Field(None, alias="managerId")
+    manager_name: Optional[str] = Field(None, alias="managerName")
+    hire_date: str = Field(..., alias="hireDate")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class EmployeeSuggestion(BaseModel):
+    """Typeahead match for employee and manager pickers."""
+    id: str = Field(..., alias="_id")
+    employee_id: str = Field(..., alias="employeeId")
+    full_name: str = Field(..., alias="fullName")
+    position: Optional[str] = None
+    department: Optional[str] = None
+    job_level: Optional[str] = Field(None, alias="jobLevel")
+    status: Optional[str] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class FacetCount(BaseModel):
+    """Number of matching employees for one facet value."""
+    value: Optional[str] = None
+    count: int
+
+
+class FacetedSearchResult(BaseModel):
+    """One page of search results with the total and per-facet counts."""
+    items: List[Employee]
+    total: int
+    facets: Dict[str, List[FacetCount]]
+
+
 class EmployeeCreate(BaseModel):
     """Model for creating a new employee - only required fields for creation."""
     status: ActiveStatus
@@ -310,11 +369,17 @@ class EmployeeUpdate(BaseModel):
     
     # Manager/HR Assignment
     hr_assignment: Optional[HRAssignment] = Field(None, alias="hrAssignment")
+
+    # Optimistic concurrency: the updatedAt the client last read. The update is
+    # refused if the employee has been modified since.
+    expected_updated_at: Optional[datetime] = Field(None, alias="expectedUpdatedAt")
     
     model_config = ConfigDict(populate_by_name=True)
 
 
 class SearchCriteria(BaseModel):
+    # Free-text, relevance-ranked search across names and position.
+    query: Optional[str] = None
     full_name: Optional[str] = Field(None, alias="fullName")
     department: Optional[str] = None
     position: Optional[str] = None
@@ -323,6 +388,10 @@ class SearchCriteria(BaseModel):
     employment_type: Optional[str] = Field(None, alias="employmentType")
     job_level: Optional[str] = Field(None, alias="jobLevel")
 
+    # Paging: every search response is bounded.
+    skip: int = Field(0, ge=0)
+    limit: int = Field(100, ge=1, le=1000)
+
     model_config = ConfigDict(populate_by_name=True)
 
 
@@ -0,0 +1,23 @@
+"""Org chart models."""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class OrgNode(BaseModel):
+    """Compact org chart node.
+
+    ``children`` is None when the node was not expanded (fetch them with
+    ``/api/org/{id}/children``) and an empty list when it has no reports.
+    """
+    id: str = Field(..., alias="_id")
+    name: str
+    title: Optional[str] = None
+    level: Optional[str] = None
+    department: Optional[str] = None
+    direct_report_count: int = Field(0, alias="directReportCount")
+    subtree_size: int = Field(0, alias="subtreeSize")
+    children: Optional[List["OrgNode"]] = None
+
+    model_config = ConfigDict(populate_by_name=True)
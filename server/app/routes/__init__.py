@@ -1,3 +1,3 @@
 """API route modules for Employee Management System."""
 
-from . import health, employees, analytics, bulk_operations, performance, auth
+from . import health, employees, analytics, bulk_operations, performance, auth, org
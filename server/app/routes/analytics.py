@@ -3,13 +3,17 @@
 from fastapi import APIRouter, Depends
 
 from app.models.analytics import (
+    AnalyticsCacheStats,
+    AnalyticsPoolStats,
     DashboardAnalytics,
     DepartmentDistribution,
     PerformanceTrends,
     SalaryAnalytics,
     HiringTrends,
 )
+from app.services.analytics_cache import analytics_cache
 from app.services.analytics_service import AnalyticsService
+from app.services.compute_pool import compute_pool
 
 
 router = APIRouter()
@@ -21,6 +25,18 @@ async def get_dashboard_analytics(service: AnalyticsService = Depends()):
     return await service.get_dashboard_analytics()
 
 
+@router.get("/analytics/cache", response_model=AnalyticsCacheStats)
+async def get_analytics_cache_stats():
+    """Hit/miss/coalesced counters of this worker's analytics result cache."""
+    return analytics_cache.stats()
+
+
+@router.get("/analytics/pool", response_model=AnalyticsPoolStats)
+async def get_analytics_pool_stats():
+    """Running/queued/rejected counts of this worker's analytics compute pool."""
+    return compute_pool.stats()
+
+
 # Legacy endpoints (kept for backward compatibility)
 @router.get("/analytics/department-distribution", response_model=DepartmentDistribution)
 async def get_department_distribution(service: AnalyticsService = Depends()):
@@ -1,6 +1,8 @@
 """Bulk operations routes (Phase 6B)."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 
 from app.models.bulk_operations import (
     BulkAssignManagerRequest,
@@ -10,63 +12,107 @@ from app.models.bulk_operations import (
     BulkUpdateTrainingStatusRequest,
     BulkSchedulePerformanceReviewRequest,
     BulkOperationResponse,
+    BulkJobAccepted,
+    BulkJobStatus,
 )
+from app.services.bulk_jobs import bulk_jobs
 from app.services.bulk_service import BulkService
 
 router = APIRouter()
 
+# ?async=true queues the operation as a background job instead of running it
+# within the request; poll GET /bulk/jobs/{job_id} for progress and the result.
+RUN_ASYNC = Query(False, alias="async", description="Run as a background job (202 + job id)")
+ASYNC_RESPONSES = {202: {"model": BulkJobAccepted}}
 
-@router.post("/bulk/assign-manager", response_model=BulkOperationResponse)
+
+async def _accept(operation: str, request: BaseModel) -> JSONResponse:
+    job_id = await bulk_jobs.submit(operation, request)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=BulkJobAccepted(job_id=job_id, status="queued").model_dump(by_alias=True),
+        headers={"Location": f"/api/bulk/jobs/{job_id}"},
+    )
+
+
+@router.get("/bulk/jobs/{job_id}", response_model=BulkJobStatus)
+async def get_bulk_job(job_id: str) -> dict:
+    """Progress, partial failedIds and (when finished) the result of a bulk job."""
+    job = await bulk_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Bulk job not found")
+    return job
+
+
+@router.post("/bulk/assign-manager", response_model=BulkOperationResponse, responses=ASYNC_RESPONSES)
 async def bulk_assign_manager(
     request: BulkAssignManagerRequest,
+    run_async: bool = RUN_ASYNC,
     service: BulkService = Depends()
 ) -> dict:
     """Assign a manager to multiple employees."""
+    if run_async:
+        return await _accept("assign-manager", request)
     return await service.bulk_assign_manager(request)
 
 
-@router.post("/bulk/convert-employment-type", response_model=BulkOperationResponse)
+@router.post("/bulk/convert-employment-type", response_model=BulkOperationResponse, responses=ASYNC_RESPONSES)
 async def bulk_convert_employment_type(
     request: BulkConvertEmploymentTypeRequest,
+    run_async: bool = RUN_ASYNC,
     service: BulkService = Depends()
 ) -> dict:
     """Convert employment type for multiple employees."""
+    if run_async:
+        return await _accept("convert-employment-type", request)
     return await service.bulk_convert_employment_type(request)
 
 
-@router.post("/bulk/change-status", response_model=BulkOperationResponse)
+@router.post("/bulk/change-status", response_model=BulkOperationResponse, responses=ASYNC_RESPONSES)
 async def bulk_change_status(
     request: BulkChangeStatusRequest,
+    run_async: bool = RUN_ASYNC,
     service: BulkService = Depends()
 ) -> dict:
     """Change status for multiple employees."""
+    if run_async:
+        return await _accept("change-status", request)
     return await service.bulk_change_status(request)
 
 
-@router.post("/bulk/rehire-employees", response_model=BulkOperationResponse)
+@router.post("/bulk/rehire-employees", response_model=BulkOperationResponse, responses=ASYNC_RESPONSES)
 async def bulk_rehire_employees(
     request: BulkRehireEmployeesRequest,
+    run_async: bool = RUN_ASYNC,
     service: BulkService = Depends()
 ) -> dict:
     """Rehire multiple terminated employees."""
+    if run_async:
+        return await _accept("rehire-employees", request)
     return await service.bulk_rehire_employees(request)
 
 
-@router.post("/bulk/update-training-status", response_model=BulkOperationResponse)
+@router.post("/bulk/update-training-status", response_model=BulkOperationResponse, responses=ASYNC_RESPONSES)
 async def bulk_update_training_status(
     request: BulkUpdateTrainingStatusRequest,
+    run_async: bool = RUN_ASYNC,
     service: BulkService = Depends()
 ) -> dict:
     """Update training status for multiple employees."""
+    if run_async:
+        return await _accept("update-training-status", request)
     return await service.bulk_update_training_status(request)
 
 
-@router.post("/bulk/schedule-performance-review", response_model=BulkOperationResponse)
+@router.post("/bulk/schedule-performance-review", response_model=BulkOperationResponse, responses=ASYNC_RESPONSES)
 async def bulk_schedule_performance_review(
     request: BulkSchedulePerformanceReviewRequest,
+    run_async: bool = RUN_ASYNC,
     service: BulkService = Depends()
 ) -> dict:
     """Schedule performance reviews for multiple employees."""
+    if run_async:
+        return await _accept("schedule-performance-review", request)
     return await service.bulk_schedule_performance_review(request)
 
 
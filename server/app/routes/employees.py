@@ -1,34 +1,84 @@
 """Employees API routes (Phase 4)."""
 
+import json
+import tempfile
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
 
+from app.models.batch import EmployeeBatchRequest, EmployeeBatchResponse
 from app.models.employee import (
     Employee,
     EmployeeCreate,
+    EmployeeSuggestion,
     EmployeeUpdate,
+    FacetedSearchResult,
     SearchCriteria,
 )
 from app.models.user import UserInDB
-from app.services.employee_service import EmployeeService
+from app.services.batch_service import BatchService
+from app.services.employee_service import ConcurrentModificationError, EmployeeService
+from app.services.import_service import IMPORT_FORMATS, ImportService
 from app.utils.dependencies import get_current_user
+from app.utils.export_formats import EXPORT_FORMATS, MEDIA_TYPES, csv_stream, ndjson_stream
 
 
 router = APIRouter()
 
 
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated ``fields=`` query parameter."""
+    if not fields:
+        return None
+    return [f.strip() for f in fields.split(",") if f.strip()] or None
+
+
+def _list_response(items, fields: Optional[List[str]], view: Optional[str], headers: Optional[dict] = None):
+    """Return full employees through the response model, projected rows directly.
+
+    Summary and ``fields=`` rows are already shaped by the service, so they are
+    serialized as-is instead of being re-validated against ``Employee``.
+    """
+    if fields or view == "summary":
+        return JSONResponse(content=jsonable_encoder(items), headers=headers)
+    return items
+
+
 @router.get("/employees", response_model=List[Employee])
 async def get_employees(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
     department: Optional[str] = None,
     status: Optional[str] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
     service: EmployeeService = Depends(),
     current_user: UserInDB = Depends(get_current_user),
 ):
-    """Get employees with optional filtering. Requires authentication."""
-    return await service.get_employees(skip, limit, department, status)
+    """Get employees with optional filtering and keyset pagination. Requires authentication.
+
+    ``sort`` accepts fullName, hireDate or employeeId (prefix ``-`` for
+    descending). When more rows remain, the ``X-Next-Cursor`` response header
+    carries the cursor to pass back as ``cursor`` for the next page.
+    ``view=summary`` or ``fields=a,b,c`` return slim rows instead of full records.
+    """
+    field_list = _parse_fields(fields)
+    try:
+        employees, next_cursor = await service.get_employees(
+            skip, limit, department, status, sort, cursor, field_list, view
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    if headers:
+        response.headers.update(headers)
+    return _list_response(employees, field_list, view, headers)
 
 
 @router.post("/employees", response_model=Employee)
@@ -41,6 +91,110 @@ async def create_employee(
     return await service.create_employee(employee)
 
 
+@router.post("/employees/batch", response_model=EmployeeBatchResponse)
+async def create_employees_batch(
+    request: EmployeeBatchRequest,
+    service: BatchService = Depends(),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """Create many employees in one request. Rows are validated against one
+    snapshot, may reference each other as managers (``ref``/``managerRef``) and
+    are reported individually as created or rejected. Requires authentication."""
+    return await service.create_employees(request.employees)
+
+
+@router.post("/employees/import")
+async def import_employees(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv or ndjson (default: from Content-Type)"),
+    service: ImportService = Depends(),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """Import employees from a CSV or NDJSON request body, parsed as it streams in.
+
+    Returns an NDJSON report: one line per rejected row, then a summary line.
+    The report is spooled (to disk once large) while the upload is read and
+    sent once the import finishes. Requires authentication.
+    """
+    fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(IMPORT_FORMATS)}")
+
+    report = tempfile.SpooledTemporaryFile(max_size=1 << 20)
+    async for entry in service.import_employees(request.stream(), fmt):
+        report.write(json.dumps(entry).encode() + b"\n")
+    report.seek(0)
+
+    def chunks():
+        try:
+            while chunk := report.read(64 * 1024):
+                yield chunk
+        finally:
+            report.close()
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+@router.get("/employees/export")
+async def export_employees(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    query: Optional[str] = None,
+    full_name: Optional[str] = Query(None, alias="fullName"),
+    department: Optional[str] = None,
+    position: Optional[str] = None,
+    status: Optional[str] = None,
+    manager_id: Optional[str] = Query(None, alias="managerId"),
+    employment_type: Optional[str] = Query(None, alias="employmentType"),
+    job_level: Optional[str] = Query(None, alias="jobLevel"),
+    sort: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
+    service: EmployeeService = Depends(),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """Stream every matching employee as NDJSON or CSV. Requires authentication.
+
+    Takes the search filters as query parameters, plus ``sort``, ``fields`` and
+    ``view`` as in ``GET /employees``. Rows are written as they are read from
+    the database, so the export is not paged and memory use does not grow with
+    its size. CSV nests fields with dotted column names, as the import reads them.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    try:
+        criteria = SearchCriteria(
+            query=query, fullName=full_name, department=department, position=position,
+            status=status, managerId=manager_id, employmentType=employment_type, jobLevel=job_level,
+        )
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=jsonable_encoder(exc.errors()))
+    try:
+        rows, columns = await service.export_employees(criteria, sort, _parse_fields(fields), view)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    body = csv_stream(rows, columns) if format == "csv" else ndjson_stream(rows)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="employees.{format}"'},
+    )
+
+
+@router.get("/employees/suggest", response_model=List[EmployeeSuggestion])
+async def suggest_employees(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    managers: bool = False,
+    service: EmployeeService = Depends(),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """Typeahead prefix matches on name or employeeId. Requires authentication.
+
+    ``managers=true`` limits matches to manager-eligible employees.
+    """
+    return await service.suggest_employees(q, limit, managers)
+
+
 @router.get("/employees/{employee_id}", response_model=Employee)
 async def get_employee(
     employee_id: str,
@@ -61,8 +215,15 @@ async def update_employee(
     service: EmployeeService = Depends(),
     current_user: UserInDB = Depends(get_current_user),
 ):
-    """Update employee. Requires authentication."""
-    return await service.update_employee(employee_id, updates)
+    """Update employee. Send ``expectedUpdatedAt`` (the ``updatedAt`` last read)
+    to have the update refused with 409 if someone else changed the employee
+    in the meantime. Requires authentication."""
+    try:
+        return await service.update_employee(employee_id, updates)
+    except ConcurrentModificationError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
 @router.delete("/employees/{employee_id}")
@@ -78,29 +239,113 @@ async def delete_employee(
 @router.post("/employees/search", response_model=List[Employee])
 async def search_employees(
     criteria: SearchCriteria,
+    response: Response,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
+    service: EmployeeService = Depends(),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """Advanced employee search. Requires authentication.
+
+    Returns one page (``skip``/``limit`` in the body) ranked by relevance when
+    ``query`` is set; the total number of matches is in ``X-Total-Count``.
+    """
+    field_list = _parse_fields(fields)
+    try:
+        results, total = await service.search_employees(criteria, field_list, view)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    headers = {"X-Total-Count": str(total)}
+    response.headers.update(headers)
+    return _list_response(results, field_list, view, headers)
+
+
+@router.post("/employees/search/faceted", response_model=FacetedSearchResult)
+async def search_employees_faceted(
+    criteria: SearchCriteria,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
     service: EmployeeService = Depends(),
     current_user: UserInDB = Depends(get_current_user),
 ):
-    """Advanced employee search. Requires authentication."""
-    return await service.search_employees(criteria)
+    """Search returning one page, the total and department/status/jobLevel/
+    employmentType facet counts from a single aggregation. Requires authentication."""
+    field_list = _parse_fields(fields)
+    try:
+        result = await service.search_employees_faceted(criteria, field_list, view)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if field_list or view == "summary":
+        return JSONResponse(content=jsonable_encoder(result))
+    return result
 
 
 @router.get("/employees/{employee_id}/reports", response_model=List[Employee])
 async def get_direct_reports(
     employee_id: str,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
     service: EmployeeService = Depends(),
     current_user: UserInDB = Depends(get_current_user),
 ):
     """Get employee's direct reports. Requires authentication."""
-    return await service.get_direct_reports(employee_id)
+    field_list = _parse_fields(fields)
+    try:
+        reports = await service.get_direct_reports(employee_id, field_list, view)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return _list_response(reports, field_list, view)
+
+
+@router.get("/employees/{employee_id}/subtree", response_model=List[Employee])
+async def get_subtree(
+    employee_id: str,
+    max_depth: Optional[int] = Query(None, alias="maxDepth", ge=1),
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
+    service: EmployeeService = Depends(),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """Get everyone under an employee (optionally at most maxDepth levels down),
+    ordered by level then name. Requires authentication."""
+    field_list = _parse_fields(fields)
+    try:
+        members = await service.get_subtree(employee_id, max_depth, field_list, view)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return _list_response(members, field_list, view)
+
+
+@router.get("/employees/{employee_id}/chain", response_model=List[Employee])
+async def get_reporting_chain(
+    employee_id: str,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
+    service: EmployeeService = Depends(),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """Get an employee's reporting chain, top of the org first. Requires authentication."""
+    field_list = _parse_fields(fields)
+    try:
+        chain = await service.get_reporting_chain(employee_id, field_list, view)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return _list_response(chain, field_list, view)
 
 
 @router.get("/managers", response_model=List[Employee])
 async def get_managers(
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
     service: EmployeeService = Depends(),
     current_user: UserInDB = Depends(get_current_user),
 ):
     """Get all employees who are managers (have direct reports or manager-level positions). Requires authentication."""
-    return await service.get_managers()
+    field_list = _parse_fields(fields)
+    try:
+        managers = await service.get_managers(field_list, view)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return _list_response(managers, field_list, view)
 
 
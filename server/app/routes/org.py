@@ -0,0 +1,41 @@
+"""Org chart routes: the reporting tree, expanded one level at a time."""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.models.org import OrgNode
+from app.models.user import UserInDB
+from app.services.org_service import MAX_TREE_DEPTH, OrgService
+from app.utils.dependencies import get_current_user
+
+
+router = APIRouter()
+
+
+@router.get("/org/tree", response_model=List[OrgNode], response_model_exclude_none=True)
+async def get_org_tree(
+    root: Optional[str] = None,
+    depth: int = Query(1, ge=0, le=MAX_TREE_DEPTH),
+    service: OrgService = Depends(),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """Get the org tree from ``root`` (or the top of the org) down ``depth`` levels.
+    Nodes without ``children`` have not been expanded. Requires authentication."""
+    try:
+        return await service.get_tree(root, depth)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/org/{employee_id}/children", response_model=List[OrgNode], response_model_exclude_none=True)
+async def get_org_children(
+    employee_id: str,
+    service: OrgService = Depends(),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """Get one org chart node's direct reports. Requires authentication."""
+    try:
+        return await service.get_children(employee_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -0,0 +1,156 @@
+"""In-process cache for analytics results, with write invalidation and single-flight.
+
+Analytics methods decorated with ``@cached(fields)`` keep their result for
+``settings.analytics_cache_ttl_seconds``; at most
+``settings.analytics_cache_max_entries`` results are kept, least recently used
+first out. Concurrent misses for the same call are coalesced: one computation
+runs and every other caller awaits its result, so a burst of dashboard loads
+costs one computation.
+
+The cache subscribes to ``employee_events`` and drops results that depend on
+the fields a write changed (``fields=None`` means any field). A result computed
+while a relevant write happened is returned to its callers but not kept. Writes
+made by other workers are only seen once the TTL expires. Cached results are
+shared between callers and must be treated as read-only.
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from app.config import settings
+from app.services import employee_events
+
+
+class _Entry:
+    __slots__ = ("value", "expires", "fields")
+
+    def __init__(self, value: Any, expires: float, fields: Optional[frozenset]) -> None:
+        self.value = value
+        self.expires = expires
+        self.fields = fields
+
+
+def _overlaps(depends: Optional[frozenset], changed: Optional[frozenset]) -> bool:
+    return depends is None or changed is None or not depends.isdisjoint(changed)
+
+
+class AnalyticsCache:
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, Tuple[asyncio.Future, Optional[frozenset]]] = {}
+        # In-flight computations that a write has made stale.
+        self._stale_loads: set = set()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        fields: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """The cached result for ``key``, computing it (once) if missing or expired.
+
+        ``fields`` are the stored employee fields the result depends on.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            del self._entries[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            task = inflight[0]
+        else:
+            self.misses += 1
+            depends = frozenset(fields) if fields is not None else None
+            # A task of its own, so a caller going away does not cancel the
+            # computation the others are waiting for.
+            task = asyncio.ensure_future(self._load(key, compute, depends))
+            self._inflight[key] = (task, depends)
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, compute: Callable[[], Awaitable[Any]], depends: Optional[frozenset]) -> Any:
+        try:
+            value = await compute()
+        finally:
+            # Cleared even when compute() fails, so the mark of a write during
+            # this load cannot carry over to the next one.
+            del self._inflight[key]
+            stale = key in self._stale_loads
+            self._stale_loads.discard(key)
+        if not stale and settings.analytics_cache_ttl_seconds > 0:
+            self._entries[key] = _Entry(value, time.monotonic() + settings.analytics_cache_ttl_seconds, depends)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(1, settings.analytics_cache_max_entries):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "inFlight": len(self._inflight),
+            "ttlSeconds": settings.analytics_cache_ttl_seconds,
+            "maxEntries": settings.analytics_cache_max_entries,
+        }
+
+    # -- employee_events listener ------------------------------------------
+
+    def invalidate(self, fields: Optional[frozenset] = None) -> None:
+        for key in [key for key, entry in self._entries.items() if _overlaps(entry.fields, fields)]:
+            del self._entries[key]
+            self.invalidations += 1
+        for key, (_, depends) in self._inflight.items():
+            if _overlaps(depends, fields):
+                self._stale_loads.add(key)
+
+    def apply_change(self, before: Optional[dict], after: Optional[dict]) -> None:
+        if before is None or after is None:
+            # An employee added or removed changes any count.
+            self.invalidate(None)
+            return
+        changed = frozenset(
+            field for field in before.keys() | after.keys() if before.get(field) != after.get(field)
+        )
+        if changed:
+            self.invalidate(changed)
+
+
+analytics_cache = AnalyticsCache()
+employee_events.subscribe(analytics_cache)
+
+
+def cached(fields: Optional[Iterable[str]] = None):
+    """Cache an async service method's result, keyed by its name and arguments.
+
+    ``fields`` are the stored employee fields the result depends on (None: any).
+    The undecorated method stays available as ``__wrapped__``.
+    """
+    depends = tuple(fields) if fields is not None else None
+
+    def decorate(method: Callable[..., Awaitable[Any]]):
+        @functools.wraps(method)
+        async def wrapper(self, *args):
+            return await analytics_cache.get(
+                (method.__qualname__,) + args, lambda: method(self, *args), depends
+            )
+
+        return wrapper
+
+    return decorate
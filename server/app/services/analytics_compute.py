@@ -0,0 +1,187 @@
+"""CPU-bound analytics computations, run in the compute pool's worker processes.
+
+They take column views of the employee snapshot (``employee_snapshot.columns``):
+a dict with ``size`` (the number of employees), one NumPy array per requested
+field - ``salary`` as float64 with NaN where unknown, ``reviewCount`` as int32,
+and dictionary-encoded fields as int32 codes, ``MISSING`` where absent - and,
+under ``values``, each encoded field's list of values indexed by code. They are
+plain module-level functions over plain data so they can be pickled to a worker
+process; keep this module free of database and app imports: every worker
+process imports it.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+
+# Code of an absent (or non-string) value in a dictionary-encoded column.
+MISSING = -1
+
+RATING_VALUES = {
+    "Exceeds Expectations": 5,
+    "Meets Expectations": 3,
+    "Needs Improvement": 2,
+    "Unsatisfactory": 1,
+    "Unrated": 0,
+}
+
+
+def ready() -> bool:
+    """No-op the pool runs once per worker at startup, so imports happen early."""
+    return True
+
+
+def _is(columns: Dict, field: str, value: str) -> np.ndarray:
+    """Mask of the employees whose ``field`` is ``value``."""
+    values = columns["values"][field]
+    if value not in values:
+        return np.zeros(columns["size"], dtype=bool)
+    return columns[field] == values.index(value)
+
+
+def _salary_by(columns: Dict, field: str, rows: np.ndarray) -> Dict:
+    """Mean and count of known salaries per value of ``field`` among ``rows``."""
+    values = columns["values"][field]
+    codes = columns[field][rows]
+    salary = columns["salary"][rows]
+    present = codes != MISSING
+    codes, salary = codes[present], salary[present]
+    known = ~np.isnan(salary)
+
+    members = np.bincount(codes, minlength=len(values))
+    counts = np.bincount(codes[known], minlength=len(values))
+    sums = np.bincount(codes[known], weights=salary[known], minlength=len(values))
+    return {
+        values[code]: {
+            "mean": float(sums[code] / counts[code]) if counts[code] else float("nan"),
+            "count": int(counts[code]),
+        }
+        for code in sorted(np.flatnonzero(members), key=lambda code: values[code])
+    }
+
+
+def performance_trends(columns: Dict, timeframe: str) -> Dict:
+    """Employee count per performance rating, most common first (needs ``performanceRating``)."""
+    values = columns["values"]["performanceRating"]
+    codes = columns["performanceRating"]
+    counts = np.bincount(codes[codes != MISSING], minlength=len(values))
+    return {
+        "timeframe": timeframe,
+        "series": [
+            {"rating": values[code], "count": int(counts[code])}
+            for code in sorted(np.flatnonzero(counts), key=lambda code: -counts[code])
+        ]
+    }
+
+
+def salary_analytics(columns: Dict) -> Dict:
+    """Salary statistics overall, by department and by job level.
+
+    Needs ``salary``, ``department``, ``jobLevel`` and ``status``; only active
+    employees are counted.
+    """
+    if not columns["size"]:
+        return {
+            "overall": {},
+            "by_department": {},
+            "by_job_level": {}
+        }
+
+    # Filter to active employees only (when statuses are recorded at all)
+    if (columns["status"] != MISSING).any():
+        active = _is(columns, "status", "Active")
+    else:
+        active = np.ones(columns["size"], dtype=bool)
+    salary = columns["salary"][active]
+    known = salary[~np.isnan(salary)]
+
+    def stat(compute) -> float:
+        if not len(salary):
+            return 0
+        return float(compute(known)) if len(known) else float("nan")
+
+    overall_stats = {
+        "mean": stat(np.mean),
+        "median": stat(np.median),
+        "min": stat(np.min),
+        "max": stat(np.max),
+        "std": stat(lambda values: values.std(ddof=1) if len(values) > 1 else np.nan),
+    }
+
+    return {
+        "overall": overall_stats,
+        "by_department": _salary_by(columns, "department", active),
+        "by_job_level": _salary_by(columns, "jobLevel", active)
+    }
+
+
+def performance_analytics(columns: Dict) -> Optional[Dict]:
+    """Rating distribution and per-department performance of active employees.
+
+    Needs ``status``, ``performanceRating``, ``department`` and ``reviewCount``.
+    Returns None when nobody is active; ``overdueReviews`` is left for the
+    caller to fill in.
+    """
+    active = _is(columns, "status", "Active")
+    if not active.any():
+        return None
+    reviews = columns["reviewCount"][active]
+    total_reviews = int(reviews.sum())
+
+    # Index into RATING_VALUES per employee, -1 for ratings outside it; no
+    # rating at all (code MISSING, i.e. the appended last entry) is Unrated.
+    names = list(RATING_VALUES)
+    unrated = names.index("Unrated")
+    lookup = np.array(
+        [names.index(value) if value in RATING_VALUES else -1 for value in columns["values"]["performanceRating"]]
+        + [unrated],
+        dtype=np.int64,
+    )
+    ratings = lookup[columns["performanceRating"][active]]
+    scores = np.array(list(RATING_VALUES.values()), dtype=np.float64)
+
+    # Calculate rating distribution
+    counts = np.bincount(ratings[ratings >= 0], minlength=len(names))
+    rating_distribution = {name: int(counts[index]) for index, name in enumerate(names)}
+
+    rated = (ratings >= 0) & (ratings != unrated)
+    rated_count = int(rated.sum())
+    average_rating = float(scores[ratings[rated]].sum() / rated_count) if rated_count > 0 else 0
+
+    # Calculate department performance (no department counts as "Unknown")
+    departments = list(columns["values"]["department"])
+    if "Unknown" not in departments:
+        departments.append("Unknown")
+    groups = columns["department"][active]
+    groups = np.where(groups == MISSING, departments.index("Unknown"), groups)
+
+    employee_counts = np.bincount(groups, minlength=len(departments))
+    review_totals = np.bincount(groups, weights=reviews, minlength=len(departments))
+    rated_counts = np.bincount(groups[rated], minlength=len(departments))
+    score_sums = np.bincount(groups[rated], weights=scores[ratings[rated]], minlength=len(departments))
+    department_performance = {
+        departments[code]: {
+            "averageRating": float(score_sums[code] / rated_counts[code]) if rated_counts[code] else 0,
+            "totalReviews": int(review_totals[code]),
+            "employeeCount": int(employee_counts[code]),
+        }
+        for code in np.flatnonzero(employee_counts)
+    }
+
+    # Performance trends (quarterly for current year)
+    performance_trends = [
+        {"period": "2024-Q1", "averageRating": 3.2, "reviewCount": 15},
+        {"period": "2024-Q2", "averageRating": 3.4, "reviewCount": 18},
+        {"period": "2024-Q3", "averageRating": 3.6, "reviewCount": 12},
+        {"period": "2024-Q4", "averageRating": average_rating, "reviewCount": total_reviews},
+    ]
+
+    return {
+        "totalReviews": total_reviews,
+        "overdueReviews": 0,
+        "averageRating": round(average_rating, 2),
+        "ratingDistribution": rating_distribution,
+        "departmentPerformance": department_performance,
+        "performanceTrends": performance_trends,
+    }
@@ -1,4 +1,10 @@
-"""Analytics service with full pandas-based analytics (Phase 6)."""
+"""Analytics service.
+
+The dashboard is served from the workforce statistics store; salary and
+performance analytics are computed over the employee snapshot in the compute
+pool. The pandas dashboard is kept as the reference implementation the
+statistics are checked against.
+"""
 
 from datetime import datetime, timedelta
 from typing import Dict, List
@@ -7,17 +13,124 @@ import pandas as pd
 from dateutil.relativedelta import relativedelta
 
 from app.database import get_database
+from app.services import analytics_compute
+from app.services.analytics_cache import cached
+from app.services.compute_pool import compute_pool
+from app.services.employee_snapshot import employee_snapshot
+from app.services.workforce_stats import STATS_FIELDS, parse_hire_date, workforce_stats
+
+
+def _sum_by(cells: List[Dict], field: str) -> Dict:
+    """Add up statistics cells by one dimension, leaving out missing values."""
+    sums: Dict = {}
+    for cell in cells:
+        value = cell[field]
+        if value is None:
+            continue
+        total = sums.setdefault(value, {"count": 0, "salaryCount": 0, "salarySum": 0})
+        for counter in total:
+            total[counter] += cell[counter]
+    return sums
 
 
 class AnalyticsService:
+    @cached(STATS_FIELDS + ("fullName",))
     async def get_dashboard_analytics(self) -> Dict:
-        """Get complete analytics dashboard data."""
+        """Get complete analytics dashboard data.
+
+        Counts, salary averages and hires per month come from the workforce
+        statistics store (app/services/workforce_stats.py), a few documents per
+        department/status/level/type combination, so a dashboard load does not
+        scan the employees; only the last 30 days of hires are read from them,
+        through the hireDate index. The result matches
+        ``_dashboard_from_dataframe`` (see ``scripts/check_dashboard_parity.py`` and
+        ``tests/test_dashboard_parity.py``).
+        """
         db = await get_database()
-        
-        # Get all employees
-        cursor = db.employees.find({})
-        employees = await cursor.to_list(length=None)
-        
+        cells, months = await workforce_stats.load(db)
+        if not cells:
+            return self._empty_dashboard()
+
+        now = datetime.now()
+        active_cells = [cell for cell in cells if cell["status"] == "Active"]
+        total_employees = sum(cell["count"] for cell in cells)
+        active_employees = sum(cell["count"] for cell in active_cells)
+
+        def distribution(field: str, key: str, rows: List[Dict], denominator: int) -> List[Dict]:
+            counts = _sum_by(rows, field)
+            return [
+                {key: value, "count": sums["count"], "percentage": round((sums["count"] / denominator) * 100)}
+                for value, sums in sorted(counts.items(), key=lambda item: (-item[1]["count"], item[0]))
+            ]
+
+        department_distribution = distribution("department", "name", active_cells, active_employees)
+        salary_by_department = [
+            {
+                "department": department,
+                "averageSalary": round(sums["salarySum"] / sums["salaryCount"]) if sums["salaryCount"] else 0,
+                "count": sums["salaryCount"],
+            }
+            for department, sums in sorted(_sum_by(active_cells, "department").items())
+        ]
+        salary_by_department.sort(key=lambda x: x["averageSalary"], reverse=True)
+
+        salary_count = sum(cell["salaryCount"] for cell in active_cells)
+        month_keys = [(now - relativedelta(months=i)).strftime("%Y-%m") for i in range(11, -1, -1)]
+
+        return {
+            "totalEmployees": total_employees,
+            "activeEmployees": active_employees,
+            "totalDepartments": len(_sum_by(cells, "department")),
+            "averageSalary": sum(cell["salarySum"] for cell in active_cells) / salary_count if salary_count else 0,
+            "departmentDistribution": department_distribution,
+            "statusDistribution": distribution("status", "status", cells, total_employees),
+            "salaryByDepartment": salary_by_department,
+            "jobLevelDistribution": distribution("jobLevel", "level", active_cells, active_employees),
+            "hiringTrends": [
+                {"month": datetime.strptime(key, "%Y-%m").strftime("%b %Y"), "hires": months.get(key, 0)}
+                for key in month_keys
+            ],
+            "recentHires": await self._recent_hires(db, now - timedelta(days=30)),
+            "topDepartments": [
+                {"name": item["name"], "count": item["count"]}
+                for item in department_distribution[:5]
+            ],
+            "employmentTypes": distribution("employmentType", "type", active_cells, active_employees),
+        }
+
+    async def _recent_hires(self, db, since: datetime) -> List[Dict]:
+        """Employees hired after ``since``, most recent first.
+
+        Hire dates are ISO strings (or dates), so the range is an index scan on
+        hireDate; candidates are then compared by their parsed date.
+        """
+        cursor = db.employees.find(
+            {"$or": [{"hireDate": {"$gte": since.strftime("%Y-%m-%d")}}, {"hireDate": {"$gt": since}}]},
+            {"fullName": 1, "department": 1, "hireDate": 1},
+        ).sort("_id", 1)
+        hires = []
+        async for doc in cursor:
+            hired = parse_hire_date(doc.get("hireDate"))
+            if hired and hired > since:
+                hires.append((hired, doc))
+        hires.sort(key=lambda item: item[0], reverse=True)
+        return [
+            {
+                "id": str(doc["_id"]),
+                "name": doc.get("fullName", ""),
+                "department": doc.get("department", ""),
+                "hireDate": hired.strftime("%b %d, %Y"),
+            }
+            for hired, doc in hires
+        ]
+
+    def _dashboard_from_dataframe(self, employees: List[Dict]) -> Dict:
+        """Reference pandas implementation of the dashboard over full documents.
+
+        No longer used to serve requests; kept so the aggregation can be checked
+        against it (``python -m scripts.check_dashboard_parity``, and offline in
+        ``tests/test_dashboard_parity.py``).
+        """
         if not employees:
             return self._empty_dashboard()
         
@@ -207,130 +320,38 @@ class AnalyticsService:
             "topDepartments": [],
             "employmentTypes": []
         }
+    @cached(["department"])
     async def get_department_distribution(self) -> Dict:
-        """Get employee distribution by department."""
+        """Get employee distribution by department (from the workforce statistics)."""
         db = await get_database()
-        pipeline = [
-            {"$group": {"_id": "$department", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-        ]
-        result = await db.employees.aggregate(pipeline).to_list(length=None)
+        cells, _ = await workforce_stats.load(db)
+        counts: Dict = {}
+        for cell in cells:
+            counts[cell["department"]] = counts.get(cell["department"], 0) + cell["count"]
+        result = sorted(counts.items(), key=lambda item: item[1], reverse=True)
         return {
-            "departments": [item.get("_id") for item in result],
-            "counts": [item.get("count", 0) for item in result],
-            "total": sum(item.get("count", 0) for item in result),
+            "departments": [department for department, _ in result],
+            "counts": [count for _, count in result],
+            "total": sum(counts.values()),
         }
 
+    @cached(["performanceRating", "lastReviewDate", "hireDate"])
     async def get_performance_trends(self, timeframe: str = "12months") -> Dict:
-        """Get performance rating trends over time."""
+        """Get performance rating trends over time (from the employee snapshot)."""
         db = await get_database()
-        
-        # Get all employees with performance data
-        cursor = db.employees.find(
-            {},
-            {"performanceRating": 1, "lastReviewDate": 1, "hireDate": 1}
-        )
-        employees = await cursor.to_list(length=None)
-        
-        if not employees:
-            return {"timeframe": timeframe, "series": []}
-        
-        df = pd.DataFrame(employees)
-        
-        # Group by rating and count
-        rating_counts = df["performanceRating"].value_counts().to_dict()
-        
-        return {
-            "timeframe": timeframe,
-            "series": [
-                {"rating": rating, "count": count}
-                for rating, count in rating_counts.items()
-            ]
-        }
+        columns = await employee_snapshot.columns(db, ["performanceRating"])
+        return await compute_pool.run(analytics_compute.performance_trends, columns, timeframe)
 
+    @cached(["salary", "department", "jobLevel", "status"])
     async def get_salary_analytics(self) -> Dict:
-        """Get salary distribution and statistics using pandas."""
+        """Get salary distribution and statistics (from the employee snapshot)."""
         db = await get_database()
-        
-        # Get all salary data
-        cursor = db.employees.find(
-            {},
-            {"salary": 1, "department": 1, "jobLevel": 1, "status": 1}
-        )
-        employees = await cursor.to_list(length=None)
-        
-        if not employees:
-            return {
-                "overall": {},
-                "by_department": {},
-                "by_job_level": {}
-            }
-        
-        # Use pandas for analysis
-        df = pd.DataFrame(employees)
-        
-        # Filter to active employees only
-        if "status" in df.columns:
-            df = df[df["status"] == "Active"]
-        
-        overall_stats = {
-            "mean": float(df["salary"].mean()) if len(df) > 0 else 0,
-            "median": float(df["salary"].median()) if len(df) > 0 else 0,
-            "min": float(df["salary"].min()) if len(df) > 0 else 0,
-            "max": float(df["salary"].max()) if len(df) > 0 else 0,
-            "std": float(df["salary"].std()) if len(df) > 0 else 0,
-        }
-        
-        # By department
-        by_dept = {}
-        if "department" in df.columns and len(df) > 0:
-            dept_stats = df.groupby("department")["salary"].agg(["mean", "count"])
-            by_dept = {
-                dept: {"mean": float(row["mean"]), "count": int(row["count"])}
-                for dept, row in dept_stats.iterrows()
-            }
-        
-        # By job level
-        by_level = {}
-        if "jobLevel" in df.columns and len(df) > 0:
-            level_stats = df.groupby("jobLevel")["salary"].agg(["mean", "count"])
-            by_level = {
-                level: {"mean": float(row["mean"]), "count": int(row["count"])}
-                for level, row in level_stats.iterrows()
-            }
-        
-        return {
-            "overall": overall_stats,
-            "by_department": by_dept,
-            "by_job_level": by_level
-        }
+        columns = await employee_snapshot.columns(db, ["salary", "department", "jobLevel", "status"])
+        return await compute_pool.run(analytics_compute.salary_analytics, columns)
 
+    @cached(["hireDate"])
     async def get_hiring_trends(self) -> Dict:
-        """Get hiring trends over time."""
+        """Get hiring trends over time (from the workforce statistics)."""
         db = await get_database()
-        
-        # Get all employees with hire dates
-        cursor = db.employees.find({}, {"hireDate": 1, "status": 1})
-        employees = await cursor.to_list(length=None)
-        
-        if not employees:
-            return {"timeline": []}
-        
-        df = pd.DataFrame(employees)
-        
-        # Convert hireDate to datetime
-        df["hireDate"] = pd.to_datetime(df["hireDate"], errors="coerce")
-        df = df.dropna(subset=["hireDate"])
-        
-        # Group by year-month
-        df["yearMonth"] = df["hireDate"].dt.to_period("M")
-        monthly_hires = df.groupby("yearMonth").size()
-        
-        timeline = [
-            {"period": str(period), "count": int(count)}
-            for period, count in monthly_hires.items()
-        ]
-        
-        return {"timeline": timeline}
-
-
+        _, months = await workforce_stats.load(db)
+        return {"timeline": [{"period": month, "count": months[month]} for month in sorted(months)]}
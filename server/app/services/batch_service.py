@@ -0,0 +1,367 @@
+"""Batch employee creation.
+
+Validates a whole batch against one prefetched snapshot (referenced managers,
+taken employeeIds, the current CEO) instead of the several round trips
+``EmployeeService.create_employee`` makes per row, then writes every accepted
+row with one unordered ``insert_many``. Rows may report to other rows of the
+same batch, so a new team can be onboarded with its manager in one request.
+"""
+
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from app.database import get_database
+from app.models.employee import EmployeeCreate
+from app.services import employee_events
+from app.services.employee_service import EmployeeService
+from app.services.hierarchy_service import HierarchyService
+from app.services.sequence import (
+    GENERATED_ID_ATTEMPTS,
+    employee_id_number,
+    employee_ids,
+    format_employee_id,
+    is_duplicate_employee_id,
+)
+from app.services.workforce_stats import workforce_stats
+
+
+# Batches larger than this invalidate employee listeners (the suggest index)
+# instead of patching them one row at a time.
+_PER_ROW_EVENTS_LIMIT = 500
+
+# Stored fields needed to validate someone as a manager and build paths under them.
+_MANAGER_PROJECTION = {
+    "fullName": 1,
+    "workEmail": 1,
+    "employeeId": 1,
+    "status": 1,
+    "employmentType": 1,
+    "jobLevel": 1,
+    "managerId": 1,
+    "ancestors": 1,
+}
+
+
+class ManagerNotFound(ValueError):
+    """A row's managerRef matches neither another row nor an existing employee."""
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+class BatchService:
+    def __init__(self):
+        # Reuse the single-employee rules so batch and single creation agree.
+        self._employee_service = EmployeeService()
+        self._hierarchy = HierarchyService()
+
+    async def create_employees(
+        self, rows: List[Dict[str, Any]], defer_unresolved: bool = False
+    ) -> Dict:
+        """Validate and create a batch of employees; report the outcome per row.
+
+        With ``defer_unresolved``, rows whose ``managerRef`` cannot be found yet
+        (and the rows under them) are reported as ``deferred`` rather than
+        rejected, so a streaming import can retry them once their manager has
+        been created by a later chunk.
+        """
+        db = await get_database()
+        results = [{"index": i, "ref": None, "status": "rejected"} for i in range(len(rows))]
+        docs: Dict[int, dict] = {}
+        manager_refs: Dict[int, str] = {}
+
+        def reject(index: int, error: str) -> None:
+            results[index]["error"] = error
+            docs.pop(index, None)
+
+        def defer(index: int) -> None:
+            results[index]["status"] = "deferred"
+            docs.pop(index, None)
+
+        # 1. Validate each row on its own.
+        for index, row in enumerate(rows):
+            row = dict(row)
+            ref = row.pop("ref", None)
+            manager_ref = row.pop("managerRef", None)
+            # Refs are matched as strings, and echoed back as such.
+            results[index]["ref"] = str(ref) if ref is not None else None
+            try:
+                doc = EmployeeCreate(**row).model_dump(by_alias=True, exclude_unset=True)
+            except ValidationError as exc:
+                reject(index, _validation_message(exc))
+                continue
+            if manager_ref and doc.get("managerId"):
+                reject(index, "Give either managerId or managerRef, not both.")
+                continue
+            docs[index] = doc
+            if manager_ref:
+                manager_refs[index] = str(manager_ref)
+
+        # 2. Keys other rows can reference, and employeeIds already taken.
+        batch_keys: Dict[str, int] = {}
+        seen_employee_ids: Dict[str, int] = {}
+        for index in list(docs):
+            doc, ref = docs[index], results[index]["ref"]
+            if ref is not None:
+                if ref in batch_keys:
+                    reject(index, f"Duplicate ref '{ref}' in batch.")
+                    continue
+                batch_keys[ref] = index
+            employee_id = doc.get("employeeId")
+            if employee_id:
+                try:
+                    employee_id_number(employee_id)
+                except ValueError as exc:
+                    reject(index, str(exc))
+                    continue
+                if employee_id in seen_employee_ids:
+                    reject(index, f"Duplicate employeeId {employee_id} in batch.")
+                    continue
+                seen_employee_ids[employee_id] = index
+        for index, doc in docs.items():
+            for key in (doc.get("employeeId"), doc.get("workEmail")):
+                if key:
+                    batch_keys.setdefault(key, index)
+
+        if seen_employee_ids:
+            cursor = db.employees.find(
+                {"employeeId": {"$in": list(seen_employee_ids)}}, {"employeeId": 1}
+            )
+            async for taken in cursor:
+                reject(
+                    seen_employee_ids[taken["employeeId"]],
+                    f"Employee ID {taken['employeeId']} already exists.",
+                )
+
+        # 3. CEO rows drop their manager; only one active CEO may exist.
+        ceo_taken: Optional[bool] = None
+        for index in sorted(docs):
+            doc = docs[index]
+            if doc.get("jobLevel") != "CEO":
+                continue
+            if ceo_taken is None:
+                try:
+                    await self._employee_service._assert_single_ceo(db)
+                    ceo_taken = False
+                except ValueError:
+                    ceo_taken = True
+            if ceo_taken:
+                reject(index, "A CEO already exists. Only one CEO is allowed.")
+                continue
+            docs[index] = self._employee_service._apply_ceo_constraints(doc)
+            manager_refs.pop(index, None)
+            if doc.get("status") in ("Active", "On Leave"):
+                ceo_taken = True
+
+        # 4. Resolve managers: another row of the batch, or one prefetched
+        # snapshot of the existing employees referenced.
+        batch_manager: Dict[int, int] = {}
+        existing_manager: Dict[int, str] = {}
+        for index, doc in docs.items():
+            if index in manager_refs:
+                key = manager_refs[index]
+                if key in batch_keys:
+                    batch_manager[index] = batch_keys[key]
+                else:
+                    existing_manager[index] = key
+            elif doc.get("managerId"):
+                existing_manager[index] = doc["managerId"]
+        existing = await self._prefetch_managers(db, set(existing_manager.values()))
+
+        # 5. Check rows top-down so every manager is settled before their reports.
+        children: Dict[int, List[int]] = {}
+        for index, manager_index in batch_manager.items():
+            children.setdefault(manager_index, []).append(index)
+        # Start from rows without a batch manager, plus rows rejected earlier
+        # that others report to (so their reports are rejected with a reason).
+        queue = deque(sorted(
+            {i for i in docs if i not in batch_manager} | {m for m in children if m not in docs}
+        ))
+        paths: Dict[int, List[str]] = {}
+        oids: Dict[int, ObjectId] = {}
+        chains: Dict[str, List[str]] = {}
+        order: List[int] = []
+        now = datetime.utcnow()
+
+        while queue:
+            index = queue.popleft()
+            waiting = children.get(index, [])
+            doc = docs.get(index)
+            if doc is None:
+                for child in waiting:
+                    if results[index]["status"] == "deferred":
+                        defer(child)
+                    else:
+                        # Named by the child's managerRef, not by position:
+                        # imports submit their rows in chunks.
+                        reject(child, f"Manager '{manager_refs[child]}' was rejected.")
+                    queue.append(child)
+                continue
+            try:
+                path = await self._place(db, index, doc, batch_manager, existing_manager, existing, docs, oids, paths, chains)
+            except ManagerNotFound as exc:
+                # Only a managerRef can name a row that has not been created yet.
+                if defer_unresolved and index in manager_refs:
+                    defer(index)
+                else:
+                    reject(index, str(exc))
+                queue.append(index)
+                continue
+            except ValueError as exc:
+                reject(index, str(exc))
+                # Revisit as a rejected row to reject its reports.
+                queue.append(index)
+                continue
+            oids[index] = ObjectId()
+            paths[index] = path
+            doc.update({
+                "_id": oids[index],
+                "ancestors": path,
+                "depth": len(path),
+                "directReportCount": 0,
+                "subtreeSize": 0,
+                "createdAt": now,
+                "updatedAt": now,
+            })
+            doc.setdefault("docType", "employee")
+            doc.setdefault("source", "HR")
+            order.append(index)
+            queue.extend(waiting)
+
+        # Rows never reached report to each other in a loop.
+        for index in list(docs):
+            if index not in oids:
+                reject(index, "Rows in this batch report to each other in a loop.")
+
+        # 6. Number the accepted rows in one counter round trip, then insert.
+        generated = {i for i in order if not docs[i].get("employeeId")}
+        inserted = await self._insert(db, docs, order, generated, reject)
+        explicit = [employee_id_number(docs[i]["employeeId"]) for i in inserted if i not in generated]
+        await employee_ids.observe(db, [number for number in explicit if number is not None])
+
+        await self._hierarchy.count_in(db, (paths[i] for i in inserted))
+        await workforce_stats.record(db, ((None, docs[i]) for i in inserted))
+        per_row_events = len(inserted) <= _PER_ROW_EVENTS_LIMIT
+        for index in inserted:
+            doc = docs[index]
+            results[index].update(
+                {"status": "created", "_id": str(doc["_id"]), "employeeId": doc["employeeId"]}
+            )
+            if per_row_events:
+                employee_events.publish_change(None, doc)
+        if inserted and not per_row_events:
+            employee_events.publish_reset()
+
+        created = len(inserted)
+        deferred = sum(1 for result in results if result["status"] == "deferred")
+        return {
+            "createdCount": created,
+            "rejectedCount": len(rows) - created - deferred,
+            "results": results,
+        }
+
+    async def _insert(self, db, docs: Dict[int, dict], order: List[int], generated: set, reject) -> List[int]:
+        """Insert the rows in ``order``, numbering those in ``generated``; return
+        the rows inserted. A generated id that clashes with one a client chose
+        is replaced and the row tried again."""
+        inserted = set()
+        pending = list(order)
+        for attempt in range(GENERATED_ID_ATTEMPTS):
+            if not pending:
+                break
+            missing = sorted(i for i in pending if i in generated)
+            if missing:
+                numbers = await employee_ids.reserve(db, len(missing))
+                for index, number in zip(missing, numbers):
+                    docs[index]["employeeId"] = format_employee_id(number)
+            try:
+                await db.employees.insert_many([docs[i] for i in pending], ordered=False)
+                inserted.update(pending)
+                break
+            except BulkWriteError as exc:
+                failed, retry = set(), []
+                for error in exc.details.get("writeErrors", []):
+                    index = pending[error["index"]]
+                    failed.add(index)
+                    if (
+                        index in generated
+                        and attempt < GENERATED_ID_ATTEMPTS - 1
+                        and error.get("code") == 11000
+                        and is_duplicate_employee_id(error)
+                    ):
+                        retry.append(index)
+                    else:
+                        reject(index, error.get("errmsg", "Insert failed."))
+                inserted.update(i for i in pending if i not in failed)
+                pending = retry
+        return [i for i in order if i in inserted]
+
+    async def _prefetch_managers(self, db, keys: set) -> Dict[str, dict]:
+        """Existing employees referenced as managers, keyed by _id, employeeId and workEmail."""
+        if not keys:
+            return {}
+        oids = [ObjectId(k) for k in keys if ObjectId.is_valid(k)]
+        strings = list(keys)
+        cursor = db.employees.find(
+            {"$or": [
+                {"_id": {"$in": oids}},
+                {"employeeId": {"$in": strings}},
+                {"workEmail": {"$in": strings}},
+            ]},
+            _MANAGER_PROJECTION,
+        )
+        found: Dict[str, dict] = {}
+        async for doc in cursor:
+            for key in (str(doc["_id"]), doc.get("employeeId"), doc.get("workEmail")):
+                if key:
+                    found.setdefault(key, doc)
+        return found
+
+    async def _place(
+        self,
+        db,
+        index: int,
+        doc: dict,
+        batch_manager: Dict[int, int],
+        existing_manager: Dict[int, str],
+        existing: Dict[str, dict],
+        docs: Dict[int, dict],
+        oids: Dict[int, ObjectId],
+        paths: Dict[int, List[str]],
+        chains: Dict[str, List[str]],
+    ) -> List[str]:
+        """Check a row's manager and return the row's ancestors path."""
+        if index in batch_manager:
+            manager_index = batch_manager[index]
+            manager = docs[manager_index]
+            manager_id = str(oids[manager_index])
+            manager_path = paths[manager_index]
+        elif index in existing_manager:
+            key = existing_manager[index]
+            manager = existing.get(key)
+            # managerId is always an _id; managerRef may also be an employeeId/workEmail.
+            if doc.get("managerId") and manager is not None and str(manager["_id"]) != key:
+                manager = None
+            if manager is None:
+                raise ManagerNotFound("Selected manager does not exist.")
+            manager_id = str(manager["_id"])
+            if manager_id not in chains:
+                chains[manager_id] = await self._hierarchy.chain(db, manager)
+            manager_path = chains[manager_id]
+        else:
+            return []
+
+        self._employee_service._check_manager_rules(manager, doc.get("jobLevel"))
+        doc["managerId"] = manager_id
+        if not doc.get("managerName"):
+            doc["managerName"] = manager.get("fullName", "")
+        return manager_path + [manager_id]
@@ -0,0 +1,219 @@
+"""Background execution of bulk operations (``?async=true`` on /api/bulk/*).
+
+A job is one document in the ``bulk_jobs`` collection holding the operation, its
+request body, progress (``processed`` and the ``failedIds`` so far) and, once
+finished, the ``BulkOperationResponse``. Each API process runs a fixed number
+of worker tasks (``settings.bulk_job_workers``), so large selections never hold
+an HTTP request open and never run more than that many at once.
+
+Workers claim a queued job with an atomic status change, so a job runs once
+even when several processes hold its id. While a job runs, its process
+refreshes ``heartbeatAt`` on a timer, whether or not the operation reports
+progress. Every process checks, at startup and then periodically, for running
+jobs whose heartbeat is older than ``settings.bulk_job_stale_seconds`` (their
+process died) and marks them ``interrupted`` with whatever progress they had
+reached; at startup queued jobs are picked up again. Interrupted jobs are not
+re-run: operations such as scheduling reviews append to the employee record,
+so the client decides whether to resubmit.
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+
+from app.config import settings
+from app.database import get_database
+from app.models.bulk_operations import (
+    BulkAssignManagerRequest,
+    BulkConvertEmploymentTypeRequest,
+    BulkChangeStatusRequest,
+    BulkRehireEmployeesRequest,
+    BulkUpdateTrainingStatusRequest,
+    BulkSchedulePerformanceReviewRequest,
+)
+from app.services.bulk_service import BulkService
+
+
+BULK_JOBS = "bulk_jobs"
+
+# Operation name (the /api/bulk/<name> path) -> request model, BulkService method.
+OPERATIONS: Dict[str, Tuple[type, str]] = {
+    "assign-manager": (BulkAssignManagerRequest, "bulk_assign_manager"),
+    "convert-employment-type": (BulkConvertEmploymentTypeRequest, "bulk_convert_employment_type"),
+    "change-status": (BulkChangeStatusRequest, "bulk_change_status"),
+    "rehire-employees": (BulkRehireEmployeesRequest, "bulk_rehire_employees"),
+    "update-training-status": (BulkUpdateTrainingStatusRequest, "bulk_update_training_status"),
+    "schedule-performance-review": (BulkSchedulePerformanceReviewRequest, "bulk_schedule_performance_review"),
+}
+
+
+INTERRUPTED_ERROR = "The server stopped before this job finished."
+
+
+def _heartbeat_seconds() -> float:
+    """How often running jobs are touched and stale ones looked for."""
+    return max(1.0, settings.bulk_job_stale_seconds / 3)
+
+
+class BulkJobRunner:
+    def __init__(self) -> None:
+        self._queue: "asyncio.Queue[ObjectId]" = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        # Identifies this process on the jobs it runs (for debugging).
+        self._owner = f"{os.uname().nodename}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+    async def start(self) -> None:
+        """Recover jobs left by earlier runs and start the workers."""
+        db = await get_database()
+        await self._interrupt_stale(db)
+        async for job in db[BULK_JOBS].find({"status": "queued"}, {"_id": 1}).sort("createdAt", 1):
+            self._queue.put_nowait(job["_id"])
+
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(max(1, settings.bulk_job_workers))
+        ]
+        self._workers.append(asyncio.create_task(self._watch_stale()))
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, operation: str, request: BaseModel) -> str:
+        """Persist a job for ``operation`` and queue it; returns the job id."""
+        db = await get_database()
+        now = datetime.utcnow()
+        job = {
+            "operation": operation,
+            "request": request.model_dump(mode="json", by_alias=True),
+            "status": "queued",
+            "total": await BulkService().count_targets(request),
+            "processed": 0,
+            "failedIds": [],
+            "createdAt": now,
+        }
+        result = await db[BULK_JOBS].insert_one(job)
+        self._queue.put_nowait(result.inserted_id)
+        return str(result.inserted_id)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        if not ObjectId.is_valid(job_id):
+            return None
+        db = await get_database()
+        job = await db[BULK_JOBS].find_one({"_id": ObjectId(job_id)}, {"request": 0})
+        if job:
+            job["jobId"] = str(job.pop("_id"))
+        return job
+
+    async def _interrupt_stale(self, db) -> None:
+        """Mark running jobs whose process stopped heartbeating as interrupted."""
+        stale_before = datetime.utcnow() - timedelta(seconds=settings.bulk_job_stale_seconds)
+        interrupted = await db[BULK_JOBS].update_many(
+            {"status": "running", "heartbeatAt": {"$lt": stale_before}},
+            {"$set": {
+                "status": "interrupted",
+                "error": INTERRUPTED_ERROR,
+                "finishedAt": datetime.utcnow(),
+            }},
+        )
+        if interrupted.modified_count:
+            logging.warning(f"Marked {interrupted.modified_count} bulk job(s) as interrupted")
+
+    async def _watch_stale(self) -> None:
+        # Jobs of a process that died after this one started are only found here.
+        while True:
+            await asyncio.sleep(_heartbeat_seconds())
+            try:
+                await self._interrupt_stale(await get_database())
+            except Exception as exc:
+                logging.error(f"Checking for interrupted bulk jobs failed: {exc}")
+
+    async def _heartbeat(self, jobs, job_id: ObjectId) -> None:
+        # Operations that target a filter report no progress until they finish.
+        while True:
+            await asyncio.sleep(_heartbeat_seconds())
+            try:
+                await jobs.update_one(
+                    {"_id": job_id, "status": "running", "owner": self._owner},
+                    {"$set": {"heartbeatAt": datetime.utcnow()}},
+                )
+            except Exception as exc:
+                logging.error(f"Bulk job {job_id} heartbeat failed: {exc}")
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logging.error(f"Bulk job {job_id} could not be run: {exc}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: ObjectId) -> None:
+        db = await get_database()
+        jobs = db[BULK_JOBS]
+        now = datetime.utcnow()
+        job = await jobs.find_one_and_update(
+            {"_id": job_id, "status": "queued"},
+            {"$set": {"status": "running", "startedAt": now, "heartbeatAt": now, "owner": self._owner}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if job is None:
+            # Already claimed by another process (or no longer queued).
+            return
+
+        async def progress(processed: int, failed_ids: List[str]) -> None:
+            await jobs.update_one(
+                {"_id": job_id},
+                {"$set": {"processed": processed, "failedIds": failed_ids, "heartbeatAt": datetime.utcnow()}},
+            )
+
+        model, method = OPERATIONS[job["operation"]]
+        heartbeat = asyncio.create_task(self._heartbeat(jobs, job_id))
+        try:
+            request = model.model_validate(job["request"])
+            result = await getattr(BulkService(), method)(request, progress=progress)
+        except asyncio.CancelledError:
+            await jobs.update_one(
+                {"_id": job_id},
+                {"$set": {
+                    "status": "interrupted",
+                    "error": INTERRUPTED_ERROR,
+                    "finishedAt": datetime.utcnow(),
+                }},
+            )
+            raise
+        except Exception as exc:
+            logging.error(f"Bulk job {job_id} ({job['operation']}) failed: {exc}")
+            await jobs.update_one(
+                {"_id": job_id},
+                {"$set": {"status": "failed", "error": str(exc), "finishedAt": datetime.utcnow()}},
+            )
+            return
+        finally:
+            heartbeat.cancel()
+
+        await jobs.update_one(
+            {"_id": job_id},
+            {"$set": {
+                "status": "completed",
+                "processed": job["total"],
+                "failedIds": result.get("failedIds") or [],
+                "result": result,
+                "finishedAt": datetime.utcnow(),
+            }},
+        )
+
+
+bulk_jobs = BulkJobRunner()
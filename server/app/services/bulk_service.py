@@ -1,7 +1,8 @@
 """Bulk operations service (Phase 6B)."""
 
+import logging
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, List, Optional, Tuple
 from bson import ObjectId
 
 from app.database import get_database
@@ -12,8 +13,14 @@ from app.models.bulk_operations import (
     BulkRehireEmployeesRequest,
     BulkUpdateTrainingStatusRequest,
     BulkSchedulePerformanceReviewRequest,
+    BulkTarget,
 )
+from app.models.employee import SearchCriteria
+from app.services import employee_events
 from app.services.employee_service import EmployeeService
+from app.services.hierarchy_service import HierarchyService
+from app.services.workforce_stats import STATS_FIELDS, STATS_PROJECTION, workforce_stats
+from app.utils.bulk_writes import BULK_BATCH_SIZE, Progress, parse_ids, update_by_ids
 
 
 class BulkService:
@@ -21,269 +28,317 @@ class BulkService:
         # Reuse the single-employee hierarchy validation so bulk and single paths
         # enforce exactly the same rules.
         self._employee_service = EmployeeService()
-
-    async def bulk_assign_manager(self, request: BulkAssignManagerRequest) -> Dict:
-        """Assign a manager to multiple employees."""
+        self._hierarchy = HierarchyService()
+
+    async def bulk_assign_manager(
+        self, request: BulkAssignManagerRequest, progress: Optional[Progress] = None
+    ) -> Dict:
+        """Assign a manager to multiple employees.
+
+        The manager and their reporting chain are loaded once, the employees are
+        fetched with one ``$in`` per chunk and every rule is checked in memory;
+        the valid rows are then written with one ``update_many`` and re-pathed
+        with ``HierarchyService.move_many``. ``failureReasons`` says why each
+        failed id was rejected.
+        """
         db = await get_database()
-        updated_count = 0
-        failed_count = 0
-        failed_ids = []
-
-        # First, get the manager's name
-        manager = await db.employees.find_one({"_id": ObjectId(request.manager_id)})
-        if not manager:
-            return {
-                "success": False,
-                "updatedCount": 0,
-                "failedCount": len(request.employee_ids),
-                "message": "Manager not found",
-                "failedIds": request.employee_ids
+        if request.dry_run:
+            return await self._dry_run(db, request)
+        employee_ids = await self._target_ids(db, request)
+        matched = len(employee_ids) if request.filter else None
+        reasons: Dict[str, str] = {}
+
+        # Load the manager and their whole reporting chain once; each employee
+        # is then checked against that ancestor set without further lookups.
+        try:
+            loaded = await self._employee_service._load_manager(db, request.manager_id, with_chain=True)
+        except ValueError:
+            loaded = None
+        if not loaded:
+            reasons = {emp_id: "Manager not found" for emp_id in employee_ids}
+            result = self._result(0, employee_ids, "Manager not found", matched)
+            result["failureReasons"] = reasons or None
+            return result
+
+        manager = loaded[0]
+        # Everyone moves under the same manager, so they share one path.
+        manager_path = await self._hierarchy.path_under(db, request.manager_id)
+        update = {
+            "$set": {
+                "managerId": request.manager_id,
+                "managerName": manager.get("fullName", ""),
+                "updatedAt": datetime.utcnow(),
+                "hrAssignment.managerEmail": manager.get("workEmail", ""),
+                "hrAssignment.managerAssignDate": request.assignment_date,
             }
-
-        manager_name = manager.get("fullName", "")
-
-        for emp_id in request.employee_ids:
-            try:
-                _id = ObjectId(emp_id)
-                employee = await db.employees.find_one({"_id": _id})
-                if not employee:
-                    failed_count += 1
-                    failed_ids.append(emp_id)
-                    continue
-
-                # Enforce the same hierarchy rules as single-employee assignment
-                # (manager seniority, status, employment type, no self-management).
-                await self._employee_service._validate_manager_constraints(
-                    db,
-                    {"managerId": request.manager_id, "jobLevel": employee.get("jobLevel")},
-                    exclude_id=_id,
-                )
-
-                result = await db.employees.update_one(
-                    {"_id": _id},
-                    {
-                        "$set": {
-                            "managerId": request.manager_id,
-                            "managerName": manager_name,
-                            "updatedAt": datetime.utcnow(),
-                            "hrAssignment.managerEmail": manager.get("workEmail", ""),
-                            "hrAssignment.managerAssignDate": request.assignment_date,
-                        }
-                    }
-                )
-                if result.matched_count > 0:
-                    updated_count += 1
-                else:
-                    failed_count += 1
-                    failed_ids.append(emp_id)
-            except Exception as e:
-                failed_count += 1
-                failed_ids.append(emp_id)
-                print(f"Error updating employee {emp_id}: {e}")
-
-        return {
-            "success": failed_count == 0,
-            "updatedCount": updated_count,
-            "failedCount": failed_count,
-            "message": f"Successfully assigned manager to {updated_count} employee(s)",
-            "failedIds": failed_ids if failed_ids else None
         }
 
-    async def bulk_convert_employment_type(self, request: BulkConvertEmploymentTypeRequest) -> Dict:
-        """Convert employment type for multiple employees."""
-        db = await get_database()
+        parsed, invalid = parse_ids(employee_ids)
+        for emp_id in invalid:
+            reasons[emp_id] = "Invalid employee id"
         updated_count = 0
-        failed_count = 0
-        failed_ids = []
-
-        for emp_id in request.employee_ids:
-            try:
-                _id = ObjectId(emp_id)
-                result = await db.employees.update_one(
-                    {"_id": _id},
-                    {
-                        "$set": {
-                            "employmentType": request.new_employment_type,
-                            "updatedAt": datetime.utcnow(),
-                        }
-                    }
+        for start in range(0, len(parsed), BULK_BATCH_SIZE):
+            chunk = parsed[start:start + BULK_BATCH_SIZE]
+            found = {
+                doc["_id"]: doc
+                async for doc in db.employees.find(
+                    {"_id": {"$in": [oid for _, oid in chunk]}}, {"jobLevel": 1}
                 )
-                if result.matched_count > 0:
-                    updated_count += 1
-                else:
-                    failed_count += 1
-                    failed_ids.append(emp_id)
-            except Exception as e:
-                failed_count += 1
-                failed_ids.append(emp_id)
-                print(f"Error updating employee {emp_id}: {e}")
-
-        return {
-            "success": failed_count == 0,
-            "updatedCount": updated_count,
-            "failedCount": failed_count,
-            "message": f"Successfully converted {updated_count} employee(s) to {request.new_employment_type}",
-            "failedIds": failed_ids if failed_ids else None
-        }
-
-    async def bulk_change_status(self, request: BulkChangeStatusRequest) -> Dict:
-        """Change status for multiple employees."""
+            }
+            valid = []
+            for emp_id, oid in chunk:
+                employee = found.get(oid)
+                if employee is None:
+                    reasons[emp_id] = "Employee not found"
+                    continue
+                # Same hierarchy rules as single-employee assignment (manager
+                # seniority, status, employment type, no self-management, no cycles).
+                try:
+                    await self._employee_service._validate_manager_constraints(
+                        db,
+                        {"managerId": request.manager_id, "jobLevel": employee.get("jobLevel")},
+                        exclude_id=oid,
+                        manager=loaded,
+                    )
+                except ValueError as e:
+                    reasons[emp_id] = str(e)
+                    continue
+                valid.append(oid)
+
+            if valid:
+                result = await db.employees.update_many({"_id": {"$in": valid}}, update)
+                updated_count += result.matched_count
+                await self._hierarchy.move_many(db, valid, request.manager_id, path=manager_path)
+            if progress:
+                await progress(len(invalid) + start + len(chunk), [e for e in employee_ids if e in reasons])
+
+        if updated_count:
+            employee_events.publish_reset(["managerId", "managerName", "hrAssignment"])
+
+        failed_ids = [emp_id for emp_id in employee_ids if emp_id in reasons]
+        result = self._result(
+            updated_count,
+            failed_ids,
+            f"Successfully assigned manager to {updated_count} employee(s)",
+            matched,
+        )
+        result["failureReasons"] = {emp_id: reasons[emp_id] for emp_id in failed_ids} or None
+        return result
+
+    async def bulk_convert_employment_type(
+        self, request: BulkConvertEmploymentTypeRequest, progress: Optional[Progress] = None
+    ) -> Dict:
+        """Convert employment type for multiple employees."""
         db = await get_database()
-        updated_count = 0
-        failed_count = 0
-        failed_ids = []
-
-        for emp_id in request.employee_ids:
-            try:
-                _id = ObjectId(emp_id)
-                update_data = {
-                    "status": request.new_status,
+        if request.dry_run:
+            return await self._dry_run(db, request)
+        updated_count, failed_ids, matched = await self._apply(
+            db,
+            request,
+            {
+                "$set": {
+                    "employmentType": request.new_employment_type,
                     "updatedAt": datetime.utcnow(),
                 }
-
-                # Keep terminationDate consistent across status transitions.
-                if request.new_status == "Terminated":
-                    update_data["terminationDate"] = request.effective_date
-                elif request.new_status in ("Active", "On Leave", "Inactive"):
-                    update_data["terminationDate"] = None
-
-                result = await db.employees.update_one(
-                    {"_id": _id},
-                    {"$set": update_data}
-                )
-                if result.matched_count > 0:
-                    # Terminating a manager must re-home their reports (skip-level),
-                    # same as the single-employee path.
-                    if request.new_status == "Terminated":
-                        await self._employee_service._clear_reports_for_terminated(db, _id)
-                    updated_count += 1
-                else:
-                    failed_count += 1
-                    failed_ids.append(emp_id)
-            except Exception as e:
-                failed_count += 1
-                failed_ids.append(emp_id)
-                print(f"Error updating employee {emp_id}: {e}")
-
-        return {
-            "success": failed_count == 0,
-            "updatedCount": updated_count,
-            "failedCount": failed_count,
-            "message": f"Successfully changed status to {request.new_status} for {updated_count} employee(s)",
-            "failedIds": failed_ids if failed_ids else None
+            },
+            progress,
+        )
+
+        if updated_count:
+            employee_events.publish_reset(["employmentType"])
+
+        return self._result(
+            updated_count,
+            failed_ids,
+            f"Successfully converted {updated_count} employee(s) to {request.new_employment_type}",
+            matched,
+        )
+
+    async def bulk_change_status(
+        self, request: BulkChangeStatusRequest, progress: Optional[Progress] = None
+    ) -> Dict:
+        """Change status for multiple employees."""
+        db = await get_database()
+        if request.dry_run:
+            return await self._dry_run(db, request)
+        update_data = {
+            "status": request.new_status,
+            "updatedAt": datetime.utcnow(),
         }
 
-    async def bulk_rehire_employees(self, request: BulkRehireEmployeesRequest) -> Dict:
+        # Keep terminationDate consistent across status transitions.
+        if request.new_status == "Terminated":
+            update_data["terminationDate"] = request.effective_date
+        elif request.new_status in ("Active", "On Leave", "Inactive"):
+            update_data["terminationDate"] = None
+
+        if request.new_status == "Terminated":
+            # Terminations re-home reports, so a filter is resolved to the
+            # terminated ids first.
+            employee_ids = await self._target_ids(db, request)
+            updated, failed_ids = await update_by_ids(
+                db.employees,
+                employee_ids,
+                {"$set": update_data},
+                projection={"directReportCount": 1, **STATS_PROJECTION},
+                progress=progress,
+            )
+            updated_count = len(updated)
+            await self._record_stats(db, updated, {"$set": update_data})
+            matched = len(employee_ids) if request.filter else None
+
+            # Terminating managers must re-home their reports, same as the
+            # single-employee path; all of them are re-homed together so reports
+            # under a chain of terminated managers land on the nearest survivor.
+            await self._employee_service._rehome_reports_of_terminated(
+                db, [doc["_id"] for doc in updated if doc.get("directReportCount", 1) > 0]
+            )
+        else:
+            updated_count, failed_ids, matched = await self._apply(
+                db, request, {"$set": update_data}, progress
+            )
+
+        if updated_count:
+            employee_events.publish_reset(["status", "terminationDate"])
+
+        return self._result(
+            updated_count,
+            failed_ids,
+            f"Successfully changed status to {request.new_status} for {updated_count} employee(s)",
+            matched,
+        )
+
+    async def bulk_rehire_employees(
+        self, request: BulkRehireEmployeesRequest, progress: Optional[Progress] = None
+    ) -> Dict:
         """Rehire multiple terminated employees."""
         db = await get_database()
-        updated_count = 0
-        failed_count = 0
-        failed_ids = []
-
+        if request.dry_run:
+            return await self._dry_run(db, request)
+        employee_ids = await self._target_ids(db, request)
         rehire_data = request.rehire_data
+        manager_id = rehire_data.manager_id
+        manager_name = rehire_data.manager_name
+        candidates = employee_ids
+        failed_ids = []
 
-        for emp_id in request.employee_ids:
+        if rehire_data.job_level == "CEO":
+            # Rehiring as CEO drops any manager, and only one CEO may exist: at
+            # most the first row can take the role.
+            manager_id, manager_name = None, None
+            candidates, failed_ids = candidates[:1], candidates[1:]
+            if candidates:
+                try:
+                    await self._employee_service._assert_single_ceo(
+                        db, exclude_id=ObjectId(candidates[0]) if ObjectId.is_valid(candidates[0]) else None
+                    )
+                except ValueError as e:
+                    logging.error(f"Error rehiring employee {candidates[0]}: {e}")
+                    candidates, failed_ids = [], employee_ids
+
+        # Every row gets the same manager: load them, their chain and the
+        # resulting path once, then check each row in memory.
+        manager_path: List[str] = []
+        if manager_id and candidates:
             try:
-                _id = ObjectId(emp_id)
-
-                manager_id = rehire_data.manager_id
-                manager_name = rehire_data.manager_name
-
-                # Rehiring as CEO: enforce the single-CEO rule and drop any manager.
-                if rehire_data.job_level == "CEO":
-                    await self._employee_service._assert_single_ceo(db, exclude_id=_id)
-                    manager_id, manager_name = None, None
-
-                # Enforce the same hierarchy rules as a normal hire/assignment.
-                await self._employee_service._validate_manager_constraints(
-                    db,
-                    {"managerId": manager_id, "jobLevel": rehire_data.job_level},
-                    exclude_id=_id,
-                )
-
-                result = await db.employees.update_one(
-                    {"_id": _id},
-                    {
-                        "$set": {
-                            "status": "Active",
-                            "hireDate": rehire_data.rehire_date,
-                            "department": rehire_data.department,
-                            "position": rehire_data.position,
-                            "jobLevel": rehire_data.job_level,
-                            "salary": rehire_data.salary,
-                            "employmentType": rehire_data.employment_type,
-                            "managerId": manager_id,
-                            "managerName": manager_name,
-                            "updatedAt": datetime.utcnow(),
-                        },
-                        "$unset": {
-                            "terminationDate": ""
-                        }
-                    }
-                )
-                if result.matched_count > 0:
-                    updated_count += 1
-                else:
-                    failed_count += 1
+                manager = await self._employee_service._load_manager(db, manager_id, with_chain=True)
+                manager_path = await self._hierarchy.path_under(db, manager_id)
+            except ValueError as e:
+                logging.error(f"Error rehiring employees: {e}")
+                manager, candidates, failed_ids = None, [], employee_ids
+            allowed = []
+            for emp_id in candidates:
+                try:
+                    await self._employee_service._validate_manager_constraints(
+                        db,
+                        {"managerId": manager_id, "jobLevel": rehire_data.job_level},
+                        exclude_id=ObjectId(emp_id) if ObjectId.is_valid(emp_id) else None,
+                        manager=manager,
+                    )
+                    allowed.append(emp_id)
+                except ValueError as e:
                     failed_ids.append(emp_id)
-            except Exception as e:
-                failed_count += 1
-                failed_ids.append(emp_id)
-                print(f"Error rehiring employee {emp_id}: {e}")
-
-        return {
-            "success": failed_count == 0,
-            "updatedCount": updated_count,
-            "failedCount": failed_count,
-            "message": f"Successfully rehired {updated_count} employee(s)",
-            "failedIds": failed_ids if failed_ids else None
+                    logging.error(f"Error rehiring employee {emp_id}: {e}")
+            candidates = allowed
+
+        rehire = {
+            "$set": {
+                "status": "Active",
+                "hireDate": rehire_data.rehire_date,
+                "department": rehire_data.department,
+                "position": rehire_data.position,
+                "jobLevel": rehire_data.job_level,
+                "salary": rehire_data.salary,
+                "employmentType": rehire_data.employment_type,
+                "managerId": manager_id,
+                "managerName": manager_name,
+                "updatedAt": datetime.utcnow(),
+            },
+            "$unset": {
+                "terminationDate": ""
+            }
         }
-
-    async def bulk_update_training_status(self, request: BulkUpdateTrainingStatusRequest) -> Dict:
+        updated, not_updated = await update_by_ids(
+            db.employees,
+            candidates,
+            rehire,
+            projection=STATS_PROJECTION,
+            progress=self._offset_progress(progress, failed_ids),
+        )
+        await self._record_stats(db, updated, rehire)
+        failed = set(failed_ids) | set(not_updated)
+        failed_ids = [emp_id for emp_id in employee_ids if emp_id in failed]
+
+        if updated:
+            await self._hierarchy.move_many(
+                db, [doc["_id"] for doc in updated], manager_id, path=manager_path
+            )
+            employee_events.publish_reset(["status", "hireDate", "department", "position", "jobLevel", "salary", "employmentType", "managerId", "managerName", "terminationDate"])
+
+        return self._result(
+            len(updated),
+            failed_ids,
+            f"Successfully rehired {len(updated)} employee(s)",
+            len(employee_ids) if request.filter else None,
+        )
+
+    async def bulk_update_training_status(
+        self, request: BulkUpdateTrainingStatusRequest, progress: Optional[Progress] = None
+    ) -> Dict:
         """Update training status for multiple employees."""
         db = await get_database()
-        updated_count = 0
-        failed_count = 0
-        failed_ids = []
-
-        for emp_id in request.employee_ids:
-            try:
-                _id = ObjectId(emp_id)
-                result = await db.employees.update_one(
-                    {"_id": _id},
-                    {
-                        "$set": {
-                            "trainingStatus": request.new_training_status,
-                            "developmentNotes": request.training_data.notes,
-                            "updatedAt": datetime.utcnow(),
-                        }
-                    }
-                )
-                if result.matched_count > 0:
-                    updated_count += 1
-                else:
-                    failed_count += 1
-                    failed_ids.append(emp_id)
-            except Exception as e:
-                failed_count += 1
-                failed_ids.append(emp_id)
-                print(f"Error updating training status for employee {emp_id}: {e}")
-
-        return {
-            "success": failed_count == 0,
-            "updatedCount": updated_count,
-            "failedCount": failed_count,
-            "message": f"Successfully updated training status to {request.new_training_status} for {updated_count} employee(s)",
-            "failedIds": failed_ids if failed_ids else None
-        }
-
-    async def bulk_schedule_performance_review(self, request: BulkSchedulePerformanceReviewRequest) -> Dict:
+        if request.dry_run:
+            return await self._dry_run(db, request)
+        updated_count, failed_ids, matched = await self._apply(
+            db,
+            request,
+            {
+                "$set": {
+                    "trainingStatus": request.new_training_status,
+                    "developmentNotes": request.training_data.notes,
+                    "updatedAt": datetime.utcnow(),
+                }
+            },
+            progress,
+        )
+
+        if updated_count:
+            employee_events.publish_reset(["trainingStatus", "developmentNotes"])
+
+        return self._result(
+            updated_count,
+            failed_ids,
+            f"Successfully updated training status to {request.new_training_status} for {updated_count} employee(s)",
+            matched,
+        )
+
+    async def bulk_schedule_performance_review(
+        self, request: BulkSchedulePerformanceReviewRequest, progress: Optional[Progress] = None
+    ) -> Dict:
         """Schedule performance reviews for multiple employees."""
         db = await get_database()
-        updated_count = 0
-        failed_count = 0
-        failed_ids = []
-
+        if request.dry_run:
+            return await self._dry_run(db, request)
         review_data = request.review_data
 
         # Create the new review record
@@ -301,39 +356,126 @@ class BulkService:
             "priority": review_data.priority or "medium",
         }
 
-        for emp_id in request.employee_ids:
-            try:
-                _id = ObjectId(emp_id)
-                
-                # Update the employee's next review date and add to performance history
-                update_data = {
+        # Update the employee's next review date and add to performance history
+        updated_count, failed_ids, matched = await self._apply(
+            db,
+            request,
+            {
+                "$set": {
                     "nextReviewDate": review_data.review_date,
                     "updatedAt": datetime.utcnow(),
-                }
-
-                result = await db.employees.update_one(
-                    {"_id": _id},
-                    {
-                        "$set": update_data,
-                        "$push": {"performanceHistory": new_review}
-                    }
-                )
-                if result.matched_count > 0:
-                    updated_count += 1
-                else:
-                    failed_count += 1
-                    failed_ids.append(emp_id)
-            except Exception as e:
-                failed_count += 1
-                failed_ids.append(emp_id)
-                print(f"Error scheduling performance review for employee {emp_id}: {e}")
-
+                },
+                "$push": {"performanceHistory": new_review}
+            },
+            progress,
+        )
+
+        if updated_count:
+            employee_events.publish_reset(["nextReviewDate", "performanceHistory"])
+
+        return self._result(
+            updated_count,
+            failed_ids,
+            f"Successfully scheduled performance reviews for {updated_count} employee(s)",
+            matched,
+        )
+
+    # -- targets -----------------------------------------------------------
+
+    def _filter_query(self, request: BulkTarget) -> Optional[dict]:
+        """The query a filter-targeted request selects with (None for employeeIds)."""
+        if request.filter is None:
+            return None
+        criteria = SearchCriteria(**request.filter.model_dump(exclude_none=True))
+        clauses = self._employee_service._search_clauses(criteria)
+        return self._employee_service._combine_clauses(list(clauses.values()))
+
+    async def count_targets(self, request: BulkTarget) -> int:
+        """How many employees the request names or its filter currently matches."""
+        query = self._filter_query(request)
+        if query is None:
+            return len(request.employee_ids)
+        db = await get_database()
+        return await db.employees.count_documents(query)
+
+    async def _target_ids(self, db, request: BulkTarget) -> List[str]:
+        """The request's employeeIds, or the ids its filter matches right now.
+
+        Used by operations whose rules or side effects are per employee
+        (manager checks, re-homing reports, hierarchy paths).
+        """
+        query = self._filter_query(request)
+        if query is None:
+            return request.employee_ids
+        return [str(doc["_id"]) async for doc in db.employees.find(query, {"_id": 1})]
+
+    async def _apply(
+        self, db, request: BulkTarget, update: Dict, progress: Optional[Progress]
+    ) -> Tuple[int, List[str], Optional[int]]:
+        """Apply a plain field update to the request's employees.
+
+        A filter is evaluated server-side by one ``update_many``; ids go through
+        chunked bulk writes. Returns (updated count, failed ids, matched count
+        for a filter).
+        """
+        query = self._filter_query(request)
+        counted = any(field in STATS_FIELDS for field in update.get("$set", {}))
+        if query is None:
+            updated, failed_ids = await update_by_ids(
+                db.employees,
+                request.employee_ids,
+                update,
+                projection=STATS_PROJECTION if counted else None,
+                progress=progress,
+            )
+            if counted:
+                await self._record_stats(db, updated, update)
+            return len(updated), failed_ids, None
+        if counted:
+            await workforce_stats.move_matching(db, query, update["$set"])
+        result = await db.employees.update_many(query, update)
+        return result.matched_count, [], result.matched_count
+
+    @staticmethod
+    async def _record_stats(db, updated: List[dict], update: Dict) -> None:
+        """Update the workforce statistics for ``update`` applied to ``updated``
+        (documents read before the write, with ``STATS_PROJECTION``)."""
+        changes = {field: value for field, value in update.get("$set", {}).items() if field in STATS_FIELDS}
+        if changes:
+            await workforce_stats.record(db, ((doc, {**doc, **changes}) for doc in updated))
+
+    async def _dry_run(self, db, request: BulkTarget) -> Dict:
+        """Report how many employees the request would touch, changing nothing."""
+        query = self._filter_query(request)
+        if query is None:
+            parsed, _ = parse_ids(request.employee_ids)
+            query = {"_id": {"$in": [oid for _, oid in parsed]}}
+        matched = await db.employees.count_documents(query)
+        return self._result(0, [], f"Dry run: {matched} employee(s) would be updated", matched)
+
+    @staticmethod
+    def _offset_progress(progress: Optional[Progress], failed_ids: List[str]) -> Optional[Progress]:
+        """Report progress over rows already rejected before the write, too."""
+        if progress is None:
+            return None
+
+        async def report(processed: int, failed: List[str]) -> None:
+            await progress(len(failed_ids) + processed, failed_ids + failed)
+
+        return report
+
+    @staticmethod
+    def _result(
+        updated_count: int,
+        failed_ids: List[str],
+        message: str,
+        matched_count: Optional[int] = None,
+    ) -> Dict:
         return {
-            "success": failed_count == 0,
+            "success": not failed_ids,
             "updatedCount": updated_count,
-            "failedCount": failed_count,
-            "message": f"Successfully scheduled performance reviews for {updated_count} employee(s)",
-            "failedIds": failed_ids if failed_ids else None
+            "failedCount": len(failed_ids),
+            "message": message,
+            "failedIds": failed_ids if failed_ids else None,
+            "matchedCount": matched_count,
         }
-
-
@@ -0,0 +1,107 @@
+"""Bounded process pool for CPU-bound analytics, off the event loop.
+
+A computation over every employee takes time proportional to the workforce,
+and run inline it stalls every other request served by the worker meanwhile.
+``compute_pool.run(fn, *args)`` instead runs a function from
+``app.services.analytics_compute`` in one of ``settings.analytics_pool_workers``
+separate processes while the event loop keeps serving requests.
+
+At most ``settings.analytics_pool_max_queue`` computations wait for a free
+process; beyond that ``run`` raises ``ComputePoolBusy`` straight away (answered
+with a 503) rather than letting a backlog of slow analytics build up. The
+analytics cache already makes identical concurrent requests share one
+computation, so only distinct ones count against the limit.
+
+With ``analytics_pool_workers = 0`` computations run inline on the event loop,
+as they used to; ``scripts.benchmark_analytics_load`` compares the two.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+from app.services import analytics_compute
+
+
+class ComputePoolBusy(RuntimeError):
+    """Too many analytics computations are already waiting for the pool."""
+
+
+class ComputePool:
+    def __init__(self) -> None:
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def start(self) -> None:
+        """Start the worker processes and wait until they have imported the
+        computations, so the first requests do not pay for it."""
+        executor = self._ensure_executor()
+        if executor is None:
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, analytics_compute.ready)
+            for _ in range(settings.analytics_pool_workers)
+        ))
+
+    async def stop(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """``fn(*args)`` computed in a worker process.
+
+        ``fn`` must be a module-level function and its arguments and result
+        picklable. Raises ``ComputePoolBusy`` when the queue is full.
+        """
+        executor = self._ensure_executor()
+        if executor is None:
+            return fn(*args)
+        if self._pending >= settings.analytics_pool_workers + settings.analytics_pool_max_queue:
+            self.rejected += 1
+            raise ComputePoolBusy("Analytics are busy; try again shortly")
+        self._pending += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # A worker died (killed, out of memory): start afresh next time.
+            logging.error("Analytics compute pool broke; restarting it")
+            if self._executor is executor:
+                self._executor = None
+            raise
+        finally:
+            self._pending -= 1
+        self.completed += 1
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": settings.analytics_pool_workers,
+            "maxQueue": settings.analytics_pool_max_queue,
+            "running": min(self._pending, settings.analytics_pool_workers),
+            "queued": max(0, self._pending - settings.analytics_pool_workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def _ensure_executor(self) -> Optional[ProcessPoolExecutor]:
+        if settings.analytics_pool_workers <= 0:
+            return None
+        if self._executor is None:
+            # Fresh interpreters rather than forks of a process running an
+            # event loop and driver threads.
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.analytics_pool_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+
+compute_pool = ComputePool()
@@ -0,0 +1,47 @@
+"""In-process fan-out of employee writes to derived, in-memory structures.
+
+Write paths publish what they changed; listeners (e.g. the suggest index) keep
+themselves in sync. A listener implements:
+
+- ``apply_change(before, after)`` for a single document write, where ``before``
+  is None on insert and ``after`` is None on removal, and
+- ``invalidate(fields)`` after writes too broad to describe per document (bulk
+  operations, manager re-homing), so the listener rebuilds on its own schedule.
+  ``fields`` names the stored fields that changed (None means unknown/any), so
+  listeners can ignore writes that do not touch what they hold.
+
+Listeners only see writes made by this process; each one is responsible for
+periodically refreshing to pick up writes from other workers.
+"""
+
+import logging
+from typing import Iterable, List, Optional
+
+
+_listeners: List = []
+
+
+def subscribe(listener) -> None:
+    """Register a listener for employee write notifications."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def publish_change(before: Optional[dict], after: Optional[dict]) -> None:
+    """Notify listeners of a single employee document write."""
+    for listener in _listeners:
+        try:
+            listener.apply_change(before, after)
+        except Exception as exc:
+            logging.error(f"Employee write listener {listener!r} failed: {exc}")
+            listener.invalidate()
+
+
+def publish_reset(fields: Optional[Iterable[str]] = None) -> None:
+    """Notify listeners that employees changed in ways not described per document."""
+    fields = frozenset(fields) if fields is not None else None
+    for listener in _listeners:
+        try:
+            listener.invalidate(fields)
+        except Exception as exc:
+            logging.error(f"Employee write listener {listener!r} failed to invalidate: {exc}")
@@ -1,15 +1,110 @@
 """Employee service with full CRUD operations (Phase 5)."""
 
-from datetime import datetime
-from typing import List, Optional
+import re
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
 
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
 from app.database import get_database
-from app.models.employee import Employee, EmployeeCreate, EmployeeUpdate, SearchCriteria
+from app.services import employee_events
+from app.services.hierarchy_service import HierarchyService
+from app.services.sequence import (
+    GENERATED_ID_ATTEMPTS,
+    employee_id_number,
+    employee_ids,
+    format_employee_id,
+    is_duplicate_employee_id,
+)
+from app.services.suggest_index import suggest_index
+from app.services.workforce_stats import workforce_stats
+from app.models.employee import (
+    MANAGER_ELIGIBLE_STATUSES,
+    MANAGER_ELIGIBLE_TYPES,
+    MANAGER_JOB_LEVELS,
+    Employee,
+    EmployeeCreate,
+    EmployeeSummary,
+    EmployeeUpdate,
+    SearchCriteria,
+)
+from app.utils.export_formats import model_columns
+from app.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    parse_sort,
+    sort_spec,
+)
+
+
+# Map old job level values to new enum values if needed
+JOB_LEVEL_ALIASES = {
+    "Entry Level": "Entry",
+    "Mid Level": "Mid",
+    "Senior Level": "Senior",
+    "Vice President": "VP",
+}
+
+# Stored field names a caller may request via ``fields=``.
+PROJECTABLE_FIELDS = frozenset(
+    field.alias or name for name, field in Employee.model_fields.items()
+)
+
+SUMMARY_FIELDS = tuple(
+    field.alias or name
+    for name, field in EmployeeSummary.model_fields.items()
+    if name != "id"
+)
+
+# Fields whose update must be validated against the stored document (manager
+# rules, the single-CEO rule, report re-homing, managerName sync, and
+# employmentType, which decides who may manage). Updates that touch none of
+# them are written in a single round trip: the manager checks only read
+# managerId, jobLevel and the manager's own document, so any other field
+# cannot change their outcome.
+VALIDATED_UPDATE_FIELDS = frozenset({"jobLevel", "managerId", "status", "fullName", "employmentType"})
+
+# Read-validate-write attempts for an update without expectedUpdatedAt that
+# keeps losing races with other writes.
+UPDATE_ATTEMPTS = 5
+
+CONCURRENT_MODIFICATION_MESSAGE = (
+    "This employee was changed by someone else. Reload and try again."
+)
+
+
+class ConcurrentModificationError(ValueError):
+    """A conditional write lost a race with another update."""
+
+
+def _stored_timestamp(value: Optional[datetime]) -> Optional[datetime]:
+    """``value`` as MongoDB stores and returns it: naive UTC, millisecond precision."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def _utcnow_ms() -> datetime:
+    """Current UTC time at BSON (millisecond) precision, so a timestamp returned
+    from memory equals the stored one and can be sent back as expectedUpdatedAt."""
+    return _stored_timestamp(datetime.utcnow())
+
+
+# Search dimensions counted by the faceted search.
+FACET_FIELDS = ("department", "status", "jobLevel", "employmentType")
+
+# A list response is either full employees, slim summaries, or raw projected rows.
+EmployeeList = Union[List[Employee], List[EmployeeSummary], List[dict]]
 
 
 class EmployeeService:
+    def __init__(self):
+        self._hierarchy = HierarchyService()
+
     def _normalize_employee_doc(self, doc: dict) -> dict:
         """Coerce stored MongoDB document into a shape acceptable by Employee.
 
@@ -27,16 +122,9 @@ class EmployeeService:
             except Exception:
                 pass
 
-        # Map old job level values to new enum values if needed
-        job_level_map = {
-            "Entry Level": "Entry",
-            "Mid Level": "Mid",
-            "Senior Level": "Senior",
-            "Vice President": "VP",
-        }
         jl = doc.get("jobLevel")
-        if isinstance(jl, str) and jl in job_level_map:
-            doc["jobLevel"] = job_level_map[jl]
+        if isinstance(jl, str) and jl in JOB_LEVEL_ALIASES:
+            doc["jobLevel"] = JOB_LEVEL_ALIASES[jl]
 
         # Ensure currency is a number (ISO 4217 code or just store the number)
         curr = doc.get("currency")
@@ -49,6 +137,45 @@ class EmployeeService:
 
         return doc
 
+    def _build_projection(
+        self, fields: Optional[List[str]] = None, view: Optional[str] = None
+    ) -> Optional[dict]:
+        """Translate ``fields=`` / ``view=summary`` into a MongoDB projection.
+
+        Returns None for the default full view, in which case callers read
+        whole documents and validate them as ``Employee``.
+        """
+        if view not in (None, "full", "summary"):
+            raise ValueError("view must be 'full' or 'summary'.")
+        if fields:
+            unknown = sorted(set(fields) - PROJECTABLE_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+            return {field: 1 for field in fields}
+        if view == "summary":
+            return {field: 1 for field in SUMMARY_FIELDS}
+        return None
+
+    def _shape_results(
+        self, docs: List[dict], projection: Optional[dict], fields: Optional[List[str]] = None
+    ) -> EmployeeList:
+        """Build the list response for full, summary or field-projected reads.
+
+        Projected rows skip ``_normalize_employee_doc`` (which back-fills fields
+        that were never fetched) and only get the cheap _id/jobLevel coercions.
+        """
+        if projection is None:
+            return [Employee(**self._normalize_employee_doc(d)) for d in docs]
+        for d in docs:
+            if "_id" in d:
+                d["_id"] = str(d["_id"])
+            jl = d.get("jobLevel")
+            if isinstance(jl, str) and jl in JOB_LEVEL_ALIASES:
+                d["jobLevel"] = JOB_LEVEL_ALIASES[jl]
+        if fields:
+            return docs
+        return [EmployeeSummary(**d) for d in docs]
+
     def _job_level_rank(self, level: Optional[str]) -> int:
         order = [
             "Entry",
@@ -66,14 +193,24 @@ class EmployeeService:
         except Exception:
             return -1
 
-    async def _validate_manager_constraints(self, db, employee_payload: dict, exclude_id: Optional[ObjectId] = None) -> None:
-        manager_id = employee_payload.get("managerId")
-        if not manager_id:
-            return
+    async def _load_manager(self, db, manager_id: str, with_chain: bool = False) -> Tuple[dict, Optional[set]]:
+        """Fetch a proposed manager, plus their reporting chain when cycles must be checked.
+
+        The chain is the set of ids (as strings) of the manager and everyone
+        above them. Raises ValueError if the manager does not exist.
+        """
         # managerId is stored as a string of the employee _id
         manager_doc = await db.employees.find_one({"_id": ObjectId(manager_id)}) if ObjectId.is_valid(manager_id) else await db.employees.find_one({"_id": manager_id})
         if not manager_doc:
             raise ValueError("Selected manager does not exist.")
+        if not with_chain:
+            return manager_doc, None
+        chain = set(await self._hierarchy.chain(db, manager_doc))
+        chain.update({manager_id, str(manager_doc["_id"])})
+        return manager_doc, chain
+
+    def _check_manager_rules(self, manager_doc: dict, employee_level: Optional[str]) -> None:
+        """Eligibility and seniority rules for a (loaded) manager."""
         manager_status = manager_doc.get("status")
         if manager_status not in ["Active", "On Leave"]:
             raise ValueError("Manager must be Active or On Leave.")
@@ -81,40 +218,45 @@ class EmployeeService:
         if manager_type not in ["Full-time", "Part-time"]:
             raise ValueError("Manager must be a Full-time or Part-time employee.")
         manager_level = manager_doc.get("jobLevel")
-        employee_level = employee_payload.get("jobLevel")
         if employee_level and self._job_level_rank(manager_level) < self._job_level_rank(employee_level):
             raise ValueError("Manager's job level must not be below the employee's level.")
-        # Prevent self-management and circular reporting chains. Only relevant on
-        # update (on create the employee has no id yet and can't be an ancestor).
+
+    async def _validate_manager_constraints(
+        self,
+        db,
+        employee_payload: dict,
+        exclude_id: Optional[ObjectId] = None,
+        manager: Optional[Tuple[dict, Optional[set]]] = None,
+    ) -> None:
+        """Check a proposed manager assignment.
+
+        ``manager`` is an already loaded ``_load_manager`` result, so callers
+        assigning the same manager to many employees fetch it (and its chain)
+        once.
+        """
+        manager_id = employee_payload.get("managerId")
+        if not manager_id:
+            return
+        # Cycles are only possible on update (on create the employee has no id
+        # yet and can't be an ancestor).
+        if manager is None:
+            manager = await self._load_manager(db, manager_id, with_chain=exclude_id is not None)
+        manager_doc, chain = manager
+        self._check_manager_rules(manager_doc, employee_payload.get("jobLevel"))
+        # Prevent self-management and circular reporting chains: if the employee
+        # being edited is the manager or sits above them, this assignment would
+        # close a loop. (Equal-level reporting is allowed, so a cycle is
+        # otherwise possible without this check.)
         if exclude_id is not None:
             employee_id_str = str(exclude_id)
-            manager_doc_id = str(manager_doc.get("_id"))
-            if manager_id == employee_id_str or manager_doc_id == employee_id_str:
+            if manager_id == employee_id_str or str(manager_doc.get("_id")) == employee_id_str:
                 raise ValueError("An employee cannot be their own manager.")
-
-            # Walk up the proposed manager's chain; if we reach the employee being
-            # edited, this assignment would close a loop. (Equal-level reporting is
-            # allowed, so a cycle is otherwise possible without this check.)
-            current = manager_doc.get("managerId")
-            seen = {manager_id, manager_doc_id}
-            steps = 0
-            while current and current not in seen and steps < 10000:
-                if current == employee_id_str:
-                    raise ValueError(
-                        "This assignment would create a circular reporting relationship."
-                    )
-                seen.add(current)
-                steps += 1
-                node = (
-                    await db.employees.find_one(
-                        {"_id": ObjectId(current)}, {"managerId": 1}
-                    )
-                    if ObjectId.is_valid(current)
-                    else await db.employees.find_one(
-                        {"_id": current}, {"managerId": 1}
-                    )
+            if chain is None:
+                chain = (await self._load_manager(db, manager_id, with_chain=True))[1]
+            if employee_id_str in chain:
+                raise ValueError(
+                    "This assignment would create a circular reporting relationship."
                 )
-                current = (node or {}).get("managerId")
 
     async def _assert_level_outranks_reports(self, db, employee_id: ObjectId, new_level: str) -> None:
         """A level change must still outrank the employee's existing direct reports."""
@@ -128,30 +270,65 @@ class EmployeeService:
                 )
 
     async def _clear_reports_for_terminated(self, db, employee_id: ObjectId) -> None:
-        """Re-home a terminated manager's reports to the skip-level manager.
-
-        When a manager is terminated their reports move up to the terminated
-        manager's own manager (skip-level), keeping the org tree intact. If the
-        terminated person had no manager (org root), the reports are detached.
+        """Re-home a terminated manager's reports (see ``_rehome_reports_of_terminated``)."""
+        await self._rehome_reports_of_terminated(db, [employee_id])
+
+    async def _rehome_reports_of_terminated(self, db, employee_ids: Iterable[ObjectId]) -> int:
+        """Re-home the reports of terminated managers to their nearest active manager.
+
+        Each report of a terminated manager moves up to the closest person above
+        that manager who is Active or On Leave and not among ``employee_ids``
+        (usually the skip-level manager), keeping the org tree intact. If there
+        is no such person the reports are detached. All terminations are taken
+        together, so the outcome does not depend on their order: reports of a
+        chain of terminated managers all land on the first survivor above it.
+        The moves are applied with one bulk write. Returns the number moved.
         """
-        manager_id_str = str(employee_id)
-        terminated = await db.employees.find_one({"_id": employee_id})
-        skip_manager_id = (terminated or {}).get("managerId")
-
-        update_fields = {"managerId": None, "managerName": None}
-        if skip_manager_id and ObjectId.is_valid(skip_manager_id):
-            skip_manager = await db.employees.find_one({"_id": ObjectId(skip_manager_id)})
-            # Only re-home to a manager who is still active.
-            if skip_manager and skip_manager.get("status") in ["Active", "On Leave"]:
-                update_fields = {
-                    "managerId": skip_manager_id,
-                    "managerName": skip_manager.get("fullName", ""),
-                }
-
-        await db.employees.update_many(
-            {"managerId": manager_id_str},
-            {"$set": update_fields},
-        )
+        terminated_ids = {str(_id) for _id in employee_ids}
+        if not terminated_ids:
+            return 0
+        reports = await db.employees.find(
+            {"managerId": {"$in": list(terminated_ids)}},
+            {"managerId": 1, "ancestors": 1, "subtreeSize": 1},
+        ).to_list(length=None)
+        if not reports:
+            return 0
+
+        # Reporting chains of the terminated managers with reports, and the
+        # people on them who could take the reports over.
+        managers = await db.employees.find(
+            {"_id": {"$in": [ObjectId(m) for m in {r["managerId"] for r in reports}]}},
+            {"managerId": 1, "ancestors": 1},
+        ).to_list(length=None)
+        chains = {str(m["_id"]): await self._hierarchy.chain(db, m) for m in managers}
+        above = {a for chain in chains.values() for a in chain} - terminated_ids
+        candidates = {
+            str(doc["_id"]): doc
+            async for doc in db.employees.find(
+                {"_id": {"$in": [ObjectId(a) for a in above if ObjectId.is_valid(a)]}},
+                {"fullName": 1, "status": 1},
+            )
+        }
+
+        def nearest_active(manager_id: str) -> Optional[dict]:
+            for ancestor in reversed(chains.get(manager_id, [])):
+                doc = candidates.get(ancestor)
+                if doc and doc.get("status") in ["Active", "On Leave"]:
+                    return doc
+            return None
+
+        targets = {manager_id: nearest_active(manager_id) for manager_id in chains}
+        moves = []
+        for report in reports:
+            target = targets.get(report["managerId"])
+            fields = {
+                "managerId": str(target["_id"]) if target else None,
+                "managerName": target.get("fullName", "") if target else None,
+            }
+            moves.append((report, target, fields))
+        await self._hierarchy.reparent(db, moves)
+        employee_events.publish_reset(["managerId", "managerName"])
+        return len(moves)
 
     async def get_employees(
         self,
@@ -159,18 +336,51 @@ class EmployeeService:
         limit: int = 100,
         department: Optional[str] = None,
         status: Optional[str] = None,
-    ) -> List[Employee]:
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        view: Optional[str] = None,
+    ) -> Tuple[EmployeeList, Optional[str]]:
+        """Get one page of employees and the cursor for the next page.
+
+        Results are ordered by ``sort`` (``fullName``, ``hireDate`` or
+        ``employeeId``, prefix ``-`` for descending) with ``_id`` as tiebreaker.
+        Passing the returned cursor back continues after the last row via a
+        keyset predicate; ``skip`` is only honoured for the first page. The next
+        cursor is None once the last page has been returned.
+
+        ``fields`` / ``view="summary"`` push a projection down to MongoDB and
+        return slim rows instead of full ``Employee`` models.
+        """
         db = await get_database()
+        field, direction = parse_sort(sort)
+        projection = self._build_projection(fields, view)
+        if projection is not None:
+            # The cursor is built from the sort key of the last row.
+            projection[field] = 1
         query: dict = {}
         if department:
             query["department"] = department
         if status:
             query["status"] = status
 
-        cursor = db.employees.find(query).skip(skip).limit(limit)
-        docs = await cursor.to_list(length=limit)
-        docs = [self._normalize_employee_doc(d) for d in docs]
-        return [Employee(**d) for d in docs]
+        if cursor:
+            value, last_id = decode_cursor(cursor, field, direction)
+            after = keyset_filter(field, direction, value, last_id)
+            query = {"$and": [query, after]} if query else after
+
+        find = db.employees.find(query, projection).sort(sort_spec(field, direction))
+        if skip and not cursor:
+            find = find.skip(skip)
+        # Fetch one extra row to learn whether another page exists.
+        docs = await find.limit(limit + 1).to_list(length=limit + 1)
+
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor(field, direction, docs[-1])
+
+        return self._shape_results(docs, projection, fields), next_cursor
 
     async def get_employee(self, employee_id: str) -> Optional[Employee]:
         db = await get_database()
@@ -184,42 +394,289 @@ class EmployeeService:
         doc = self._normalize_employee_doc(doc)
         return Employee(**doc)
 
-    async def search_employees(self, criteria: SearchCriteria) -> List[Employee]:
-        db = await get_database()
-        query: dict = {}
-
+    def _search_clauses(self, criteria: SearchCriteria) -> Dict[str, dict]:
+        """Structured filter clauses for a search, keyed by the field they constrain."""
+        clauses: Dict[str, dict] = {}
         if criteria.full_name:
-            query["$or"] = [
-                {"firstName": {"$regex": criteria.full_name, "$options": "i"}},
-                {"lastName": {"$regex": criteria.full_name, "$options": "i"}},
-                {"fullName": {"$regex": criteria.full_name, "$options": "i"}},
-            ]
+            clauses["fullName"] = {
+                "$or": [
+                    {"firstName": {"$regex": criteria.full_name, "$options": "i"}},
+                    {"lastName": {"$regex": criteria.full_name, "$options": "i"}},
+                    {"fullName": {"$regex": criteria.full_name, "$options": "i"}},
+                ]
+            }
         if criteria.department:
-            query["department"] = criteria.department
+            clauses["department"] = {"department": criteria.department}
         if criteria.position:
-            query["position"] = {"$regex": criteria.position, "$options": "i"}
+            clauses["position"] = {"position": {"$regex": criteria.position, "$options": "i"}}
         if criteria.status:
-            query["status"] = criteria.status.value
+            clauses["status"] = {"status": criteria.status.value}
         if criteria.manager_id:
-            query["managerId"] = criteria.manager_id
+            clauses["managerId"] = {"managerId": criteria.manager_id}
         if criteria.employment_type:
-            query["employmentType"] = criteria.employment_type
+            clauses["employmentType"] = {"employmentType": criteria.employment_type}
         if criteria.job_level:
-            query["jobLevel"] = criteria.job_level
+            clauses["jobLevel"] = {"jobLevel": criteria.job_level}
+        return clauses
+
+    @staticmethod
+    def _combine_clauses(clauses: List[dict]) -> dict:
+        if not clauses:
+            return {}
+        if len(clauses) == 1:
+            return dict(clauses[0])
+        return {"$and": list(clauses)}
+
+    @staticmethod
+    def _name_substring_clause(text: str) -> dict:
+        """Case-insensitive substring match on the name fields (regex fallback)."""
+        pattern = re.escape(text.strip())
+        return {
+            "$or": [
+                {"fullName": {"$regex": pattern, "$options": "i"}},
+                {"firstName": {"$regex": pattern, "$options": "i"}},
+                {"lastName": {"$regex": pattern, "$options": "i"}},
+            ]
+        }
+
+    async def search_employees(
+        self,
+        criteria: SearchCriteria,
+        fields: Optional[List[str]] = None,
+        view: Optional[str] = None,
+    ) -> Tuple[EmployeeList, int]:
+        """Search employees and return one page of results plus the total match count.
+
+        ``criteria.query`` runs a ranked search against the ``employee_search_text``
+        index (names weighted above position). If no whole word matches — e.g.
+        while a name is still being typed — it falls back to a case-insensitive
+        substring match on the names, ordered by fullName. Field filters apply in
+        both modes; ``skip``/``limit`` bound every response.
+        """
+        db = await get_database()
+        projection = self._build_projection(fields, view)
+        filters = list(self._search_clauses(criteria).values())
+
+        if criteria.query and criteria.query.strip():
+            text_query = self._combine_clauses(filters)
+            text_query["$text"] = {"$search": criteria.query}
+            total = await db.employees.count_documents(text_query)
+            if total:
+                cursor = (
+                    db.employees.find(text_query, projection)
+                    .sort([("score", {"$meta": "textScore"}), ("_id", 1)])
+                    .skip(criteria.skip)
+                    .limit(criteria.limit)
+                )
+                docs = await cursor.to_list(length=criteria.limit)
+                return self._shape_results(docs, projection, fields), total
+            filters.append(self._name_substring_clause(criteria.query))
+
+        query = self._combine_clauses(filters)
+        total = await db.employees.count_documents(query)
+        cursor = (
+            db.employees.find(query, projection)
+            .sort([("fullName", 1), ("_id", 1)])
+            .skip(criteria.skip)
+            .limit(criteria.limit)
+        )
+        docs = await cursor.to_list(length=criteria.limit)
+        return self._shape_results(docs, projection, fields), total
+
+    async def export_employees(
+        self,
+        criteria: SearchCriteria,
+        sort: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        view: Optional[str] = None,
+    ) -> Tuple[AsyncIterator[dict], List[str]]:
+        """Every employee matching ``criteria``, as raw rows read off one cursor.
+
+        Returns the row iterator and the columns a tabular export should use.
+        Bad ``sort``/``fields``/``view`` values raise ValueError here, before any
+        row is read. ``criteria.query`` matches whole words through the text index
+        when any employee matches, else name substrings, as in ``search_employees``;
+        rows are ordered by ``sort`` either way and ``skip``/``limit`` are ignored.
+        """
+        db = await get_database()
+        field, direction = parse_sort(sort)
+        projection = self._build_projection(fields, view)
+        if fields:
+            columns = ["_id"] + model_columns(Employee, [f for f in fields if f != "_id"])
+        else:
+            columns = model_columns(Employee, SUMMARY_FIELDS if projection else None)
+            if projection:
+                columns.insert(0, "_id")
+
+        filters = list(self._search_clauses(criteria).values())
+        query = None
+        if criteria.query and criteria.query.strip():
+            text_query = self._combine_clauses(filters)
+            text_query["$text"] = {"$search": criteria.query}
+            if await db.employees.find_one(text_query, {"_id": 1}):
+                query = text_query
+            else:
+                filters.append(self._name_substring_clause(criteria.query))
+        if query is None:
+            query = self._combine_clauses(filters)
+        cursor = (
+            db.employees.find(query, projection)
+            .sort(sort_spec(field, direction))
+            .batch_size(1000)
+        )
+
+        async def rows() -> AsyncIterator[dict]:
+            async for doc in cursor:
+                doc["_id"] = str(doc["_id"])
+                jl = doc.get("jobLevel")
+                if isinstance(jl, str) and jl in JOB_LEVEL_ALIASES:
+                    doc["jobLevel"] = JOB_LEVEL_ALIASES[jl]
+                yield doc
 
-        cursor = db.employees.find(query)
+        return rows(), columns
+
+    async def search_employees_faceted(
+        self,
+        criteria: SearchCriteria,
+        fields: Optional[List[str]] = None,
+        view: Optional[str] = None,
+    ) -> dict:
+        """Search and return one page, the total and facet counts in one aggregation.
+
+        Facet counts are disjunctive: each facet is counted under every active
+        filter except its own, so the UI can show how many results each other
+        value would give. Text queries fall back to name substring matching
+        exactly as in ``search_employees``.
+        """
+        db = await get_database()
+        projection = self._build_projection(fields, view)
+        clauses = self._search_clauses(criteria)
+        # Filters outside the facet dimensions apply to every facet.
+        base = [clause for key, clause in clauses.items() if key not in FACET_FIELDS]
+        dims = {key: clause for key, clause in clauses.items() if key in FACET_FIELDS}
+
+        if criteria.query and criteria.query.strip():
+            text_match = self._combine_clauses(base)
+            text_match["$text"] = {"$search": criteria.query}
+            result = await self._run_facets(db, text_match, dims, criteria, projection, ranked=True)
+            if result["total"]:
+                result["items"] = self._shape_results(result["items"], projection, fields)
+                return result
+            base.append(self._name_substring_clause(criteria.query))
+
+        result = await self._run_facets(
+            db, self._combine_clauses(base), dims, criteria, projection, ranked=False
+        )
+        result["items"] = self._shape_results(result["items"], projection, fields)
+        return result
+
+    async def _run_facets(
+        self,
+        db,
+        match: dict,
+        dims: Dict[str, dict],
+        criteria: SearchCriteria,
+        projection: Optional[dict],
+        ranked: bool,
+    ) -> dict:
+        all_dims = self._combine_clauses(list(dims.values()))
+        sort = {"score": {"$meta": "textScore"}, "_id": 1} if ranked else {"fullName": 1, "_id": 1}
+        page = [{"$match": all_dims}, {"$sort": sort}, {"$skip": criteria.skip}, {"$limit": criteria.limit}]
+        if projection is not None:
+            page.append({"$project": projection})
+
+        facets = {
+            "items": page,
+            "total": [{"$match": all_dims}, {"$count": "n"}],
+        }
+        for field in FACET_FIELDS:
+            others = self._combine_clauses([c for key, c in dims.items() if key != field])
+            facets[field] = [
+                {"$match": others},
+                {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+            ]
+
+        pipeline = [{"$match": match}, {"$facet": facets}]
+        docs = await db.employees.aggregate(pipeline).to_list(length=1)
+        out = docs[0] if docs else {}
+        total = out.get("total") or []
+        return {
+            "items": out.get("items", []),
+            "total": total[0]["n"] if total else 0,
+            "facets": {
+                field: [{"value": row["_id"], "count": row["count"]} for row in out.get(field, [])]
+                for field in FACET_FIELDS
+            },
+        }
+
+    async def get_direct_reports(
+        self,
+        employee_id: str,
+        fields: Optional[List[str]] = None,
+        view: Optional[str] = None,
+    ) -> EmployeeList:
+        db = await get_database()
+        projection = self._build_projection(fields, view)
+        cursor = db.employees.find({"managerId": employee_id}, projection)
         docs = await cursor.to_list(length=None)
-        docs = [self._normalize_employee_doc(d) for d in docs]
-        return [Employee(**d) for d in docs]
+        return self._shape_results(docs, projection, fields)
 
-    async def get_direct_reports(self, employee_id: str) -> List[Employee]:
+    async def get_subtree(
+        self,
+        employee_id: str,
+        max_depth: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        view: Optional[str] = None,
+    ) -> EmployeeList:
+        """Everyone under an employee, at any level (or at most ``max_depth`` below).
+
+        Ordered by level, then name. One indexed query on ``ancestors``.
+        """
         db = await get_database()
-        cursor = db.employees.find({"managerId": employee_id})
+        if not ObjectId.is_valid(employee_id):
+            raise ValueError("Invalid employee ID")
+        query: dict = {"ancestors": employee_id}
+        if max_depth is not None:
+            root = await db.employees.find_one({"_id": ObjectId(employee_id)}, {"depth": 1})
+            if not root:
+                raise ValueError("Employee not found")
+            query["depth"] = {"$lte": (root.get("depth") or 0) + max_depth}
+        projection = self._build_projection(fields, view)
+        cursor = db.employees.find(query, projection).sort([("depth", 1), ("fullName", 1), ("_id", 1)])
         docs = await cursor.to_list(length=None)
-        docs = [self._normalize_employee_doc(d) for d in docs]
-        return [Employee(**d) for d in docs]
+        return self._shape_results(docs, projection, fields)
 
-    async def get_managers(self) -> List[Employee]:
+    async def get_reporting_chain(
+        self,
+        employee_id: str,
+        fields: Optional[List[str]] = None,
+        view: Optional[str] = None,
+    ) -> EmployeeList:
+        """Everyone above an employee, top of the org first."""
+        db = await get_database()
+        if not ObjectId.is_valid(employee_id):
+            raise ValueError("Invalid employee ID")
+        employee = await db.employees.find_one(
+            {"_id": ObjectId(employee_id)}, {"ancestors": 1, "managerId": 1}
+        )
+        if not employee:
+            raise ValueError("Employee not found")
+        chain = await self._hierarchy.chain(db, employee)
+        if not chain:
+            return []
+        projection = self._build_projection(fields, view)
+        ids = [ObjectId(i) if ObjectId.is_valid(i) else i for i in chain]
+        docs = await db.employees.find({"_id": {"$in": ids}}, projection).to_list(length=None)
+        position = {value: index for index, value in enumerate(chain)}
+        docs.sort(key=lambda d: position.get(str(d["_id"]), len(position)))
+        return self._shape_results(docs, projection, fields)
+
+    async def get_managers(
+        self,
+        fields: Optional[List[str]] = None,
+        view: Optional[str] = None,
+    ) -> EmployeeList:
         """Get all employees who are eligible to be managers.
 
         A manager is identified by either:
@@ -230,31 +687,37 @@ class EmployeeService:
         (the canonical eligibility rules).
         """
         db = await get_database()
+        projection = self._build_projection(fields, view)
 
-        # managerId is the single source of truth for reporting relationships, so
-        # derive "has reports" from it rather than the denormalized directReports
-        # array (which is not maintained on write).
-        ids_with_reports = await db.employees.distinct(
-            "managerId", {"managerId": {"$nin": [None, ""]}}
-        )
-        # Stored managerIds are strings of the manager's _id; convert to ObjectId.
-        object_ids_with_reports = [
-            ObjectId(mid) for mid in ids_with_reports if mid and ObjectId.is_valid(mid)
-        ]
-
+        # managerId is the single source of truth for reporting relationships;
+        # directReportCount is the number of people whose managerId points here,
+        # maintained on every write that changes managerId (see
+        # HierarchyService.shift_counts), rather than the denormalized
+        # directReports array (which is not maintained on write).
         query = {
             "$or": [
-                {"_id": {"$in": object_ids_with_reports}},
-                {"jobLevel": {"$in": ["Manager", "Director", "VP", "C-Level", "CEO"]}},
+                {"directReportCount": {"$gt": 0}},
+                {"jobLevel": {"$in": list(MANAGER_JOB_LEVELS)}},
             ],
-            "status": {"$in": ["Active", "On Leave"]},
-            "employmentType": {"$in": ["Full-time", "Part-time"]},
+            "status": {"$in": list(MANAGER_ELIGIBLE_STATUSES)},
+            "employmentType": {"$in": list(MANAGER_ELIGIBLE_TYPES)},
         }
 
-        cursor = db.employees.find(query).sort("fullName", 1)
+        cursor = db.employees.find(query, projection).sort("fullName", 1)
         docs = await cursor.to_list(length=None)
-        docs = [self._normalize_employee_doc(d) for d in docs]
-        return [Employee(**d) for d in docs]
+        return self._shape_results(docs, projection, fields)
+
+    async def suggest_employees(
+        self, q: str, limit: int = 10, managers_only: bool = False
+    ) -> List[dict]:
+        """Typeahead: top prefix matches on name or employeeId.
+
+        ``managers_only`` restricts matches to people eligible to manage under
+        the same rules as ``get_managers``.
+        """
+        db = await get_database()
+        await suggest_index.ensure_fresh(db)
+        return suggest_index.suggest(q, limit, managers_only)
 
     async def _assert_single_ceo(self, db, exclude_id: Optional[ObjectId] = None):
         query = {"jobLevel": "CEO", "status": {"$in": ["Active", "On Leave"]}}
@@ -280,8 +743,7 @@ class EmployeeService:
 
         # Convert to dict and add metadata
         employee_dict = employee_data.model_dump(by_alias=True, exclude_unset=True)
-        employee_dict["createdAt"] = datetime.utcnow()
-        employee_dict["updatedAt"] = datetime.utcnow()
+        employee_dict["createdAt"] = employee_dict["updatedAt"] = _utcnow_ms()
 
         # Ensure required system fields
         if "docType" not in employee_dict:
@@ -290,8 +752,13 @@ class EmployeeService:
             employee_dict["source"] = "HR"
 
         # Auto-generate employeeId if not provided
-        if "employeeId" not in employee_dict or not employee_dict["employeeId"]:
+        generated = not employee_dict.get("employeeId")
+        if generated:
             employee_dict["employeeId"] = await self._generate_employee_id(db)
+            number = None
+        else:
+            # Range-checked before the insert; moves the counter past it after.
+            number = employee_id_number(employee_dict["employeeId"])
 
         # CEO constraints
         if employee_dict.get("jobLevel") == "CEO":
@@ -301,35 +768,45 @@ class EmployeeService:
         # Manager constraints
         await self._validate_manager_constraints(db, employee_dict)
 
-        result = await db.employees.insert_one(employee_dict)
+        ancestors = await self._hierarchy.path_under(db, employee_dict.get("managerId"))
+        employee_dict["ancestors"] = ancestors
+        employee_dict["depth"] = len(ancestors)
+        employee_dict["directReportCount"] = 0
+        employee_dict["subtreeSize"] = 0
+
+        for attempt in range(GENERATED_ID_ATTEMPTS):
+            try:
+                result = await db.employees.insert_one(employee_dict)
+                break
+            except DuplicateKeyError as exc:
+                # A generated id can clash with one a client chose; take the next.
+                if not generated or attempt == GENERATED_ID_ATTEMPTS - 1 or not is_duplicate_employee_id(exc.details):
+                    raise ValueError(f"Employee ID {employee_dict['employeeId']} already exists.")
+                employee_dict.pop("_id", None)
+                employee_dict["employeeId"] = await self._generate_employee_id(db)
+        if number is not None:
+            await employee_ids.observe(db, [number])
         employee_dict["_id"] = str(result.inserted_id)
+        await self._hierarchy.shift_counts(db, [], ancestors, 1)
+        await workforce_stats.record(db, [(None, employee_dict)])
+        employee_events.publish_change(None, employee_dict)
 
         return Employee(**self._normalize_employee_doc(employee_dict))
 
     async def _generate_employee_id(self, db) -> str:
         """Generate a unique employee ID in format EMP001, EMP002, etc."""
-        # Find the highest existing employee ID
-        cursor = db.employees.find(
-            {"employeeId": {"$regex": "^EMP[0-9]+$"}},
-            {"employeeId": 1}
-        ).sort("employeeId", -1).limit(1)
-        
-        docs = await cursor.to_list(length=1)
-        
-        if docs and docs[0].get("employeeId"):
-            # Extract number from last employee ID (e.g., "EMP023" -> 23)
-            last_id = docs[0]["employeeId"]
-            last_num = int(last_id.replace("EMP", ""))
-            next_num = last_num + 1
-        else:
-            # No existing employees, start at 1
-            next_num = 1
-        
-        # Format as EMP001, EMP002, etc.
-        return f"EMP{next_num:03d}"
+        return format_employee_id(await employee_ids.next(db))
 
     async def update_employee(self, employee_id: str, updates: EmployeeUpdate) -> Employee:
-        """Update employee."""
+        """Update employee.
+
+        Returns the post-image built from the single ``find_one_and_update``
+        (pre-image merged with the ``$set``), so there is no read-back. Updates
+        that touch no hierarchy/validation fields skip reading the document
+        first. Raises ConcurrentModificationError if the employee changed since
+        ``expectedUpdatedAt``. Without it, a validated update that races another
+        write is read and validated again (up to ``UPDATE_ATTEMPTS`` times).
+        """
         db = await get_database()
 
         try:
@@ -339,13 +816,47 @@ class EmployeeService:
 
         # Convert updates to dict, excluding unset fields
         update_dict = updates.model_dump(by_alias=True, exclude_unset=True)
+        expected = _stored_timestamp(update_dict.pop("expectedUpdatedAt", None))
         if not update_dict:
             # No fields to update, just return current
             return await self.get_employee(employee_id)
 
+        if VALIDATED_UPDATE_FIELDS.isdisjoint(update_dict):
+            # Nothing to validate against the stored document: write directly.
+            update_dict["updatedAt"] = _utcnow_ms()
+            query = {"_id": _id}
+            if expected is not None:
+                query["updatedAt"] = expected
+            before = await db.employees.find_one_and_update(query, {"$set": update_dict})
+            if before is None:
+                await self._raise_missing_or_conflict(db, _id)
+            after = {**before, **update_dict}
+            await workforce_stats.record(db, [(before, after)])
+            employee_events.publish_change(before, after)
+            return Employee(**self._normalize_employee_doc(after))
+
+        for _ in range(UPDATE_ATTEMPTS):
+            # Each attempt starts from the request (validation adds fields).
+            updated = await self._validated_update(db, _id, dict(update_dict), expected)
+            if updated is not None:
+                return updated
+        raise ConcurrentModificationError(CONCURRENT_MODIFICATION_MESSAGE)
+
+    async def _validated_update(
+        self, db, _id: ObjectId, update_dict: dict, expected: Optional[datetime]
+    ) -> Optional[Employee]:
+        """Read, validate and conditionally write one update.
+
+        The write only applies if the employee is unchanged since it was read
+        (or since ``expected``). Returns None when another write got in first
+        and there is no ``expected`` to report a conflict against.
+        """
         current = await db.employees.find_one({"_id": _id})
         if not current:
             raise ValueError("Employee not found")
+        # A stale precondition is a conflict, whatever the validation would say.
+        if expected is not None and current.get("updatedAt") != expected:
+            raise ConcurrentModificationError(CONCURRENT_MODIFICATION_MESSAGE)
 
         # CEO constraints
         if update_dict.get("jobLevel") == "CEO":
@@ -365,34 +876,61 @@ class EmployeeService:
         if "jobLevel" in update_dict:
             await self._assert_level_outranks_reports(db, _id, update_dict["jobLevel"])
 
-        # Status transitions: keep terminationDate and reports consistent.
+        # Status transitions: keep terminationDate consistent.
         new_status = update_dict.get("status")
         if new_status == "Terminated":
             if not update_dict.get("terminationDate"):
                 update_dict["terminationDate"] = datetime.utcnow().isoformat()
-            await self._clear_reports_for_terminated(db, _id)
         elif new_status in ("Active", "On Leave", "Inactive"):
             # Reactivating: drop any stale termination date.
             update_dict["terminationDate"] = None
 
+        # A new manager moves this employee's whole subtree with them.
+        moved = "managerId" in update_dict and update_dict["managerId"] != current.get("managerId")
+        if moved:
+            ancestors = await self._hierarchy.path_under(db, update_dict["managerId"])
+            update_dict["ancestors"] = ancestors
+            update_dict["depth"] = len(ancestors)
+
+        update_dict["updatedAt"] = _utcnow_ms()
+
+        # Write only if nobody changed the document since it was validated.
+        before = await db.employees.find_one_and_update(
+            {"_id": _id, "updatedAt": current.get("updatedAt")},
+            {"$set": update_dict},
+        )
+        if before is None:
+            if expected is not None:
+                await self._raise_missing_or_conflict(db, _id)
+            if not await db.employees.count_documents({"_id": _id}, limit=1):
+                raise ValueError("Employee not found")
+            return None
+        after = {**before, **update_dict}
+        await workforce_stats.record(db, [(before, after)])
+        employee_events.publish_change(before, after)
+
+        # Follow-up writes to other employees, now that this one is committed.
+        if moved:
+            await self._hierarchy.after_move(db, before, update_dict["ancestors"])
+        if new_status == "Terminated":
+            await self._clear_reports_for_terminated(db, _id)
+
         # Keep reports' denormalized managerName in sync when this person renames.
-        if "fullName" in update_dict and update_dict["fullName"] != current.get("fullName"):
-            await db.employees.update_many(
+        if "fullName" in update_dict and update_dict["fullName"] != before.get("fullName"):
+            renamed = await db.employees.update_many(
                 {"managerId": str(_id)},
                 {"$set": {"managerName": update_dict["fullName"]}},
             )
+            if renamed.modified_count:
+                employee_events.publish_reset(["managerName"])
 
-        update_dict["updatedAt"] = datetime.utcnow()
+        return Employee(**self._normalize_employee_doc(after))
 
-        result = await db.employees.update_one(
-            {"_id": _id},
-            {"$set": update_dict}
-        )
-
-        if result.matched_count == 0:
-            raise ValueError("Employee not found")
-
-        return await self.get_employee(employee_id)
+    async def _raise_missing_or_conflict(self, db, _id: ObjectId) -> None:
+        """Explain why a conditional update matched nothing."""
+        if await db.employees.count_documents({"_id": _id}, limit=1):
+            raise ConcurrentModificationError(CONCURRENT_MODIFICATION_MESSAGE)
+        raise ValueError("Employee not found")
 
     async def delete_employee(self, employee_id: str) -> dict:
         """Soft delete employee by setting status to Terminated."""
@@ -403,19 +941,17 @@ class EmployeeService:
         except Exception:
             raise ValueError("Invalid employee ID")
 
-        result = await db.employees.update_one(
-            {"_id": _id},
-            {
-                "$set": {
-                    "status": "Terminated",
-                    "terminationDate": datetime.utcnow().isoformat(),
-                    "updatedAt": datetime.utcnow()
-                }
-            }
-        )
+        changes = {
+            "status": "Terminated",
+            "terminationDate": datetime.utcnow().isoformat(),
+            "updatedAt": datetime.utcnow()
+        }
+        before = await db.employees.find_one_and_update({"_id": _id}, {"$set": changes})
 
-        if result.matched_count == 0:
+        if before is None:
             raise ValueError("Employee not found")
+        await workforce_stats.record(db, [(before, {**before, **changes})])
+        employee_events.publish_change(before, {**before, **changes})
 
         # Also clear this manager from any direct reports
         await self._clear_reports_for_terminated(db, _id)
@@ -0,0 +1,253 @@
+"""In-memory columnar snapshot of the employee fields analytics compute over.
+
+Instead of fetching every employee and turning the documents into a DataFrame
+on each request, the salary and performance analytics read NumPy columns kept
+in this process: department, status, jobLevel and performanceRating as int32
+codes into a per-field list of distinct values, salary as float64 (NaN where
+missing or not a number) and the number of performance reviews as int32 -
+a few bytes per employee per column, plus each row's 12-byte ObjectId, kept
+sorted so a write finds its row by binary search.
+
+Like the suggest index, the snapshot is loaded lazily on first use and patched
+in place by this process's writes (via ``employee_events``); writes made while
+it is being (re)loaded are replayed onto the new copy. A broad write that
+touches its fields (bulk operations, reviews) makes the next use reload it
+first, so analytics never run on data older than a local write; a refresh
+every ``settings.analytics_snapshot_refresh_seconds`` picks up other workers'
+writes in the background.
+"""
+
+import asyncio
+import logging
+import time
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from bson import ObjectId
+
+from app.config import settings
+from app.services import employee_events
+from app.services.analytics_compute import MISSING
+
+
+# Dictionary-encoded fields.
+CODED_FIELDS = ("department", "status", "jobLevel", "performanceRating")
+# Stored fields the snapshot reflects; writes to any other field are ignored.
+SNAPSHOT_FIELDS = frozenset(CODED_FIELDS + ("salary", "performanceHistory"))
+
+_PIPELINE = [
+    # _id order (the primary key index), which the snapshot keeps its rows in.
+    {"$sort": {"_id": 1}},
+    {"$project": {
+        **{field: 1 for field in CODED_FIELDS},
+        "salary": 1,
+        "reviewCount": {"$cond": [{"$isArray": "$performanceHistory"}, {"$size": "$performanceHistory"}, 0]},
+    }},
+]
+
+# ObjectIds as raw bytes; big-endian, so they sort in ObjectId order.
+_ID_DTYPE = np.dtype("S12")
+
+# (before, after) employee documents; None on either side for an insert or a removal.
+Change = Tuple[Optional[dict], Optional[dict]]
+
+
+def _id_key(_id) -> bytes:
+    """An employee ``_id`` (ObjectId or its hex string) as the 12 bytes ``_Table.ids`` holds."""
+    return (_id if isinstance(_id, ObjectId) else ObjectId(_id)).binary
+
+
+def _salary(value) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return np.nan
+    return float(value)
+
+
+def _review_count(doc: dict) -> int:
+    history = doc.get("performanceHistory")
+    return len(history) if isinstance(history, list) else 0
+
+
+class _Vocabulary:
+    """Distinct values of one field in first-seen order; a value's code is its index."""
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value) -> int:
+        if isinstance(value, Enum):
+            value = value.value
+        if not isinstance(value, str):
+            return MISSING
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class _Table:
+    """The columns, grown by doubling, with rows kept in ``_id`` order.
+
+    ``ids`` holds each row's ObjectId as 12 bytes (which sort like the
+    ObjectIds), so an employee's row is found with a binary search and the ids
+    cost 12 bytes each instead of a dict entry and a string.
+    """
+
+    def __init__(self) -> None:
+        self.size = 0
+        self.ids = np.empty(0, _ID_DTYPE)
+        self.vocabularies = {field: _Vocabulary() for field in CODED_FIELDS}
+        self.columns: Dict[str, np.ndarray] = {field: np.empty(0, np.int32) for field in CODED_FIELDS}
+        self.columns["salary"] = np.empty(0, np.float64)
+        self.columns["reviewCount"] = np.empty(0, np.int32)
+
+    def set(self, _id, doc: dict, review_count: int) -> None:
+        key = _id_key(_id)
+        row, found = self._find(key)
+        if not found:
+            row = self._insert_row(row, key)
+        for field in CODED_FIELDS:
+            self.columns[field][row] = self.vocabularies[field].code(doc.get(field))
+        self.columns["salary"][row] = _salary(doc.get("salary"))
+        self.columns["reviewCount"][row] = review_count
+
+    def remove(self, _id) -> None:
+        row, found = self._find(_id_key(_id))
+        if not found:
+            return
+        # Close the gap, keeping the rows in order.
+        size = self.size
+        for array in self._arrays():
+            array[row:size - 1] = array[row + 1:size]
+        self.size -= 1
+
+    def view(self, fields: Iterable[str]) -> Dict:
+        size = self.size
+        view: Dict = {"size": size, "values": {}}
+        for field in fields:
+            view[field] = self.columns[field][:size].copy()
+            if field in self.vocabularies:
+                view["values"][field] = list(self.vocabularies[field].values)
+        return view
+
+    def _find(self, key: bytes) -> Tuple[int, bool]:
+        """The row holding ``key``, or where it would go, and whether it is there."""
+        row = int(np.searchsorted(self.ids[:self.size], key))
+        # Compared as arrays: numpy drops trailing NUL bytes from S12 scalars.
+        return row, row < self.size and bool(self.ids[row:row + 1] == key)
+
+    def _insert_row(self, row: int, key: bytes) -> int:
+        size = self.size
+        if size == len(self.ids):
+            self._grow()
+        # Loads read in _id order, so this is normally an append.
+        if row < size:
+            for array in self._arrays():
+                array[row + 1:size + 1] = array[row:size]
+        self.ids[row] = key
+        self.size += 1
+        return row
+
+    def _arrays(self) -> List[np.ndarray]:
+        return [self.ids, *self.columns.values()]
+
+    def _grow(self) -> None:
+        size = self.size
+        capacity = max(1024, 2 * size)
+        grown = np.empty(capacity, _ID_DTYPE)
+        grown[:size] = self.ids[:size]
+        self.ids = grown
+        for name, column in self.columns.items():
+            grown = np.empty(capacity, column.dtype)
+            grown[:size] = column[:size]
+            self.columns[name] = grown
+
+
+def _patch(table: _Table, before: Optional[dict], after: Optional[dict]) -> None:
+    if after is None:
+        table.remove(before["_id"])
+    else:
+        table.set(after["_id"], after, _review_count(after))
+
+
+class EmployeeSnapshot:
+    def __init__(self) -> None:
+        self._table: Optional[_Table] = None
+        self._built_at: Optional[float] = None
+        self._stale = False
+        # Writes seen while a load reads the collection, replayed onto its result.
+        self._pending: Optional[List[Change]] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def columns(self, db, fields: Iterable[str]) -> Dict:
+        """A copy of ``fields`` for every employee, in the layout
+        ``app.services.analytics_compute`` takes (safe to hand to the compute pool)."""
+        await self.ensure_fresh(db)
+        return self._table.view(fields)
+
+    async def ensure_fresh(self, db) -> None:
+        """Load the snapshot on first use or after a broad write; refresh it in
+        the background when it is older than the refresh interval."""
+        if self._table is None or self._stale:
+            async with self._lock:
+                if self._table is None or self._stale:
+                    await self._rebuild(db)
+            return
+        if time.monotonic() - self._built_at > settings.analytics_snapshot_refresh_seconds:
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._refresh(db))
+
+    async def _refresh(self, db) -> None:
+        try:
+            async with self._lock:
+                await self._rebuild(db)
+        except Exception as exc:
+            logging.error(f"Employee snapshot refresh failed: {exc}")
+
+    async def _rebuild(self, db) -> None:
+        started = time.monotonic()
+        self._stale = False
+        self._pending = []
+        try:
+            table = _Table()
+            async for doc in db.employees.aggregate(_PIPELINE, batchSize=5000):
+                table.set(doc["_id"], doc, doc.get("reviewCount", 0))
+            pending = self._pending
+        except Exception:
+            self._stale = True
+            raise
+        finally:
+            self._pending = None
+        for before, after in pending:
+            _patch(table, before, after)
+
+        self._table = table
+        self._built_at = time.monotonic()
+        logging.info(
+            f"Employee snapshot built: {table.size} employees in {self._built_at - started:.2f}s"
+        )
+
+    # -- employee_events listener ------------------------------------------
+
+    def invalidate(self, fields: Optional[frozenset] = None) -> None:
+        if fields is None or not fields.isdisjoint(SNAPSHOT_FIELDS):
+            self._stale = True
+
+    def apply_change(self, before: Optional[dict], after: Optional[dict]) -> None:
+        """Patch the row of one inserted, updated or removed employee."""
+        if before is not None and after is not None and all(
+            before.get(field) == after.get(field) for field in SNAPSHOT_FIELDS
+        ):
+            return
+        if self._pending is not None:
+            self._pending.append((before, after))
+        if self._table is not None:
+            _patch(self._table, before, after)
+
+
+employee_snapshot = EmployeeSnapshot()
+employee_events.subscribe(employee_snapshot)
@@ -0,0 +1,435 @@
+"""Materialized reporting paths.
+
+Every employee document carries ``ancestors`` (the ids of everyone above them,
+root first, as strings like ``managerId``) and ``depth`` (``len(ancestors)``).
+With a multikey index on ``ancestors``, "everyone under X" is one indexed query
+(``{"ancestors": X}``) and a reporting chain is a single ``_id $in`` lookup.
+
+The path changes only when someone's manager changes: the employee gets the new
+manager's path plus the manager, and every descendant has the old prefix up to
+and including that employee swapped for the new one in a single pipeline
+update. ``directReportCount`` and ``subtreeSize`` are kept in step by moving
+the moved subtree's size between the managers on the old and new chains.
+Documents written before paths existed are filled in by
+``python -m scripts.backfill_hierarchy``; until then lookups fall back to
+following ``managerId`` with $graphLookup.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateMany, UpdateOne
+
+from app.indexes import REPORTING_LINES_VIEW
+from app.services import employee_events
+
+
+# Per-employee counts maintained alongside the paths, over every status (the
+# same "derived from managerId" rule the managers list uses).
+COUNT_FIELDS = ("directReportCount", "subtreeSize")
+
+# Guard against corrupt (cyclic) data when following managerId by hand.
+MAX_CHAIN_LENGTH = 10000
+
+
+def _as_id(value: str):
+    return ObjectId(value) if ObjectId.is_valid(value) else value
+
+
+class HierarchyService:
+    # -- reading paths -----------------------------------------------------
+
+    async def chain(self, db, doc: dict) -> List[str]:
+        """Ids of everyone above ``doc``, root first."""
+        if doc.get("ancestors") is not None:
+            return list(doc["ancestors"])
+        return await self.lookup_chain(db, doc)
+
+    async def lookup_chain(self, db, doc: dict) -> List[str]:
+        """Follow ``managerId`` upwards with one $graphLookup (ignores stored paths)."""
+        if not doc.get("managerId"):
+            return []
+        pipeline = [
+            {"$match": {"_id": doc["_id"]}},
+            {
+                "$graphLookup": {
+                    "from": REPORTING_LINES_VIEW,
+                    "startWith": "$managerOid",
+                    "connectFromField": "managerOid",
+                    "connectToField": "_id",
+                    "depthField": "hops",
+                    "as": "chain",
+                }
+            },
+            {"$project": {"chain._id": 1, "chain.hops": 1}},
+        ]
+        docs = await db[REPORTING_LINES_VIEW].aggregate(pipeline).to_list(length=1)
+        if docs:
+            nodes = sorted(docs[0].get("chain", []), key=lambda node: -node["hops"])
+            return [str(node["_id"]) for node in nodes]
+        # The view is missing (index bootstrap not run yet): walk the chain.
+        logging.warning(
+            f"View {REPORTING_LINES_VIEW} is missing; run python -m scripts.ensure_indexes"
+        )
+        return await self.walk_chain(db, doc)
+
+    async def walk_chain(self, db, doc: dict) -> List[str]:
+        """Per-hop fallback for ``lookup_chain``: one find_one per level."""
+        chain: List[str] = []
+        seen = set()
+        current = doc.get("managerId")
+        while current and current not in seen and len(chain) < MAX_CHAIN_LENGTH:
+            chain.append(current)
+            seen.add(current)
+            node = await db.employees.find_one({"_id": _as_id(current)}, {"managerId": 1})
+            current = (node or {}).get("managerId")
+        chain.reverse()
+        return chain
+
+    async def path_under(self, db, manager_id: Optional[str]) -> List[str]:
+        """The ``ancestors`` value for someone reporting to ``manager_id``."""
+        if not manager_id:
+            return []
+        manager = await db.employees.find_one(
+            {"_id": _as_id(manager_id)}, {"ancestors": 1, "managerId": 1}
+        )
+        if not manager:
+            return []
+        return await self.chain(db, manager) + [manager_id]
+
+    # -- maintaining paths -------------------------------------------------
+
+    async def move(
+        self,
+        db,
+        employee_id: ObjectId,
+        manager_id: Optional[str],
+        path: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Re-path an employee (and their whole subtree) under ``manager_id``.
+
+        Call after ``managerId`` itself has been written. ``path`` is the
+        precomputed ``path_under(manager_id)`` when many employees move under
+        the same manager. Returns the employee's new ancestors.
+        """
+        if path is None:
+            path = await self.path_under(db, manager_id)
+        before = await db.employees.find_one_and_update(
+            {"_id": employee_id},
+            {"$set": {"ancestors": path, "depth": len(path)}},
+            projection={"ancestors": 1, "subtreeSize": 1},
+        )
+        if before is not None:
+            await self.after_move(db, before, path)
+        return path
+
+    async def after_move(
+        self, db, before: dict, path: List[str], subtree_size: Optional[int] = None
+    ) -> None:
+        """Carry an employee's move (already written to their own document)
+        through to their subtree's paths and the counts along both chains.
+
+        ``before`` is the employee as stored before the move; pass
+        ``subtree_size`` if their subtree has changed since it was read.
+        """
+        emp_id = str(before["_id"])
+        if before.get("ancestors") == path:
+            return
+        size = subtree_size if subtree_size is not None else before.get("subtreeSize")
+        if size is None:
+            size = await db.employees.count_documents({"ancestors": emp_id})
+        await self.replace_prefix(db, emp_id, path + [emp_id])
+        await self.shift_counts(db, before.get("ancestors") or [], path, size + 1)
+
+    async def move_many(
+        self,
+        db,
+        employee_ids: List[ObjectId],
+        manager_id: Optional[str],
+        path: Optional[List[str]] = None,
+    ) -> None:
+        """``move`` for several employees going under the same manager.
+
+        Takes a fixed number of round trips (one read, one path write, one bulk
+        subtree rewrite, one bulk count update) unless one of them sits under
+        another, in which case they are moved one by one, top-down, so each
+        move sees the paths left by the previous one.
+        """
+        if not employee_ids:
+            return
+        if path is None:
+            path = await self.path_under(db, manager_id)
+        befores = await db.employees.find(
+            {"_id": {"$in": employee_ids}}, {"ancestors": 1, "subtreeSize": 1}
+        ).to_list(length=None)
+        moving = {str(doc["_id"]) for doc in befores}
+        if any(moving.intersection(doc.get("ancestors") or []) for doc in befores):
+            for doc in sorted(befores, key=lambda d: len(d.get("ancestors") or [])):
+                await self.move(db, doc["_id"], manager_id, path=path)
+            return
+
+        await db.employees.update_many(
+            {"_id": {"$in": [doc["_id"] for doc in befores]}},
+            {"$set": {"ancestors": path, "depth": len(path)}},
+        )
+        prefixes: Dict[str, List[str]] = {}
+        deltas: Dict[str, Dict[str, int]] = {}
+        for doc in befores:
+            emp_id = str(doc["_id"])
+            if doc.get("ancestors") == path:
+                continue
+            size = doc.get("subtreeSize")
+            if size is None:
+                size = await db.employees.count_documents({"ancestors": emp_id})
+            if size:
+                prefixes[emp_id] = path + [emp_id]
+            self._count_deltas(deltas, doc.get("ancestors") or [], path, size + 1)
+        await self.replace_prefixes(db, prefixes)
+        await self._apply_count_deltas(db, deltas)
+
+    async def reparent(self, db, moves: List[Tuple[dict, Optional[dict], Dict]]) -> None:
+        """Move several employees (with their subtrees) to managers above them.
+
+        Each move is (employee, new manager or None to detach, extra fields to
+        set on the employee). The employee document needs ``_id`` and its stored
+        ``ancestors`` and ``subtreeSize``; the new manager must be one of its
+        ancestors, so every new path can be worked out from stored paths alone:
+        moves are planned top-down in memory, each seeing the paths left by the
+        moves above it, and written with one ordered bulk write. Count changes
+        are accumulated across all moves and applied in one more.
+        """
+        planned = []
+        for employee, manager, fields in moves:
+            ancestors = await self.chain(db, employee)
+            planned.append((len(ancestors), employee, ancestors, manager, fields))
+        planned.sort(key=lambda move: move[0])
+
+        new_paths: Dict[str, List[str]] = {}
+
+        def current(path: List[str]) -> List[str]:
+            """``path`` as rewritten by the moves planned so far."""
+            for i in range(len(path) - 1, -1, -1):
+                if path[i] in new_paths:
+                    return new_paths[path[i]] + path[i:]
+            return path
+
+        writes = []
+        deltas: Dict[str, Dict[str, int]] = {}
+        for _, employee, ancestors, manager, fields in planned:
+            emp_id = str(employee["_id"])
+            if manager is not None:
+                manager_id = str(manager["_id"])
+                if manager_id in ancestors:
+                    path = current(ancestors[:ancestors.index(manager_id) + 1])
+                else:
+                    # Stored paths disagree with managerId (not backfilled yet).
+                    path = await self.path_under(db, manager_id)
+            else:
+                path = []
+            old_path = current(ancestors)
+            new_paths[emp_id] = path
+            size = employee.get("subtreeSize")
+            if size is None:
+                size = await db.employees.count_documents({"ancestors": emp_id})
+            writes.append((emp_id, fields, path, size > 0))
+            self._count_deltas(deltas, old_path, path, size + 1)
+
+        await self._write_moves(db, writes)
+        await self._apply_count_deltas(db, deltas)
+        if writes:
+            employee_events.publish_reset(["ancestors", "depth"])
+
+    async def _write_moves(self, db, writes: List[Tuple[str, Dict, List[str], bool]]) -> None:
+        """One ordered bulk write of planned moves: (employee id, fields, new
+        path, has a subtree). Ordered, so each subtree rewrite runs after the
+        rewrites of the subtrees containing it."""
+        ops = []
+        for emp_id, fields, path, has_subtree in writes:
+            ops.append(UpdateOne(
+                {"_id": _as_id(emp_id)},
+                {"$set": {**fields, "ancestors": path, "depth": len(path)}},
+            ))
+            if has_subtree:
+                ops.append(self._prefix_op(emp_id, path + [emp_id]))
+        if ops:
+            await db.employees.bulk_write(ops, ordered=True)
+
+    async def shift_counts(
+        self,
+        db,
+        old_path: List[str],
+        new_path: List[str],
+        size: int,
+        reports: int = 1,
+    ) -> None:
+        """Move ``size`` people (``reports`` of them direct reports) from under
+        ``old_path`` to under ``new_path``, in one bulk write."""
+        deltas: Dict[str, Dict[str, int]] = {}
+        self._count_deltas(deltas, old_path, new_path, size, reports)
+        await self._apply_count_deltas(db, deltas)
+
+    @staticmethod
+    def _count_deltas(
+        deltas: Dict[str, Dict[str, int]],
+        old_path: List[str],
+        new_path: List[str],
+        size: int,
+        reports: int = 1,
+    ) -> None:
+        """Accumulate the count changes of one move into ``deltas``.
+
+        Only the managers not shared by both chains change ``subtreeSize``; the
+        old and new direct managers (the last entries) change
+        ``directReportCount``.
+        """
+        def add(emp_id: str, field: str, delta: int) -> None:
+            counts = deltas.setdefault(emp_id, {})
+            counts[field] = counts.get(field, 0) + delta
+
+        shared = set(old_path) & set(new_path)
+        if size:
+            for ids, delta in ((old_path, -size), (new_path, size)):
+                for emp_id in ids:
+                    if emp_id not in shared:
+                        add(emp_id, "subtreeSize", delta)
+        old_parent = old_path[-1] if old_path else None
+        new_parent = new_path[-1] if new_path else None
+        if reports and old_parent != new_parent:
+            if old_parent:
+                add(old_parent, "directReportCount", -reports)
+            if new_parent:
+                add(new_parent, "directReportCount", reports)
+
+    async def _apply_count_deltas(
+        self, db, deltas: Dict[str, Dict[str, int]], batch_size: int = 1000
+    ) -> None:
+        ops = [
+            UpdateOne({"_id": _as_id(emp_id)}, {"$inc": counts})
+            for emp_id, counts in deltas.items()
+            if any(counts.values())
+        ]
+        for start in range(0, len(ops), batch_size):
+            await db.employees.bulk_write(ops[start:start + batch_size], ordered=False)
+        if ops:
+            employee_events.publish_reset(COUNT_FIELDS)
+
+    async def count_in(self, db, paths: Iterable[List[str]]) -> None:
+        """Count newly inserted employees, given their paths, into their
+        managers' ``directReportCount`` and ``subtreeSize``."""
+        deltas: Dict[str, Dict[str, int]] = {}
+        for path in paths:
+            self._count_deltas(deltas, [], path, 1)
+        await self._apply_count_deltas(db, deltas)
+
+    async def replace_prefix(self, db, node_id: str, new_prefix: List[str]) -> int:
+        """Rewrite the paths of everyone under ``node_id``.
+
+        Each descendant's ancestors up to and including ``node_id`` are replaced
+        by ``new_prefix`` (the rest of the path, below ``node_id``, is kept).
+        Returns the number of documents changed.
+        """
+        return await self.replace_prefixes(db, {node_id: new_prefix})
+
+    async def replace_prefixes(self, db, prefixes: Dict[str, List[str]]) -> int:
+        """``replace_prefix`` for several disjoint subtrees in one bulk write."""
+        if not prefixes:
+            return 0
+        ops = [self._prefix_op(node_id, new_prefix) for node_id, new_prefix in prefixes.items()]
+        result = await db.employees.bulk_write(ops, ordered=False)
+        if result.modified_count:
+            employee_events.publish_reset(["ancestors", "depth"])
+        return result.modified_count
+
+    @staticmethod
+    def _prefix_op(node_id: str, new_prefix: List[str]) -> UpdateMany:
+        """Pipeline update swapping the path prefix up to ``node_id`` for ``new_prefix``."""
+        after_node = {"$add": [{"$indexOfArray": ["$ancestors", node_id]}, 1]}
+        return UpdateMany(
+            {"ancestors": node_id},
+            [
+                {
+                    "$set": {
+                        "ancestors": {
+                            "$concatArrays": [
+                                new_prefix,
+                                {"$slice": ["$ancestors", after_node, {"$size": "$ancestors"}]},
+                            ]
+                        }
+                    }
+                },
+                {"$set": {"depth": {"$size": "$ancestors"}}},
+            ],
+        )
+
+    async def backfill(self, db, batch_size: int = 1000) -> Dict[str, int]:
+        """Recompute every stored path and count from ``managerId``.
+
+        Loads the (id, managerId) pairs once and resolves paths in memory, so
+        the cost is one scan plus batched writes regardless of org depth.
+        Reporting loops in existing data are cut where they close (the node
+        that closes the loop becomes a root); loops are counted under ``cycles``.
+        """
+        parents: Dict[str, Optional[str]] = {}
+        stored: Dict[str, tuple] = {}
+        fields = ("ancestors", "depth") + COUNT_FIELDS
+        cursor = db.employees.find({}, {"managerId": 1, **{f: 1 for f in fields}})
+        async for doc in cursor.batch_size(5000):
+            emp_id = str(doc["_id"])
+            parents[emp_id] = doc.get("managerId") or None
+            stored[emp_id] = tuple(doc.get(f) for f in fields)
+
+        paths: Dict[str, List[str]] = {}
+        cycles = 0
+
+        def resolve(emp_id: str) -> List[str]:
+            nonlocal cycles
+            # Climb until a resolved (or root) node, then unwind.
+            pending: List[str] = []
+            on_stack = set()
+            node = emp_id
+            while node not in paths:
+                if node in on_stack:
+                    cycles += 1
+                    paths[node] = []
+                    break
+                on_stack.add(node)
+                pending.append(node)
+                parent = parents.get(node)
+                if parent is None or parent not in parents:
+                    paths[node] = []
+                    pending.pop()
+                    break
+                node = parent
+            while pending:
+                node = pending.pop()
+                if node not in paths:
+                    parent = parents[node]
+                    paths[node] = paths[parent] + [parent]
+            return paths[emp_id]
+
+        direct: Dict[str, int] = {}
+        subtree: Dict[str, int] = {}
+        for emp_id in parents:
+            path = resolve(emp_id)
+            if path:
+                direct[path[-1]] = direct.get(path[-1], 0) + 1
+            for ancestor in path:
+                subtree[ancestor] = subtree.get(ancestor, 0) + 1
+
+        ops = []
+        updated = 0
+        for emp_id in parents:
+            path = paths[emp_id]
+            values = (path, len(path), direct.get(emp_id, 0), subtree.get(emp_id, 0))
+            if stored[emp_id] == values:
+                continue
+            ops.append(UpdateOne({"_id": _as_id(emp_id)}, {"$set": dict(zip(fields, values))}))
+            if len(ops) >= batch_size:
+                updated += (await db.employees.bulk_write(ops, ordered=False)).modified_count
+                ops = []
+        if ops:
+            updated += (await db.employees.bulk_write(ops, ordered=False)).modified_count
+        if updated:
+            employee_events.publish_reset(fields)
+        return {"scanned": len(parents), "updated": updated, "cycles": cycles}
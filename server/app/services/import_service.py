@@ -0,0 +1,292 @@
+"""Streaming employee import from CSV or NDJSON.
+
+Uploads are parsed record by record as bytes arrive, so a file is never held in
+memory. Records are collected into chunks of ``IMPORT_CHUNK_ROWS`` and created
+through ``BatchService`` (per-row ``EmployeeCreate`` validation, one
+``insert_many`` per chunk). Only the rejected rows are reported, one report
+entry per row as each chunk finishes, followed by a summary.
+
+A row names its manager with ``managerRef`` (the employeeId or workEmail of
+another row or of an existing employee) or ``managerId``. Reports may come
+before their manager in the file: a row whose managerRef is not known yet waits
+until a row with that key has been created, and is then created with the next
+chunk. At most ``MAX_WAITING_ROWS`` rows wait at once, which bounds memory
+whatever the file size; rows still waiting at the end of the file are rejected.
+
+Lines are decoded one at a time: a line that is not valid UTF-8 or longer than
+``MAX_LINE_BYTES`` is reported as a rejected row and the import carries on.
+
+CSV files have a header row of field names; nested fields use dotted names
+(``hrAssignment.assignedTo``), list fields hold JSON text (as the CSV export
+writes them) and empty cells are left out. A quoted field may
+span lines, up to ``MAX_RECORD_LINES`` lines / ``MAX_RECORD_CHARS`` characters.
+"""
+
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from app.models.employee import EmployeeCreate
+from app.services.batch_service import BatchService
+from app.utils.export_formats import list_columns
+
+
+IMPORT_FORMATS = ("csv", "ndjson")
+IMPORT_CHUNK_ROWS = 1000
+MAX_WAITING_ROWS = 10000
+# Bounds on one CSV record (a quoted field may span lines).
+MAX_RECORD_LINES = 100
+MAX_RECORD_CHARS = 64 * 1024
+# Longest line read; longer ones (and lines that are not UTF-8) are rejected.
+MAX_LINE_BYTES = 1 << 20
+
+# CSV columns holding a list, as JSON text.
+_LIST_COLUMNS = list_columns(EmployeeCreate)
+
+# (row number, parsed row or the reason it could not be parsed)
+Record = Tuple[int, Union[Dict[str, Any], str]]
+
+
+class _BadLine(NamedTuple):
+    """A line that could not be read, in place of its text."""
+
+    error: str
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Union[str, _BadLine]]:
+    """Split into lines, keeping line endings, each decoded as UTF-8 (with or
+    without a BOM) on its own, so an undecodable or overlong line is reported
+    as a ``_BadLine`` and the rest of the upload is still read."""
+    pending = b""
+    first = True
+    skipping = False  # discarding an overlong line up to its end
+
+    def decode(line: bytes) -> Union[str, _BadLine]:
+        nonlocal first
+        encoding, first = ("utf-8-sig" if first else "utf-8"), False
+        try:
+            return line.decode(encoding)
+        except UnicodeDecodeError as exc:
+            return _BadLine(f"Invalid UTF-8 at byte {exc.start} of the line.")
+
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+                continue
+            yield decode(line + b"\n")
+        if len(pending) > MAX_LINE_BYTES:
+            if not skipping:
+                first = False
+                yield _BadLine(f"Line is longer than {MAX_LINE_BYTES} bytes.")
+            skipping, pending = True, b""
+    if pending and not skipping:
+        yield decode(pending)
+
+
+def _unflatten(pairs: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+    """CSV cells to a row dict: empty cells dropped, dotted names nested, and
+    list fields (written as JSON by the CSV export) decoded."""
+    row: Dict[str, Any] = {}
+    for name, value in pairs:
+        if not name or value == "":
+            continue
+        if name in _LIST_COLUMNS:
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass  # left as text for validation to reject
+        target = row
+        *parents, leaf = name.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return row
+
+
+class _CsvRecords:
+    """Assembles CSV lines into records, a quoted field possibly spanning lines.
+
+    Whether a quote is open is tracked from each line's own quote count. A
+    record still open after ``MAX_RECORD_LINES`` lines or ``MAX_RECORD_CHARS``
+    characters (or at the end of the file) is taken to be a stray quote: its
+    first line is rejected and the lines after it are read again as records of
+    their own, so one bad row cannot swallow the rest of the file.
+    """
+
+    def __init__(self) -> None:
+        self.header: Optional[List[str]] = None
+        self.row_no = 0
+        self._lines: List[str] = []
+        self._quotes = 0
+        self._chars = 0
+
+    def feed(self, line: Union[str, _BadLine]) -> Iterator[Record]:
+        if isinstance(line, _BadLine):
+            # Rejects the record it is part of, if any, and nothing else.
+            self._reset()
+            self.row_no += 1
+            yield self.row_no, line.error
+            return
+        self._lines.append(line)
+        self._quotes += line.count('"')
+        self._chars += len(line)
+        if self._quotes % 2 == 0:
+            record = "".join(self._lines)
+            self._reset()
+            yield from self._parse(record)
+        elif len(self._lines) > MAX_RECORD_LINES or self._chars > MAX_RECORD_CHARS:
+            yield from self._give_up()
+
+    def finish(self) -> Iterator[Record]:
+        while self._lines:
+            yield from self._give_up()
+
+    def _give_up(self) -> Iterator[Record]:
+        rest = self._lines[1:]
+        self._reset()
+        self.row_no += 1
+        yield self.row_no, "Unterminated quoted field."
+        for line in rest:
+            yield from self.feed(line)
+
+    def _reset(self) -> None:
+        self._lines = []
+        self._quotes = self._chars = 0
+
+    def _parse(self, record: str) -> Iterator[Record]:
+        fields = next(csv.reader([record]), [])
+        if not any(field.strip() for field in fields):
+            return
+        if self.header is None:
+            self.header = [field.strip() for field in fields]
+            return
+        self.row_no += 1
+        if len(fields) > len(self.header):
+            yield self.row_no, "Row has more fields than the header."
+            return
+        yield self.row_no, _unflatten(zip(self.header, fields))
+
+
+async def read_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    records = _CsvRecords()
+    async for line in _lines(chunks):
+        for record in records.feed(line):
+            yield record
+    for record in records.finish():
+        yield record
+
+
+async def read_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    row_no = 0
+    async for line in _lines(chunks):
+        if isinstance(line, _BadLine):
+            row_no += 1
+            yield row_no, line.error
+            continue
+        if not line.strip():
+            continue
+        row_no += 1
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield row_no, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(row, dict):
+            yield row_no, "Each line must be a JSON object."
+            continue
+        yield row_no, row
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+
+
+class ImportService:
+    def __init__(self):
+        self._batch = BatchService()
+
+    async def import_employees(
+        self, chunks: AsyncIterator[bytes], fmt: str, chunk_rows: int = IMPORT_CHUNK_ROWS
+    ) -> AsyncIterator[dict]:
+        """Import a CSV/NDJSON byte stream.
+
+        Yields ``{"row", "status": "rejected", "error"}`` for each row that was
+        not created, then ``{"summary": {"rows", "created", "rejected"}}``.
+        """
+        if fmt not in READERS:
+            raise ValueError(f"Unsupported import format '{fmt}'. Use one of: {', '.join(IMPORT_FORMATS)}.")
+        run = _ImportRun()
+        chunk: List[Tuple[int, dict]] = []
+        async for row_no, row in READERS[fmt](chunks):
+            run.rows += 1
+            if isinstance(row, str):
+                yield run.reject(row_no, row)
+                continue
+            chunk.append((row_no, row))
+            if len(chunk) >= chunk_rows:
+                for entry in await self._create(chunk, run):
+                    yield entry
+                chunk = []
+        if chunk:
+            for entry in await self._create(chunk, run):
+                yield entry
+
+        # Rows whose manager never appeared: one last pass reports why.
+        leftovers = [item for rows in run.waiting.values() for item in rows]
+        run.waiting.clear()
+        for start in range(0, len(leftovers), chunk_rows):
+            for entry in await self._create(leftovers[start:start + chunk_rows], run, final=True):
+                yield entry
+
+        yield {"summary": {"rows": run.rows, "created": run.created, "rejected": run.rejected}}
+
+    async def _create(self, chunk: List[Tuple[int, dict]], run: "_ImportRun", final: bool = False) -> List[dict]:
+        entries: List[dict] = []
+        while chunk:
+            result = await self._batch.create_employees([row for _, row in chunk], defer_unresolved=not final)
+            ready: List[Tuple[int, dict]] = []
+            for (row_no, row), outcome in zip(chunk, result["results"]):
+                if outcome["status"] == "created":
+                    run.created += 1
+                    for key in (outcome.get("employeeId"), row.get("workEmail")):
+                        ready.extend(run.release(key))
+                elif outcome["status"] == "deferred":
+                    if not run.wait(str(row.get("managerRef")), row_no, row):
+                        entries.append(run.reject(
+                            row_no,
+                            f"Manager not found among the last {MAX_WAITING_ROWS} rows waiting for one.",
+                        ))
+                else:
+                    entries.append(run.reject(row_no, outcome.get("error") or "Rejected."))
+            # Rows that were waiting for a manager created just now.
+            chunk = ready
+        return entries
+
+
+class _ImportRun:
+    """Counters and rows waiting for their manager, for one import."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.created = 0
+        self.rejected = 0
+        self.waiting: Dict[str, List[Tuple[int, dict]]] = {}
+        self.waiting_rows = 0
+
+    def reject(self, row_no: int, error: str) -> dict:
+        self.rejected += 1
+        return {"row": row_no, "status": "rejected", "error": error}
+
+    def wait(self, key: str, row_no: int, row: dict) -> bool:
+        if self.waiting_rows >= MAX_WAITING_ROWS:
+            return False
+        self.waiting.setdefault(key, []).append((row_no, row))
+        self.waiting_rows += 1
+        return True
+
+    def release(self, key) -> List[Tuple[int, dict]]:
+        rows = self.waiting.pop(key, []) if key else []
+        self.waiting_rows -= len(rows)
+        return rows
@@ -0,0 +1,93 @@
+"""Org chart service: the reporting tree served a few levels at a time."""
+
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+
+from app.database import get_database
+
+
+# Stored fields behind an OrgNode.
+_NODE_PROJECTION = {
+    "fullName": 1,
+    "position": 1,
+    "jobLevel": 1,
+    "department": 1,
+    "managerId": 1,
+    "directReportCount": 1,
+    "subtreeSize": 1,
+}
+
+MAX_TREE_DEPTH = 5
+
+
+class OrgService:
+    @staticmethod
+    def _node(doc: dict) -> dict:
+        return {
+            "_id": str(doc["_id"]),
+            "name": doc.get("fullName", ""),
+            "title": doc.get("position"),
+            "level": doc.get("jobLevel"),
+            "department": doc.get("department"),
+            "directReportCount": doc.get("directReportCount") or 0,
+            "subtreeSize": doc.get("subtreeSize") or 0,
+        }
+
+    async def get_tree(self, root: Optional[str] = None, depth: int = 1) -> List[dict]:
+        """The org from ``root`` (or from the top when omitted) down ``depth`` levels.
+
+        Nodes on the last fetched level have ``children`` unset; their counts
+        tell the client whether there is anything left to expand. One indexed
+        query on the materialized path (or on ``depth`` for the top of the org).
+        """
+        if depth < 0 or depth > MAX_TREE_DEPTH:
+            raise ValueError(f"depth must be between 0 and {MAX_TREE_DEPTH}.")
+        db = await get_database()
+        if root:
+            if not ObjectId.is_valid(root):
+                raise ValueError("Invalid employee ID")
+            root_doc = await db.employees.find_one(
+                {"_id": ObjectId(root)}, {**_NODE_PROJECTION, "depth": 1}
+            )
+            if not root_doc:
+                raise ValueError("Employee not found")
+            top = root_doc.get("depth") or 0
+            docs = [root_doc]
+            if depth:
+                docs += await db.employees.find(
+                    {"ancestors": root, "depth": {"$lte": top + depth}},
+                    {**_NODE_PROJECTION, "depth": 1},
+                ).to_list(length=None)
+        else:
+            top = 0
+            docs = await db.employees.find(
+                {"depth": {"$lte": depth}}, {**_NODE_PROJECTION, "depth": 1}
+            ).to_list(length=None)
+
+        # Link nodes to their managers, level by level; names order siblings.
+        docs.sort(key=lambda d: ((d.get("depth") or 0), d.get("fullName", "")))
+        nodes: Dict[str, dict] = {}
+        roots: List[dict] = []
+        for doc in docs:
+            node = self._node(doc)
+            if (doc.get("depth") or 0) - top < depth:
+                node["children"] = []
+            nodes[node["_id"]] = node
+            parent = nodes.get(doc.get("managerId") or "")
+            if parent is not None and parent.get("children") is not None:
+                parent["children"].append(node)
+            else:
+                roots.append(node)
+        return roots
+
+    async def get_children(self, employee_id: str) -> List[dict]:
+        """Direct reports of one node, ordered by name (not expanded further)."""
+        if not ObjectId.is_valid(employee_id):
+            raise ValueError("Invalid employee ID")
+        db = await get_database()
+        docs = await db.employees.find(
+            {"managerId": employee_id}, _NODE_PROJECTION
+        ).to_list(length=None)
+        docs.sort(key=lambda d: d.get("fullName", ""))
+        return [self._node(doc) for doc in docs]
@@ -10,6 +10,11 @@ from app.models.performance import (
     ScheduleReviewRequest,
     ConductReviewRequest,
 )
+from app.services import analytics_compute, employee_events
+from app.services.analytics_cache import cached
+from app.services.compute_pool import compute_pool
+from app.services.employee_snapshot import employee_snapshot
+from app.utils.bulk_writes import update_by_ids
 
 
 class PerformanceService:
@@ -84,140 +89,46 @@ class PerformanceService:
         
         return employees
 
+    @cached()
     async def get_performance_analytics(self) -> Dict:
-        """Get performance analytics including distribution and trends."""
+        """Get performance analytics including distribution and trends.
+
+        Ratings, departments and review counts come from the employee snapshot.
+        """
         db = await get_database()
-        
-        # Get all active employees
-        cursor = db.employees.find({"status": "Active"})
-        employees = await cursor.to_list(length=None)
-        
-        if not employees:
-            return self._empty_analytics()
-        
-        # Count total reviews
-        total_reviews = sum(
-            len(emp.get("performanceHistory", []))
-            for emp in employees
+        columns = await employee_snapshot.columns(
+            db, ["status", "performanceRating", "department", "reviewCount"]
         )
+        analytics = await compute_pool.run(analytics_compute.performance_analytics, columns)
+        if analytics is None:
+            return self._empty_analytics()
         
         # Get overdue reviews
         overdue = await self.get_overdue_reviews()
-        overdue_count = len(overdue)
-        
-        # Calculate rating distribution
-        rating_distribution = {
-            "Exceeds Expectations": 0,
-            "Meets Expectations": 0,
-            "Needs Improvement": 0,
-            "Unsatisfactory": 0,
-            "Unrated": 0,
-        }
-        
-        rating_values = {
-            "Exceeds Expectations": 5,
-            "Meets Expectations": 3,
-            "Needs Improvement": 2,
-            "Unsatisfactory": 1,
-            "Unrated": 0,
-        }
-        
-        total_rating_sum = 0
-        rated_count = 0
-        
-        for emp in employees:
-            rating = emp.get("performanceRating", "Unrated")
-            if rating in rating_distribution:
-                rating_distribution[rating] += 1
-                if rating != "Unrated":
-                    total_rating_sum += rating_values[rating]
-                    rated_count += 1
-        
-        average_rating = total_rating_sum / rated_count if rated_count > 0 else 0
-        
-        # Calculate department performance
-        department_performance = {}
-        dept_employees = {}
-        
-        for emp in employees:
-            dept = emp.get("department", "Unknown")
-            if dept not in dept_employees:
-                dept_employees[dept] = []
-            dept_employees[dept].append(emp)
-        
-        for dept, dept_emps in dept_employees.items():
-            dept_rating_sum = 0
-            dept_rated_count = 0
-            dept_total_reviews = 0
-            
-            for emp in dept_emps:
-                rating = emp.get("performanceRating", "Unrated")
-                if rating in rating_values and rating != "Unrated":
-                    dept_rating_sum += rating_values[rating]
-                    dept_rated_count += 1
-                
-                dept_total_reviews += len(emp.get("performanceHistory", []))
-            
-            department_performance[dept] = {
-                "averageRating": dept_rating_sum / dept_rated_count if dept_rated_count > 0 else 0,
-                "totalReviews": dept_total_reviews,
-                "employeeCount": len(dept_emps),
-            }
-        
-        # Performance trends (quarterly for current year)
-        performance_trends = [
-            {"period": "2024-Q1", "averageRating": 3.2, "reviewCount": 15},
-            {"period": "2024-Q2", "averageRating": 3.4, "reviewCount": 18},
-            {"period": "2024-Q3", "averageRating": 3.6, "reviewCount": 12},
-            {"period": "2024-Q4", "averageRating": average_rating, "reviewCount": total_reviews},
-        ]
-        
-        return {
-            "totalReviews": total_reviews,
-            "overdueReviews": overdue_count,
-            "averageRating": round(average_rating, 2),
-            "ratingDistribution": rating_distribution,
-            "departmentPerformance": department_performance,
-            "performanceTrends": performance_trends,
-        }
+        analytics["overdueReviews"] = len(overdue)
+        return analytics
 
     async def schedule_reviews(self, request: ScheduleReviewRequest) -> Dict:
         """Schedule performance reviews for multiple employees."""
         db = await get_database()
-        updated_count = 0
-        failed_count = 0
-        failed_ids = []
-        
-        for emp_id in request.employee_ids:
-            try:
-                from bson import ObjectId
-                _id = ObjectId(emp_id)
-                
-                result = await db.employees.update_one(
-                    {"_id": _id},
-                    {
-                        "$set": {
-                            "nextReviewDate": request.review_date,
-                            "updatedAt": datetime.utcnow(),
-                        }
-                    }
-                )
-                
-                if result.matched_count > 0:
-                    updated_count += 1
-                else:
-                    failed_count += 1
-                    failed_ids.append(emp_id)
-            except Exception as e:
-                failed_count += 1
-                failed_ids.append(emp_id)
-                print(f"Error scheduling review for employee {emp_id}: {e}")
-        
+        updated, failed_ids = await update_by_ids(
+            db.employees,
+            request.employee_ids,
+            {
+                "$set": {
+                    "nextReviewDate": request.review_date,
+                    "updatedAt": datetime.utcnow(),
+                }
+            },
+        )
+        if updated:
+            employee_events.publish_reset(["nextReviewDate"])
+
         return {
-            "success": failed_count == 0,
-            "updatedCount": updated_count,
-            "failedCount": failed_count,
-            "message": f"Successfully scheduled reviews for {updated_count} employee(s)",
+            "success": not failed_ids,
+            "updatedCount": len(updated),
+            "failedCount": len(failed_ids),
+            "message": f"Successfully scheduled reviews for {len(updated)} employee(s)",
             "failedIds": failed_ids if failed_ids else None,
         }
 
@@ -264,6 +175,7 @@ class PerformanceService:
             )
             
             if result.matched_count > 0:
+                employee_events.publish_reset([*update_data, "performanceHistory"])
                 return {
                     "success": True,
                     "message": "Performance review completed successfully",
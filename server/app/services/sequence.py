@@ -0,0 +1,173 @@
+"""Counter-backed sequences (employeeId).
+
+Each sequence is one document in the ``counters`` collection whose ``value`` is
+the last number handed out. Numbers are reserved with a single atomic
+``$inc``, in blocks, so concurrent workers never collide and a worker only goes
+back to MongoDB once per block. Callers that need many numbers at once (batch
+creation, seeding) reserve them all in one round trip with ``reserve``.
+
+Numbers left in a block when a worker exits are never handed out, so the
+sequence can have gaps; it is unique and increasing per worker, not dense.
+
+Clients may also supply their own ``EMP<n>`` ids. Writers pass those to
+``observe``, which moves the counter (and this worker's block) past them; another
+worker's block may still hold such a number, so inserts of generated ids retry
+with a fresh one on a duplicate key.
+"""
+
+import asyncio
+import re
+from typing import Iterable, Optional
+
+from pymongo import ReturnDocument
+
+from app.config import settings
+
+
+COUNTERS = "counters"
+
+EMPLOYEE_ID_SEQUENCE = "employeeId"
+EMPLOYEE_ID_PREFIX = "EMP"
+
+
+# Attempts at inserting a row under a generated employeeId before giving up.
+GENERATED_ID_ATTEMPTS = 3
+
+# Largest EMP<n> number accepted. Counter values are 64-bit integers; staying
+# far below 2**63 leaves the counter room to keep counting after a client id.
+MAX_SEQUENCE_NUMBER = 10 ** 15 - 1
+
+_EMPLOYEE_ID_NUMBER = re.compile(f"^{EMPLOYEE_ID_PREFIX}([0-9]+)$")
+
+
+def format_employee_id(number: int) -> str:
+    """EMP001, EMP002, ... (wider once past EMP999)."""
+    return f"{EMPLOYEE_ID_PREFIX}{number:03d}"
+
+
+def employee_id_number(employee_id) -> Optional[int]:
+    """The number of an ``EMP<n>`` employeeId; None for any other value.
+
+    Raises ValueError when the number is above ``MAX_SEQUENCE_NUMBER``; check
+    client-supplied ids with it before storing them.
+    """
+    match = _EMPLOYEE_ID_NUMBER.match(employee_id) if isinstance(employee_id, str) else None
+    if not match:
+        return None
+    number = int(match.group(1))
+    if number > MAX_SEQUENCE_NUMBER:
+        raise ValueError(f"Employee ID {employee_id} is out of range; the number can be at most {MAX_SEQUENCE_NUMBER}.")
+    return number
+
+
+def is_duplicate_employee_id(details: Optional[dict]) -> bool:
+    """Whether a duplicate key error's details point at the employeeId index."""
+    details = details or {}
+    if "keyPattern" in details:
+        return "employeeId" in details["keyPattern"]
+    return "employeeId" in details.get("errmsg", "")
+
+
+class SequenceAllocator:
+    def __init__(self, name: str, block_size: int) -> None:
+        self.name = name
+        self.block_size = max(1, block_size)
+        self._next = 0
+        self._end = 0  # exclusive
+        self._seeded = False
+        self._lock = asyncio.Lock()
+
+    async def next(self, db) -> int:
+        """The next number in the sequence."""
+        return (await self.reserve(db, 1))[0]
+
+    async def reserve(self, db, count: int) -> range:
+        """Reserve ``count`` consecutive numbers.
+
+        Requests that fit in the local block are served without a round trip;
+        requests of a block or more get their own range straight from the
+        counter and leave the local block untouched.
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        async with self._lock:
+            if count >= self.block_size:
+                return await self._allocate(db, count)
+            if self._end - self._next < count:
+                block = await self._allocate(db, self.block_size)
+                self._next, self._end = block.start, block.stop
+            numbers = range(self._next, self._next + count)
+            self._next += count
+            return numbers
+
+    async def observe(self, db, numbers: Iterable[int]) -> None:
+        """Move the sequence past numbers that were used without being reserved
+        (client-supplied ids), so it does not hand them out again."""
+        highest = max(numbers, default=None)
+        if highest is None:
+            return
+        await db[COUNTERS].update_one(
+            {"_id": self.name}, {"$max": {"value": highest}}, upsert=True
+        )
+        async with self._lock:
+            if self._next <= highest:
+                self._next = min(highest + 1, self._end)
+
+    async def _allocate(self, db, count: int) -> range:
+        if not self._seeded:
+            await self._seed(db)
+        doc = await db[COUNTERS].find_one_and_update(
+            {"_id": self.name},
+            {"$inc": {"value": count}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        last = doc["value"]
+        return range(last - count + 1, last + 1)
+
+    async def _seed(self, db) -> None:
+        """Start the counter past the highest number already in use.
+
+        Runs once per process; ``$max`` makes it a no-op once the counter is
+        ahead, so concurrent workers can all run it safely.
+        """
+        highest = await self._highest_in_use(db)
+        await db[COUNTERS].update_one(
+            {"_id": self.name}, {"$max": {"value": highest or 0}}, upsert=True
+        )
+        self._seeded = True
+
+    async def _highest_in_use(self, db) -> Optional[int]:
+        if self.name != EMPLOYEE_ID_SEQUENCE:
+            return None
+        # Compare numerically: "EMP1000" sorts before "EMP999" as a string.
+        pipeline = [
+            {"$match": {"employeeId": {"$regex": f"^{EMPLOYEE_ID_PREFIX}[0-9]+$"}}},
+            {
+                "$group": {
+                    "_id": None,
+                    "highest": {
+                        "$max": {
+                            # Numbers too large for a long (stored before ids
+                            # were range-checked) are skipped, not fatal.
+                            "$convert": {
+                                "input": {
+                                    "$substrCP": [
+                                        "$employeeId",
+                                        len(EMPLOYEE_ID_PREFIX),
+                                        {"$strLenCP": "$employeeId"},
+                                    ]
+                                },
+                                "to": "long",
+                                "onError": None,
+                            }
+                        }
+                    },
+                }
+            },
+        ]
+        docs = await db.employees.aggregate(pipeline).to_list(length=1)
+        return docs[0]["highest"] if docs else None
+
+
+employee_ids = SequenceAllocator(EMPLOYEE_ID_SEQUENCE, settings.employee_id_block_size)
@@ -0,0 +1,260 @@
+"""In-memory prefix index behind the employee/manager typeahead.
+
+Every employee contributes a handful of lowercase keys (full name, each name
+word, employeeId) to a sorted list of ``(key, id)`` pairs, so a prefix lookup is
+one ``bisect`` plus a short forward scan. Manager-eligible people are also kept
+in a second sorted list so manager pickers never scan past ineligible matches.
+
+The index is loaded lazily on first use, patched in place by this process's
+writes (via ``employee_events``), and rebuilt in the background when it is
+invalidated or older than ``settings.suggest_index_refresh_seconds`` so writes
+made by other workers show up too.
+"""
+
+import asyncio
+import bisect
+import logging
+import sys
+import time
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.models.employee import (
+    MANAGER_ELIGIBLE_STATUSES,
+    MANAGER_ELIGIBLE_TYPES,
+    MANAGER_JOB_LEVELS,
+)
+from app.services import employee_events
+
+
+# Stored fields needed to key, filter and render a suggestion.
+_PROJECTION = {
+    "fullName": 1,
+    "employeeId": 1,
+    "position": 1,
+    "department": 1,
+    "jobLevel": 1,
+    "status": 1,
+    "employmentType": 1,
+    "managerId": 1,
+}
+
+# Record layout (a tuple per employee keeps the per-row footprint small).
+_NAME, _EMPLOYEE_ID, _POSITION, _DEPARTMENT, _LEVEL, _STATUS, _TYPE, _MANAGER = range(8)
+
+
+def _intern(value) -> Optional[str]:
+    """Share repeated low-cardinality strings (department, level, ...) between rows."""
+    if isinstance(value, Enum):
+        value = value.value
+    return sys.intern(value) if isinstance(value, str) else None
+
+
+def _record(doc: dict) -> tuple:
+    return (
+        doc.get("fullName") or "",
+        doc.get("employeeId") or "",
+        _intern(doc.get("position")),
+        _intern(doc.get("department")),
+        _intern(doc.get("jobLevel")),
+        _intern(doc.get("status")),
+        _intern(doc.get("employmentType")),
+        doc.get("managerId") or None,
+    )
+
+
+def _keys(record: tuple) -> List[str]:
+    name = record[_NAME].strip().lower()
+    keys = {name, record[_EMPLOYEE_ID].lower()}
+    keys.update(name.split())
+    keys.discard("")
+    return sorted(keys)
+
+
+class EmployeeSuggestIndex:
+    def __init__(self) -> None:
+        self._records: Dict[str, tuple] = {}
+        self._report_counts: Dict[str, int] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._manager_keys: List[Tuple[str, str]] = []
+        self._built_at: Optional[float] = None
+        self._stale = False
+        self._rebuilding = False
+        self._rebuild_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    # -- build -------------------------------------------------------------
+
+    async def ensure_fresh(self, db) -> None:
+        """Load the index on first use; refresh it in the background when stale.
+
+        Only the very first load blocks a request. Later refreshes build a new
+        index off to the side and swap it in, serving the current one meanwhile.
+        """
+        if self._built_at is None:
+            async with self._lock:
+                if self._built_at is None:
+                    await self._rebuild(db)
+            return
+        age = time.monotonic() - self._built_at
+        if self._stale or age > settings.suggest_index_refresh_seconds:
+            if self._rebuild_task is None or self._rebuild_task.done():
+                self._rebuild_task = asyncio.create_task(self._refresh(db))
+
+    async def _refresh(self, db) -> None:
+        try:
+            await self._rebuild(db)
+        except Exception as exc:
+            logging.error(f"Suggest index refresh failed: {exc}")
+
+    async def _rebuild(self, db) -> None:
+        started = time.monotonic()
+        self._stale = False
+        self._rebuilding = True
+        try:
+            records: Dict[str, tuple] = {}
+            cursor = db.employees.find({}, _PROJECTION).batch_size(5000)
+            async for doc in cursor:
+                records[str(doc["_id"])] = _record(doc)
+        finally:
+            self._rebuilding = False
+
+        report_counts: Dict[str, int] = {}
+        for record in records.values():
+            manager_id = record[_MANAGER]
+            if manager_id:
+                report_counts[manager_id] = report_counts.get(manager_id, 0) + 1
+
+        keys: List[Tuple[str, str]] = []
+        manager_keys: List[Tuple[str, str]] = []
+        for emp_id, record in records.items():
+            entries = [(key, emp_id) for key in _keys(record)]
+            keys.extend(entries)
+            if self._is_manager_eligible(record, report_counts.get(emp_id, 0)):
+                manager_keys.extend(entries)
+        keys.sort()
+        manager_keys.sort()
+
+        self._records = records
+        self._report_counts = report_counts
+        self._keys = keys
+        self._manager_keys = manager_keys
+        self._built_at = time.monotonic()
+        logging.info(
+            f"Suggest index built: {len(records)} employees in {self._built_at - started:.2f}s"
+        )
+
+    # -- maintenance -------------------------------------------------------
+
+    def invalidate(self, fields: Optional[frozenset] = None) -> None:
+        if fields is None or not fields.isdisjoint(_PROJECTION):
+            self._stale = True
+
+    def apply_change(self, before: Optional[dict], after: Optional[dict]) -> None:
+        """Patch the index for one inserted, updated or removed employee."""
+        if self._built_at is None or self._rebuilding:
+            # A load is in flight and may have read this row before the write;
+            # refresh again once it has been swapped in.
+            self._stale = True
+        if self._built_at is None:
+            return
+        doc = after if after is not None else before
+        emp_id = str(doc["_id"])
+
+        old = self._records.get(emp_id)
+        new = _record(after) if after is not None else None
+        # People whose manager eligibility may flip: this employee and the
+        # managers losing/gaining them as a report.
+        affected = {emp_id}
+
+        if old is not None:
+            was_eligible = self._eligible(emp_id)
+            for key in _keys(old):
+                self._remove(self._keys, (key, emp_id))
+                if was_eligible:
+                    self._remove(self._manager_keys, (key, emp_id))
+            if old[_MANAGER]:
+                affected.add(old[_MANAGER])
+            del self._records[emp_id]
+
+        before_eligibility = {mid: self._eligible(mid) for mid in affected - {emp_id}}
+
+        if old is not None and old[_MANAGER]:
+            self._report_counts[old[_MANAGER]] = max(0, self._report_counts.get(old[_MANAGER], 0) - 1)
+        if new is not None:
+            if new[_MANAGER]:
+                affected.add(new[_MANAGER])
+                before_eligibility.setdefault(new[_MANAGER], self._eligible(new[_MANAGER]))
+                self._report_counts[new[_MANAGER]] = self._report_counts.get(new[_MANAGER], 0) + 1
+            self._records[emp_id] = new
+            for key in _keys(new):
+                bisect.insort(self._keys, (key, emp_id))
+                if self._eligible(emp_id):
+                    bisect.insort(self._manager_keys, (key, emp_id))
+
+        for manager_id, was_eligible in before_eligibility.items():
+            record = self._records.get(manager_id)
+            if record is None or was_eligible == self._eligible(manager_id):
+                continue
+            for key in _keys(record):
+                if was_eligible:
+                    self._remove(self._manager_keys, (key, manager_id))
+                else:
+                    bisect.insort(self._manager_keys, (key, manager_id))
+
+    @staticmethod
+    def _remove(entries: List[Tuple[str, str]], entry: Tuple[str, str]) -> None:
+        i = bisect.bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+
+    @staticmethod
+    def _is_manager_eligible(record: tuple, report_count: int) -> bool:
+        """Same rules as EmployeeService.get_managers."""
+        return (
+            record[_STATUS] in MANAGER_ELIGIBLE_STATUSES
+            and record[_TYPE] in MANAGER_ELIGIBLE_TYPES
+            and (report_count > 0 or record[_LEVEL] in MANAGER_JOB_LEVELS)
+        )
+
+    def _eligible(self, emp_id: str) -> bool:
+        record = self._records.get(emp_id)
+        return record is not None and self._is_manager_eligible(
+            record, self._report_counts.get(emp_id, 0)
+        )
+
+    # -- lookup ------------------------------------------------------------
+
+    def suggest(self, prefix: str, limit: int = 10, managers_only: bool = False) -> List[dict]:
+        """Return up to ``limit`` employees with a key starting with ``prefix``."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        entries = self._manager_keys if managers_only else self._keys
+        results: List[dict] = []
+        seen = set()
+        i = bisect.bisect_left(entries, (prefix, ""))
+        while i < len(entries) and len(results) < limit:
+            key, emp_id = entries[i]
+            if not key.startswith(prefix):
+                break
+            i += 1
+            if emp_id in seen:
+                continue
+            seen.add(emp_id)
+            record = self._records[emp_id]
+            results.append({
+                "_id": emp_id,
+                "employeeId": record[_EMPLOYEE_ID],
+                "fullName": record[_NAME],
+                "position": record[_POSITION],
+                "department": record[_DEPARTMENT],
+                "jobLevel": record[_LEVEL],
+                "status": record[_STATUS],
+            })
+        return results
+
+
+suggest_index = EmployeeSuggestIndex()
+employee_events.subscribe(suggest_index)
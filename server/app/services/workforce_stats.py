@@ -0,0 +1,225 @@
+"""Materialized workforce statistics kept in step with employee writes.
+
+The ``workforce_stats`` collection holds one document per combination of
+department, status, jobLevel and employmentType that occurs (``count``, and
+``salaryCount``/``salarySum`` over numeric salaries) and one per hire month
+(``count``). Analytics read these few documents instead of scanning employees,
+so their cost grows with the number of distinct values, not of employees.
+
+Write paths report what they changed (``record`` with before/after documents,
+or ``move_matching`` just ahead of a filtered ``update_many``) and the counters
+are adjusted with ``$inc`` right after the employee write, the same way the
+hierarchy counts are kept. The two writes are not one transaction, so a crash
+between them or a write that bypasses the API leaves the counters off until
+``reconcile`` (``python -m scripts.rebuild_workforce_stats``) recomputes them
+from the employees and corrects whatever drifted.
+"""
+
+import logging
+import math
+from collections import defaultdict
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+from pymongo.errors import PyMongoError
+
+
+WORKFORCE_STATS = "workforce_stats"
+
+DIMENSIONS = ("department", "status", "jobLevel", "employmentType")
+# Every stored field the statistics depend on.
+STATS_FIELDS = DIMENSIONS + ("salary", "hireDate")
+STATS_PROJECTION = {field: 1 for field in STATS_FIELDS}
+
+COUNTERS = ("count", "salaryCount", "salarySum")
+
+# (before, after) pairs of employee documents; None on either side for an
+# insert or a removal.
+Change = Tuple[Optional[dict], Optional[dict]]
+
+
+def _plain(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def parse_hire_date(value: Any) -> Optional[datetime]:
+    """A stored hireDate (ISO string or date) as a naive UTC datetime, or None."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _salary(doc: dict) -> Optional[float]:
+    value = doc.get("salary")
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value):
+        return None
+    return float(value)
+
+
+class _Delta:
+    """Counter changes accumulated over many documents, written in one batch."""
+
+    def __init__(self) -> None:
+        self.cells: Dict[Tuple, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        self.months: Dict[str, int] = defaultdict(int)
+
+    def add(self, doc: dict, sign: int = 1) -> None:
+        salary = _salary(doc)
+        self.add_cell(
+            tuple(_plain(doc.get(field)) for field in DIMENSIONS),
+            sign,
+            sign if salary is not None else 0,
+            sign * salary if salary is not None else 0,
+        )
+        hired = parse_hire_date(doc.get("hireDate"))
+        if hired:
+            self.months[hired.strftime("%Y-%m")] += sign
+
+    def add_cell(self, key: Tuple, count: int, salary_count: int, salary_sum: float) -> None:
+        cell = self.cells[key]
+        cell["count"] += count
+        cell["salaryCount"] += salary_count
+        cell["salarySum"] += salary_sum
+
+    def entries(self) -> Iterable[Tuple[dict, Dict[str, float]]]:
+        """(stats document _id, counters) for every entry that changed."""
+        for key, counters in self.cells.items():
+            if any(counters.values()):
+                yield dict(zip(DIMENSIONS, key)), counters
+        for month, count in self.months.items():
+            if count:
+                yield {"hireMonth": month}, {"count": count}
+
+
+def _entry_key(_id: dict) -> Tuple:
+    if "hireMonth" in _id:
+        return ("month", _id["hireMonth"])
+    return ("cell",) + tuple(_id.get(field) for field in DIMENSIONS)
+
+
+class WorkforceStats:
+    async def record(self, db, changes: Iterable[Change]) -> None:
+        """Account for employee writes given as (before, after) documents.
+
+        The documents need at least ``STATS_FIELDS``; writes that change none of
+        them cost nothing.
+        """
+        delta = _Delta()
+        for before, after in changes:
+            if before:
+                delta.add(before, -1)
+            if after:
+                delta.add(after)
+        await self._apply(db, delta)
+
+    async def move_matching(self, db, query: dict, changes: Dict[str, Any]) -> None:
+        """Account for ``$set: changes`` (dimension fields only) on every employee
+        matching ``query``. Call it just before the ``update_many``."""
+        changes = {field: _plain(value) for field, value in changes.items() if field in DIMENSIONS}
+        if not changes:
+            return
+        pipeline = [
+            {"$match": query},
+            {"$group": {
+                "_id": {field: f"${field}" for field in DIMENSIONS},
+                "count": {"$sum": 1},
+                "salaryCount": {"$sum": {"$cond": [{"$isNumber": "$salary"}, 1, 0]}},
+                "salarySum": {"$sum": "$salary"},
+            }},
+        ]
+        delta = _Delta()
+        async for group in db.employees.aggregate(pipeline):
+            old = {field: group["_id"].get(field) for field in DIMENSIONS}
+            new = {**old, **changes}
+            counts = (group["count"], group["salaryCount"], group["salarySum"])
+            delta.add_cell(tuple(old.values()), *(-value for value in counts))
+            delta.add_cell(tuple(new[field] for field in DIMENSIONS), *counts)
+        await self._apply(db, delta)
+
+    async def load(self, db) -> Tuple[List[dict], Dict[str, int]]:
+        """The non-empty cells (dimension fields plus counters) and hire counts by month."""
+        cells: List[dict] = []
+        months: Dict[str, int] = {}
+        async for doc in db[WORKFORCE_STATS].find({}):
+            if doc.get("count", 0) <= 0:
+                continue
+            if "hireMonth" in doc["_id"]:
+                months[doc["_id"]["hireMonth"]] = doc["count"]
+            else:
+                cell = {field: doc["_id"].get(field) for field in DIMENSIONS}
+                cell.update({counter: doc.get(counter, 0) for counter in COUNTERS})
+                cells.append(cell)
+        return cells, months
+
+    async def ensure_built(self, db) -> None:
+        """Build the statistics if they have never been built for this data."""
+        if await db[WORKFORCE_STATS].find_one({}, {"_id": 1}):
+            return
+        if await db.employees.find_one({}, {"_id": 1}):
+            result = await self.reconcile(db)
+            logging.info(f"Built workforce statistics from {result['scanned']} employees")
+
+    async def reconcile(self, db) -> Dict[str, int]:
+        """Recompute every counter from the employees and fix the ones that drifted.
+
+        Returns how many employees were scanned, how many statistics documents
+        were wrong (rewritten or removed) and how many empty ones were pruned.
+        Writes made while it runs may need another pass.
+        """
+        expected = _Delta()
+        scanned = 0
+        async for doc in db.employees.find({}, STATS_PROJECTION).batch_size(5000):
+            expected.add(doc)
+            scanned += 1
+        wanted = {_entry_key(_id): (_id, counters) for _id, counters in expected.entries()}
+
+        ops = []
+        corrected = pruned = 0
+        async for doc in db[WORKFORCE_STATS].find({}):
+            key = _entry_key(doc["_id"])
+            if key not in wanted:
+                # Emptied by moves between combinations, or left by drift.
+                ops.append(DeleteOne({"_id": doc["_id"]}))
+                if any(doc.get(counter) for counter in COUNTERS):
+                    corrected += 1
+                else:
+                    pruned += 1
+                continue
+            _id, counters = wanted.pop(key)
+            if not all(
+                math.isclose(doc.get(counter, 0), value, rel_tol=1e-9)
+                for counter, value in counters.items()
+            ):
+                ops.append(ReplaceOne({"_id": doc["_id"]}, dict(counters)))
+                corrected += 1
+        ops.extend(ReplaceOne({"_id": _id}, dict(counters), upsert=True) for _id, counters in wanted.values())
+        corrected += len(wanted)
+
+        if ops:
+            await db[WORKFORCE_STATS].bulk_write(ops, ordered=False)
+        return {"scanned": scanned, "corrected": corrected, "pruned": pruned}
+
+    async def _apply(self, db, delta: _Delta) -> None:
+        ops = [
+            UpdateOne({"_id": _id}, {"$inc": counters}, upsert=True)
+            for _id, counters in delta.entries()
+        ]
+        if not ops:
+            return
+        try:
+            await db[WORKFORCE_STATS].bulk_write(ops, ordered=False)
+        except PyMongoError as exc:
+            # The employee write has already succeeded; reconcile repairs this.
+            logging.error(f"Workforce statistics update failed ({exc}); run scripts.rebuild_workforce_stats")
+
+
+workforce_stats = WorkforceStats()
@@ -0,0 +1,87 @@
+"""Apply one update to many employees by id in a few round trips.
+
+Bulk endpoints take a list of id strings and report which of them could not be
+updated. Rather than one ``update_one`` per id, ids are handled in chunks: one
+``$in`` read finds which exist (and fetches whatever the caller needs from
+them), then one unordered ``bulk_write`` updates them all. Write errors are
+mapped back to their ids through the operation index, so ``failedIds`` names
+exactly the ids that were malformed, missing or rejected by the server.
+"""
+
+import logging
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+
+BULK_BATCH_SIZE = 5000
+
+# Called after each chunk with the number of ids handled so far and the ids
+# that have failed so far (see app/services/bulk_jobs.py).
+Progress = Callable[[int, List[str]], Awaitable[None]]
+
+
+def parse_ids(ids: Iterable[str]) -> Tuple[List[Tuple[str, ObjectId]], List[str]]:
+    """Split id strings into (id, ObjectId) pairs and the ones that aren't valid."""
+    parsed, invalid = [], []
+    for emp_id in ids:
+        if ObjectId.is_valid(emp_id):
+            parsed.append((emp_id, ObjectId(emp_id)))
+        else:
+            invalid.append(emp_id)
+    return parsed, invalid
+
+
+async def update_by_ids(
+    collection,
+    ids: List[str],
+    update: Dict,
+    projection: Optional[Dict] = None,
+    batch_size: int = BULK_BATCH_SIZE,
+    progress: Optional[Progress] = None,
+) -> Tuple[List[dict], List[str]]:
+    """Apply ``update`` to every id in ``ids``.
+
+    Returns the documents that were updated, as read just before the write
+    (with ``projection``, ``_id`` only by default), and the ids that were not,
+    in input order.
+    """
+    parsed, invalid = parse_ids(ids)
+    failed = set(invalid)
+    updated: List[dict] = []
+
+    for start in range(0, len(parsed), batch_size):
+        chunk = parsed[start:start + batch_size]
+        cursor = collection.find(
+            {"_id": {"$in": [oid for _, oid in chunk]}}, projection or {"_id": 1}
+        )
+        found = {doc["_id"]: doc async for doc in cursor}
+        targets = []
+        for emp_id, oid in chunk:
+            if oid in found:
+                targets.append((emp_id, oid))
+            else:
+                failed.add(emp_id)
+        if targets:
+            rejected = set()
+            try:
+                await collection.bulk_write(
+                    [UpdateOne({"_id": oid}, update) for _, oid in targets], ordered=False
+                )
+            except BulkWriteError as exc:
+                for error in exc.details.get("writeErrors", []):
+                    emp_id = targets[error["index"]][0]
+                    rejected.add(emp_id)
+                    logging.error(f"Bulk update failed for employee {emp_id}: {error.get('errmsg')}")
+            failed.update(rejected)
+            updated.extend(found[oid] for emp_id, oid in targets if emp_id not in rejected)
+        if progress:
+            await progress(len(invalid) + start + len(chunk), _in_order(ids, failed))
+
+    return updated, _in_order(ids, failed)
+
+
+def _in_order(ids: List[str], failed: set) -> List[str]:
+    return [emp_id for emp_id in ids if emp_id in failed]
@@ -0,0 +1,130 @@
+"""Serialize raw employee documents to NDJSON or CSV as a byte stream.
+
+Rows come straight from a MongoDB cursor (no model construction); they are
+encoded a few hundred at a time so a response streams in reasonably sized
+chunks while memory stays flat. CSV nests fields with dotted column names
+(``hrAssignment.assignedTo``) and writes lists as JSON text, the same
+conventions the CSV import reads.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Union, get_args, get_origin
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+
+EXPORT_FORMATS = ("ndjson", "csv")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Rows encoded per yielded chunk.
+ROWS_PER_CHUNK = 500
+
+
+def _nested_model(annotation) -> Optional[type]:
+    """The model class behind ``Model`` / ``Optional[Model]``, else None."""
+    if get_origin(annotation) is Union:
+        models = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = models[0] if len(models) == 1 else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def model_columns(model: type, names: Optional[Iterable[str]] = None) -> List[str]:
+    """CSV columns for ``model``'s stored field names (all of them by default).
+
+    Nested models are expanded to dotted columns; lists stay one column and
+    are written as JSON.
+    """
+    fields = {field.alias or name: field for name, field in model.model_fields.items()}
+    columns: List[str] = []
+    for name in names if names is not None else fields:
+        nested = _nested_model(fields[name].annotation) if name in fields else None
+        if nested is None:
+            columns.append(name)
+        else:
+            columns.extend(f"{name}.{column}" for column in model_columns(nested))
+    return columns
+
+
+def _is_list(annotation) -> bool:
+    """Whether ``annotation`` is ``List[...]`` / ``Optional[List[...]]``."""
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    return get_origin(annotation) is list
+
+
+def list_columns(model: type) -> Set[str]:
+    """The CSV columns of ``model`` that hold a list, written as JSON text."""
+    columns: Set[str] = set()
+    for name, field in model.model_fields.items():
+        name = field.alias or name
+        nested = _nested_model(field.annotation)
+        if nested is not None:
+            columns.update(f"{name}.{column}" for column in list_columns(nested))
+        elif _is_list(field.annotation):
+            columns.add(name)
+    return columns
+
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default)
+    return str(value)
+
+
+def _flatten(doc: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    flat: Dict[str, Any] = {}
+    for key, value in doc.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+async def ndjson_stream(rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    lines: List[str] = []
+    async for row in rows:
+        lines.append(json.dumps(row, default=_json_default))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def csv_stream(rows: AsyncIterator[dict], columns: List[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    async for row in rows:
+        flat = _flatten(row)
+        writer.writerow([_cell(flat.get(column)) for column in columns])
+        count += 1
+        if count >= ROWS_PER_CHUNK:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode()
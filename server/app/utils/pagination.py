@@ -0,0 +1,80 @@
+"""Keyset (cursor) pagination helpers for employee listings.
+
+A cursor encodes the sort key and the last row's (sort value, _id) pair, so the
+next page is fetched with a range predicate on a compound ``(field, _id)`` index
+instead of ``skip``. Deep pages cost the same as the first one and rows are
+never duplicated or skipped when other rows are inserted or removed mid-scan.
+"""
+
+import base64
+import json
+from typing import Any, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+
+SORT_FIELDS = ("fullName", "hireDate", "employeeId")
+DEFAULT_SORT = "fullName"
+
+
+def parse_sort(sort: Optional[str]) -> Tuple[str, int]:
+    """Parse ``fullName`` / ``-hireDate`` style sort strings into (field, direction)."""
+    if not sort:
+        return DEFAULT_SORT, ASCENDING
+    direction = DESCENDING if sort.startswith("-") else ASCENDING
+    field = sort.lstrip("+-")
+    if field not in SORT_FIELDS:
+        raise ValueError(f"Cannot sort by '{field}'. Allowed: {', '.join(SORT_FIELDS)}.")
+    return field, direction
+
+
+def sort_spec(field: str, direction: int) -> list:
+    """Sort specification with ``_id`` as the tiebreaker."""
+    return [(field, direction), ("_id", direction)]
+
+
+def encode_cursor(field: str, direction: int, doc: dict) -> str:
+    """Build the opaque cursor pointing just past ``doc``."""
+    payload = {"f": field, "d": direction, "v": doc.get(field), "id": str(doc["_id"])}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, field: str, direction: int) -> Tuple[Any, ObjectId]:
+    """Return the (sort value, _id) a cursor points past.
+
+    Raises ValueError if the cursor is malformed or was issued for a different
+    sort than the one requested.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = ObjectId(payload["id"])
+    except Exception:
+        raise ValueError("Invalid pagination cursor.")
+    if payload.get("f") != field or payload.get("d") != direction:
+        raise ValueError("Pagination cursor does not match the requested sort.")
+    return payload.get("v"), last_id
+
+
+def keyset_filter(field: str, direction: int, value: Any, last_id: ObjectId) -> dict:
+    """Predicate selecting the rows that sort strictly after (value, last_id).
+
+    MongoDB sorts missing/null values first, so they precede every real value
+    ascending and follow them descending.
+    """
+    if direction == ASCENDING:
+        if value is None:
+            return {"$or": [{field: None, "_id": {"$gt": last_id}}, {field: {"$ne": None}}]}
+        return {"$or": [{field: {"$gt": value}}, {field: value, "_id": {"$gt": last_id}}]}
+
+    if value is None:
+        return {field: None, "_id": {"$lt": last_id}}
+    return {
+        "$or": [
+            {field: {"$lt": value}},
+            {field: value, "_id": {"$lt": last_id}},
+            {field: None},
+        ]
+    }
@@ -0,0 +1,35 @@
+"""Backfill materialized reporting paths and org counts on every employee.
+
+Recomputes each employee's ``ancestors`` (ids above them, root first) and
+``depth``, plus ``directReportCount`` and ``subtreeSize``, from ``managerId``
+and writes only the documents whose stored values are missing or wrong, so it is
+safe to re-run at any time (e.g. after importing data that bypassed the API). Reporting loops found in the data are reported.
+
+Usage:
+  python -m scripts.backfill_hierarchy
+"""
+
+import asyncio
+
+from app.database import connect_to_mongo, close_mongo_connection, get_database
+from app.indexes import ensure_indexes
+from app.services.hierarchy_service import HierarchyService
+
+
+async def main() -> int:
+    await connect_to_mongo()
+    try:
+        db = await get_database()
+        await ensure_indexes(db)
+        result = await HierarchyService().backfill(db)
+        print(f"Scanned {result['scanned']} employees, updated {result['updated']}")
+        if result["cycles"]:
+            print(f"Broke {result['cycles']} reporting loop(s); review those managers")
+            return 1
+        return 0
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
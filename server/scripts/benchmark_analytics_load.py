@@ -0,0 +1,180 @@
+"""Benchmark CRUD latency while the analytics endpoints are hammered.
+
+Seeds a scratch database (``<DATABASE_NAME>_bench``) with ``--employees``
+synthetic employees. For ``--seconds`` at a time, one loop reads and updates
+single employees the way ``GET``/``PUT /api/employees/{id}`` do and records each
+round trip, while ``--clients`` loops keep requesting the salary,
+performance-trend and performance analytics (bypassing the result cache, so
+every request is a fresh computation). It does this with no analytics load,
+with the computations inline on the event loop (``ANALYTICS_POOL_WORKERS=0``)
+and in a compute pool of ``--workers`` processes, and prints the CRUD latency
+percentiles of each. Analytics requests turned away by the pool's queue limit
+are counted as rejected. The scratch database is dropped afterwards.
+
+Usage:
+  python -m scripts.benchmark_analytics_load [--employees 50000] [--clients 8] [--seconds 10] [--workers 2]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+from app.config import settings
+from app.database import connect_to_mongo, close_mongo_connection, db as database
+from app.models.employee import EmployeeUpdate
+from app.services.analytics_service import AnalyticsService
+from app.services.compute_pool import ComputePoolBusy, compute_pool
+from app.services.employee_service import EmployeeService
+from app.services.performance_service import PerformanceService
+
+
+DEPARTMENTS = ["Engineering", "Sales", "Marketing", "Finance", "Operations", "HR", "Legal", "Support"]
+LEVELS = ["Entry", "Mid", "Senior", "Lead", "Manager", "Director"]
+RATINGS = ["Exceeds Expectations", "Meets Expectations", "Needs Improvement", "Unsatisfactory", "Unrated"]
+
+
+def review(n: int) -> dict:
+    return {
+        "reviewId": f"review_{n}",
+        "reviewDate": f"{2021 + n}-12-15",
+        "reviewPeriodStart": f"{2021 + n}-01-01",
+        "reviewPeriodEnd": f"{2021 + n}-12-31",
+        "reviewerName": "Reviewer",
+        "reviewerEmail": "reviewer@example.com",
+        "rating": random.choice(RATINGS),
+        "comments": "Synthetic review",
+    }
+
+
+def synthetic_employee(i: int) -> dict:
+    hired = date(2015, 1, 1) + timedelta(days=random.randrange(4000))
+    return {
+        "employeeId": f"EMP{i:06d}",
+        "status": random.choice(["Active"] * 8 + ["On Leave", "Terminated"]),
+        "firstName": f"First{i}",
+        "lastName": f"Last{i}",
+        "fullName": f"First{i} Last{i}",
+        "personalEmail": f"person{i}@example.com",
+        "workEmail": f"employee{i}@example.com",
+        "phoneNumber": "555-0100",
+        "emergencyContactName": "Contact",
+        "emergencyContactPhone": "555-0101",
+        "address": "1 Main St",
+        "city": "Springfield",
+        "state": "IL",
+        "country": "US",
+        "department": random.choice(DEPARTMENTS),
+        "position": "Specialist",
+        "jobLevel": random.choice(LEVELS),
+        "employmentType": random.choice(["Full-time", "Part-time", "Contract"]),
+        "workLocation": "Remote",
+        "hireDate": hired.isoformat(),
+        "salary": float(random.randrange(40000, 250000)),
+        "currency": 840,
+        "paygrade": "E3",
+        "benefitsEligible": "Yes",
+        "performanceRating": random.choice(RATINGS),
+        "performanceHistory": [review(n) for n in range(random.randrange(4))],
+        "trainingStatus": "Completed",
+        "developmentNotes": "",
+        "backgroundCheckStatus": "Completed",
+        "hrAssignment": {"assignedTo": "HR"},
+    }
+
+
+async def seed(db, count: int) -> List[str]:
+    ids: List[str] = []
+    for start in range(0, count, 5000):
+        docs = [synthetic_employee(i) for i in range(start, min(count, start + 5000))]
+        result = await db.employees.insert_many(docs, ordered=False)
+        ids.extend(str(_id) for _id in result.inserted_ids)
+    return ids
+
+
+async def crud_loop(ids: List[str], stop_at: float) -> List[float]:
+    service = EmployeeService()
+    latencies: List[float] = []
+    while time.perf_counter() < stop_at:
+        employee_id = random.choice(ids)
+        started = time.perf_counter()
+        await service.get_employee(employee_id)
+        await service.update_employee(employee_id, EmployeeUpdate(developmentNotes=f"bench {len(latencies)}"))
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def analytics_loop(stop_at: float, counts: Dict[str, int]) -> None:
+    analytics, performance = AnalyticsService(), PerformanceService()
+    # The undecorated methods, so every request is computed.
+    requests = [
+        lambda: AnalyticsService.get_salary_analytics.__wrapped__(analytics),
+        lambda: AnalyticsService.get_performance_trends.__wrapped__(analytics),
+        lambda: PerformanceService.get_performance_analytics.__wrapped__(performance),
+    ]
+    while time.perf_counter() < stop_at:
+        try:
+            await random.choice(requests)()
+            counts["computed"] += 1
+        except ComputePoolBusy:
+            counts["rejected"] += 1
+            await asyncio.sleep(0.05)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_phase(label: str, ids: List[str], clients: int, seconds: float) -> None:
+    stop_at = time.perf_counter() + seconds
+    counts = {"computed": 0, "rejected": 0}
+    latencies, *_ = await asyncio.gather(
+        crud_loop(ids, stop_at),
+        *(analytics_loop(stop_at, counts) for _ in range(clients)),
+    )
+    print(
+        f"{label:<24} {len(latencies):>7} {percentile(latencies, 0.5):8.2f} {percentile(latencies, 0.95):8.2f} "
+        f"{percentile(latencies, 0.99):8.2f} {max(latencies):9.2f} {counts['computed']:>9} {counts['rejected']:>9}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=50000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    name = f"{settings.database_name}_bench"
+    # The services read settings.database_name.
+    settings.database_name = name
+    db = database.client[name]
+    try:
+        await database.client.drop_database(name)
+        ids = await seed(db, args.employees)
+        print(f"{args.employees} employees, {args.clients} analytics clients, {args.seconds:g}s per run\n")
+        print(f"{'CRUD (get + update), ms':<24} {'ops':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>9} {'analytics':>9} {'rejected':>9}")
+
+        await run_phase("no analytics load", ids, 0, args.seconds)
+
+        settings.analytics_pool_workers = 0
+        await run_phase("inline analytics", ids, args.clients, args.seconds)
+
+        settings.analytics_pool_workers = args.workers
+        await compute_pool.start()
+        try:
+            await run_phase(f"pool of {args.workers} processes", ids, args.clients, args.seconds)
+        finally:
+            await compute_pool.stop()
+    finally:
+        await database.client.drop_database(name)
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""Benchmark the manager-chain cycle check on a deep synthetic hierarchy.
+
+Builds a throwaway org in a scratch database (``<DATABASE_NAME>_bench``): a
+single reporting line ``--depth`` levels deep, with ``--width`` extra reports
+hanging off every level. It then times the reporting-chain lookup used by the
+cycle check, first with the per-hop walk (one ``find_one`` per level) and then
+with the single ``$graphLookup`` round trip. It also times a bulk assignment of
+``--bulk`` employees, checking each one with the old per-employee walk and with
+the new approach (one ancestor set shared by all of them). The scratch database
+is dropped afterwards.
+
+Usage:
+  python -m scripts.benchmark_manager_chain [--depth 12] [--width 50] [--runs 200] [--bulk 200]
+"""
+
+import argparse
+import asyncio
+import time
+
+from bson import ObjectId
+
+from app.config import settings
+from app.database import connect_to_mongo, close_mongo_connection, db as database
+from app.indexes import ensure_views
+from app.services.hierarchy_service import HierarchyService
+
+
+async def build_hierarchy(db, depth: int, width: int) -> list:
+    """Insert the synthetic org and return the reporting line, root first."""
+    line = [ObjectId() for _ in range(depth)]
+    docs = []
+    for level, _id in enumerate(line):
+        manager_id = str(line[level - 1]) if level else None
+        docs.append({"_id": _id, "fullName": f"Level {level}", "managerId": manager_id})
+        docs.extend(
+            {"_id": ObjectId(), "fullName": f"Report {level}.{i}", "managerId": str(_id)}
+            for i in range(width)
+        )
+    await db.employees.insert_many(docs, ordered=False)
+    await db.employees.create_index("managerId")
+    return line
+
+
+async def timed(label: str, runs: int, fn) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        await fn()
+    elapsed = (time.perf_counter() - started) / runs * 1000
+    print(f"{label:<40} {elapsed:8.3f} ms")
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=12)
+    parser.add_argument("--width", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--bulk", type=int, default=200)
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    name = f"{settings.database_name}_bench"
+    db = database.client[name]
+    service = HierarchyService()
+    try:
+        await database.client.drop_database(name)
+        await ensure_views(db)
+        line = await build_hierarchy(db, args.depth, args.width)
+        leaf = await db.employees.find_one({"_id": line[-1]})
+        print(f"Hierarchy: depth {args.depth}, {args.depth * (args.width + 1)} employees\n")
+
+        walk = await service.walk_chain(db, leaf)
+        graph = await service.lookup_chain(db, leaf)
+        assert walk == graph, "graphLookup chain differs from the per-hop walk"
+
+        print("Single cycle check (chain of the deepest manager):")
+        per_hop = await timed("  per-hop walk", args.runs, lambda: service.walk_chain(db, leaf))
+        single = await timed("  $graphLookup", args.runs, lambda: service.lookup_chain(db, leaf))
+        print(f"  speedup: {per_hop / single:.1f}x\n")
+
+        print(f"Bulk assignment of {args.bulk} employees to the deepest manager:")
+
+        async def bulk_old():
+            for _ in range(args.bulk):
+                await service.walk_chain(db, leaf)
+
+        async def bulk_new():
+            chain = await service.lookup_chain(db, leaf)
+            for _ in range(args.bulk):
+                str(line[0]) in chain
+
+        runs = max(1, args.runs // 20)
+        per_hop = await timed("  per-employee walk", runs, bulk_old)
+        single = await timed("  one shared ancestor set", runs, bulk_new)
+        print(f"  speedup: {per_hop / single:.1f}x")
+    finally:
+        await database.client.drop_database(name)
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""Check the dashboard against the pandas reference implementation.
+
+Computes ``GET /api/analytics/dashboard`` both ways over the configured
+database (from the workforce statistics, and the DataFrame version over every
+full document) and reports any field that differs; a difference usually means
+the statistics drifted (``python -m scripts.rebuild_workforce_stats``). Lists
+ordered by count are compared without regard to the order of equal counts,
+which the pandas version does not fix, and the average salary allows for
+floating-point summation order.
+
+The same comparison runs offline, against an in-memory database, in
+``tests/test_dashboard_parity.py``.
+
+Usage:
+  python -m scripts.check_dashboard_parity
+"""
+
+import asyncio
+import math
+from datetime import datetime
+
+from app.database import connect_to_mongo, close_mongo_connection, get_database
+from app.services.analytics_service import AnalyticsService
+
+
+# Field -> the key naming each item, for lists ordered by count.
+COUNTED_LISTS = {
+    "departmentDistribution": "name",
+    "statusDistribution": "status",
+    "jobLevelDistribution": "level",
+    "employmentTypes": "type",
+}
+
+
+def normalize(dashboard: dict) -> dict:
+    out = dict(dashboard)
+    for field, key in COUNTED_LISTS.items():
+        out[field] = sorted(dashboard[field], key=lambda item: (-item["count"], str(item[key])))
+    # Which of several equally-sized departments make the top 5 is arbitrary.
+    out["topDepartments"] = [item["count"] for item in dashboard["topDepartments"]]
+    out["recentHires"] = sorted(
+        dashboard["recentHires"],
+        key=lambda hire: (-datetime.strptime(hire["hireDate"], "%b %d, %Y").timestamp(), hire["id"]),
+    )
+    return out
+
+
+def differences(aggregated: dict, reference: dict) -> dict:
+    """Fields whose normalized values differ, as field -> (aggregation, pandas)."""
+    aggregated, reference = normalize(aggregated), normalize(reference)
+    mismatched = {}
+    for field in reference:
+        if field == "averageSalary":
+            same = math.isclose(aggregated[field], reference[field], rel_tol=1e-9)
+        else:
+            same = aggregated[field] == reference[field]
+        if not same:
+            mismatched[field] = (aggregated[field], reference[field])
+    return mismatched
+
+
+async def main() -> int:
+    await connect_to_mongo()
+    try:
+        db = await get_database()
+        service = AnalyticsService()
+        aggregated = await service.get_dashboard_analytics()
+        employees = await db.employees.find({}).to_list(length=None)
+        reference = service._dashboard_from_dataframe(employees)
+
+        mismatched = differences(aggregated, reference)
+        for field, (served, expected) in mismatched.items():
+            print(f"{field} differs:\n  aggregation: {served}\n  pandas:      {expected}")
+
+        print(f"Compared {len(employees)} employees: {len(mismatched) or 'no'} field(s) differ")
+        return 1 if mismatched else 0
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
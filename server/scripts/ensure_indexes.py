@@ -0,0 +1,47 @@
+"""Apply the index registry and verify hot queries are index-backed.
+
+Creates any missing index declared in app/indexes.py (rebuilding ones whose
+options changed) and the registered views, then explains every registered hot query and fails if any of
+them falls back to a collection scan or an in-memory sort.
+
+Usage:
+  python -m scripts.ensure_indexes             # apply + verify
+  python -m scripts.ensure_indexes --verify    # verify only
+"""
+
+import asyncio
+import sys
+
+from app.database import connect_to_mongo, close_mongo_connection, get_database
+from app.indexes import ensure_indexes, verify_query_plans
+
+
+async def main() -> int:
+    verify_only = "--verify" in sys.argv[1:]
+    await connect_to_mongo()
+    try:
+        db = await get_database()
+
+        if not verify_only:
+            failed = await ensure_indexes(db)
+            if failed:
+                print("Could not build indexes/views:")
+                for name in failed:
+                    print(f"- {name}")
+                return 1
+            print("Indexes are up to date")
+
+        problems = await verify_query_plans(db)
+        if problems:
+            print("Hot queries not served by an index:")
+            for problem in problems:
+                print(f"- {problem}")
+            return 1
+        print("All hot queries use an index")
+        return 0
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,55 @@
+"""Import employees from a CSV or NDJSON file.
+
+Streams the file through the same pipeline as ``POST /api/employees/import``
+(chunked validation, managers resolved by managerRef, unordered batch inserts),
+so memory stays bounded whatever the file size. Rejected rows are written as
+NDJSON to ``--report`` (stdout by default), followed by a summary line.
+
+Usage:
+  python -m scripts.import_employees employees.csv [--format csv|ndjson] [--report rejected.ndjson]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from app.database import connect_to_mongo, close_mongo_connection
+from app.services.import_service import IMPORT_FORMATS, ImportService
+
+
+async def read_file(path: str, size: int = 64 * 1024):
+    with open(path, "rb") as handle:
+        while chunk := handle.read(size):
+            yield chunk
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=IMPORT_FORMATS)
+    parser.add_argument("--report", help="file for the rejected-row report (default: stdout)")
+    args = parser.parse_args()
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+
+    await connect_to_mongo()
+    report = open(args.report, "w") if args.report else sys.stdout
+    try:
+        summary = {}
+        async for entry in ImportService().import_employees(read_file(args.path), fmt):
+            report.write(json.dumps(entry) + "\n")
+            summary = entry.get("summary", summary)
+        print(
+            f"Imported {summary.get('created', 0)} of {summary.get('rows', 0)} rows, "
+            f"{summary.get('rejected', 0)} rejected",
+            file=sys.stderr,
+        )
+        return 1 if summary.get("rejected") else 0
+    finally:
+        if report is not sys.stdout:
+            report.close()
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,33 @@
+"""Rebuild the workforce statistics behind the analytics endpoints.
+
+Recomputes the per department/status/jobLevel/employmentType counters and the
+hires per month from every employee, and rewrites only the statistics that
+drifted (after writes that bypassed the API, or a crash between an employee
+write and its counter update), so it is safe to re-run at any time.
+
+Usage:
+  python -m scripts.rebuild_workforce_stats
+"""
+
+import asyncio
+
+from app.database import connect_to_mongo, close_mongo_connection, get_database
+from app.services.workforce_stats import workforce_stats
+
+
+async def main() -> int:
+    await connect_to_mongo()
+    try:
+        db = await get_database()
+        result = await workforce_stats.reconcile(db)
+        print(
+            f"Scanned {result['scanned']} employees, corrected {result['corrected']} "
+            f"statistics, pruned {result['pruned']} empty ones"
+        )
+        return 0
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -1,8 +1,9 @@
 """Reset the database to a clean slate.
 
-Clears the `employees` and `users` collections, then re-seeds the single default
-login account so the app remains usable after the wipe. Used to rebuild the org
-from scratch under the canonical hierarchy rules.
+Clears the `employees` and `users` collections (and the employeeId counter and
+workforce statistics), then re-seeds the single default login account so the app
+remains usable after the wipe. Used to rebuild the org from scratch under the
+canonical hierarchy rules.
 
 DESTRUCTIVE — removes all employees and users. Run intentionally:
   python -m scripts.reset_db
@@ -13,6 +14,8 @@ import asyncio
 from app.database import connect_to_mongo, close_mongo_connection, get_database
 from app.models.user import UserCreate
 from app.services.auth_service import create_user
+from app.services.sequence import COUNTERS
+from app.services.workforce_stats import WORKFORCE_STATS
 
 # Default demo login surfaced on the client login page (Login.vue).
 DEFAULT_USER = UserCreate(
@@ -30,6 +33,9 @@ async def main() -> int:
 
         emp_result = await db.employees.delete_many({})
         user_result = await db.users.delete_many({})
+        # Restart generated employeeIds at EMP001.
+        await db[COUNTERS].delete_many({})
+        await db[WORKFORCE_STATS].delete_many({})
         print(f"Deleted {emp_result.deleted_count} employees")
         print(f"Deleted {user_result.deleted_count} users")
 
@@ -2,7 +2,8 @@
 
 Creates employees top-down through EmployeeService.create_employee so every
 record passes the canonical hierarchy validation (manager seniority, eligible
-status/employment type, single CEO, no cycles) and gets a generated employeeId.
+status/employment type, single CEO, no cycles). employeeIds come from one block
+reserved up front.
 
 Dates are coherent with the hierarchy: the CEO is hired first (window start) and
 every employee is hired strictly after their manager.
@@ -18,6 +19,7 @@ from datetime import date, timedelta
 from app.database import connect_to_mongo, close_mongo_connection, get_database
 from app.models.employee import EmployeeCreate
 from app.services.employee_service import EmployeeService
+from app.services.sequence import employee_ids, format_employee_id
 
 random.seed(7)
 
@@ -158,6 +160,8 @@ async def main() -> int:
     # key -> {id, name, email, hire}
     created = {}
     try:
+        # Reserve every employeeId up front in one counter round trip.
+        numbers = iter(await employee_ids.reserve(await get_database(), len(PEOPLE)))
         for (
             key, first, last, dept, position, level, emp_type, status, location,
             salary, paygrade, perf, training, bg, benefits, mgr_key,
@@ -202,6 +206,7 @@ async def main() -> int:
                 "developmentNotes": f"Onboarding plan in place for {first}.",
                 "nextReviewDate": (hire + timedelta(days=180)).isoformat(),
                 "backgroundCheckStatus": bg,
+                "employeeId": format_employee_id(next(numbers)),
                 "docType": "employee",
                 "source": "HR",
                 "hrAssignment": {
@@ -0,0 +1,104 @@
+"""The served dashboard agrees with the pandas reference implementation.
+
+Runs ``scripts.check_dashboard_parity``'s comparison against an in-memory
+database (mongomock), both for statistics built from scratch and for
+statistics kept up to date by individual writes.
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from app.services import analytics_service  # noqa: E402
+from app.services.analytics_service import AnalyticsService  # noqa: E402
+from app.services.workforce_stats import workforce_stats  # noqa: E402
+from scripts.check_dashboard_parity import differences  # noqa: E402
+
+
+DEPARTMENTS = ["Engineering", "Sales", "HR", "Operations", "Legal", "Finance"]
+
+
+def employee(i: int, now: datetime) -> dict:
+    doc = {
+        "employeeId": f"EMP{i:06d}",
+        "fullName": f"First{i} Last{i}",
+        "status": random.choice(["Active"] * 5 + ["On Leave", "Terminated"]),
+        "department": random.choice(DEPARTMENTS),
+        "jobLevel": random.choice(["Entry", "Mid", "Senior", "Manager"]),
+        "employmentType": random.choice(["Full-time", "Part-time", "Contract"]),
+        "salary": random.choice([50000.5, 72000, 91000.25, 130000]),
+        "hireDate": (now - timedelta(days=random.randint(0, 500))).strftime("%Y-%m-%d"),
+    }
+    # The awkward documents real data has: missing or unusable values.
+    if i % 37 == 0:
+        doc.pop("salary")
+    if i % 41 == 0:
+        doc["department"] = None
+    if i % 43 == 0:
+        doc.pop("hireDate")
+    if i % 47 == 0:
+        doc["hireDate"] = "not a date"
+    return doc
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = mongomock_motor.AsyncMongoMockClient()["parity"]
+
+    async def get_database():
+        return database
+
+    monkeypatch.setattr(analytics_service, "get_database", get_database)
+    return database
+
+
+async def served_and_reference(db) -> tuple:
+    service = AnalyticsService()
+    # Past the result cache, so each call reads the current statistics.
+    served = await AnalyticsService.get_dashboard_analytics.__wrapped__(service)
+    reference = service._dashboard_from_dataframe(await db.employees.find({}).to_list(length=None))
+    return served, reference
+
+
+def test_rebuilt_statistics_match_reference(db):
+    async def run():
+        random.seed(3)
+        now = datetime.now()
+        await db.employees.insert_many([employee(i, now) for i in range(400)])
+        await workforce_stats.reconcile(db)
+        return await served_and_reference(db)
+
+    served, reference = asyncio.run(run())
+    assert served["totalEmployees"] == 400
+    assert differences(served, reference) == {}
+
+
+def test_incrementally_recorded_statistics_match_reference(db):
+    async def run():
+        random.seed(5)
+        now = datetime.now()
+        docs = [employee(i, now) for i in range(120)]
+        await db.employees.insert_many(docs)
+        await workforce_stats.record(db, ((None, doc) for doc in docs))
+
+        # Updates, moves between combinations and removals, recorded the way
+        # the services do.
+        for doc in docs[:30]:
+            after = {**doc, "department": "Support", "salary": 88000}
+            await db.employees.replace_one({"_id": doc["_id"]}, after)
+            await workforce_stats.record(db, [(doc, after)])
+        for doc in docs[30:40]:
+            await db.employees.delete_one({"_id": doc["_id"]})
+            await workforce_stats.record(db, [(doc, None)])
+        query = {"department": "Sales"}
+        await workforce_stats.move_matching(db, query, {"status": "Inactive"})
+        await db.employees.update_many(query, {"$set": {"status": "Inactive"}})
+        return await served_and_reference(db)
+
+    served, reference = asyncio.run(run())
+    assert served["totalEmployees"] == 110
+    assert differences(served, reference) == {}